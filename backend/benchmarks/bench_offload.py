@@ -0,0 +1,93 @@
+"""Benchmark request latency while heavy searches run, with and without offloading.
+
+Serves the app in-process over ASGI. A few clients repeatedly run searches that
+scan the whole 100k-note corpus while a prober measures ``GET /health`` and
+``POST /notes`` latency. Reports p50/p99 for the probes with searches running
+inline on the event loop and offloaded to capped worker threads.
+
+Run with::
+
+    uv run python benchmarks/bench_offload.py
+"""
+
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+
+from anyio import CapacityLimiter
+from httpx import ASGITransport, AsyncClient
+
+from app.main import create_app
+from app.routes.notes import get_note_service
+from app.services.note_service import NoteService
+from app.services.repository import StoreRepository
+from bench_search import build_corpus
+
+CORPUS_SIZE = 100_000
+SEARCHERS = 4
+PROBES = 200
+# Single letters match nearly every note, so each search verifies the whole corpus.
+HEAVY_QUERIES = ("a", "e", "o")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``samples`` in milliseconds."""
+    return statistics.quantiles(samples, n=100)[int(pct) - 1] * 1000
+
+
+async def run(repository: StoreRepository) -> dict[str, list[float]]:
+    """Probe latencies while ``SEARCHERS`` clients run heavy searches."""
+    app = create_app()
+    app.dependency_overrides[get_note_service] = lambda: repository
+    latencies: dict[str, list[float]] = {"GET /health": [], "POST /notes": []}
+    stop = asyncio.Event()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def search(query: str) -> None:
+            while not stop.is_set():
+                await client.get("/notes", params={"q": query})
+
+        async def probe() -> None:
+            for i in range(PROBES):
+                start = time.perf_counter()
+                await client.get("/health")
+                latencies["GET /health"].append(time.perf_counter() - start)
+                start = time.perf_counter()
+                await client.post("/notes", json={"title": f"probe {i}", "content": "x"})
+                latencies["POST /notes"].append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+            stop.set()
+
+        searchers = [
+            asyncio.create_task(search(HEAVY_QUERIES[i % len(HEAVY_QUERIES)]))
+            for i in range(SEARCHERS)
+        ]
+        await probe()
+        await asyncio.gather(*searchers)
+    return latencies
+
+
+def offloaded(service: NoteService) -> StoreRepository:
+    """Repository that moves searches over 1 MiB of corpus to two worker threads."""
+    return StoreRepository(service, search_limiter=CapacityLimiter(2), offload_bytes=1 << 20)
+
+
+def main() -> None:
+    """Run the benchmark inline and offloaded, each against a fresh corpus."""
+    variants: dict[str, Callable[[NoteService], StoreRepository]] = {
+        "inline": StoreRepository,
+        "offload": offloaded,
+    }
+    for name, make in variants.items():
+        service = build_corpus(CORPUS_SIZE, "trigram")
+        for probe, samples in asyncio.run(run(make(service))).items():
+            print(
+                f"{name:<8} {probe:<12} p50 {percentile(samples, 50):>8.2f} ms"
+                f"  p99 {percentile(samples, 99):>8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark substring search over a synthetic 100k-note corpus.
+
+Compares the original per-query ``.lower()`` scan against ``NoteService.list_all``
+with each search engine, all of which search precomputed normalized keys. Reports
+latency, the peak memory allocated while answering each query, and the number of
+memory blocks the query leaves allocated (its result and anything it caches, from
+a ``tracemalloc`` snapshot diff; temporaries freed during the query only show in
+the peak), then compares materializing every match of a broad query with fetching
+only the first page.
+
+Run with::
+
+    uv run python benchmarks/bench_search.py
+"""
+
+import random
+import string
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+
+from app.models.note import NoteCreate, NoteResponse
+from app.services.note_service import NoteService
+from app.services.search_engine import SearchEngineName
+
+CORPUS_SIZE = 100_000
+REPEATS = 5
+QUERIES = ("zq", "xyzzy", "lorem")
+# Broad queries matching most notes, and the page size a UI would show.
+BROAD_QUERIES = ("a", "ab")
+PAGE_SIZE = 20
+
+
+def build_corpus(size: int, engine: SearchEngineName) -> NoteService:
+    """Populate a NoteService with pseudo-random notes."""
+    rng = random.Random(1234)
+    words = ["".join(rng.choices(string.ascii_letters, k=rng.randint(3, 9))) for _ in range(5000)]
+    service = NoteService(search_engine=engine)
+    for _ in range(size):
+        service.create(
+            NoteCreate(
+                title=" ".join(rng.choices(words, k=4)),
+                content=" ".join(rng.choices(words, k=40)),
+            )
+        )
+    return service
+
+
+def lower_per_query(notes: Sequence[NoteResponse], query: str) -> list[NoteResponse]:
+    """The original search loop: lower-cases every note on every query."""
+    q_lower = query.lower()
+    return [n for n in notes if q_lower in n.title.lower() or q_lower in n.content.lower()]
+
+
+def measure(fn: Callable[[], object]) -> tuple[float, int, int]:
+    """Return (best latency in ms, peak traced bytes, blocks still allocated) for ``fn``."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    # Leave the snapshots themselves out of the comparison.
+    untraced = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(untraced)
+    tracemalloc.reset_peak()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(untraced)
+    tracemalloc.stop()
+    del result
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno"))
+    return best * 1000, peak, blocks
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    trigram = build_corpus(CORPUS_SIZE, "trigram")
+    buffer = build_corpus(CORPUS_SIZE, "buffer")
+    notes = trigram.list_all()
+    print(f"corpus: {len(notes)} notes")
+    print(f"{'query':<8} {'variant':<16} {'ms':>9} {'peak bytes':>12} {'blocks':>8}")
+    for query in QUERIES:
+        for name, fn in (
+            ("lower-per-query", lambda q=query: lower_per_query(notes, q)),
+            ("trigram", lambda q=query: trigram.list_all(q)),
+            ("buffer", lambda q=query: buffer.list_all(q)),
+        ):
+            ms, peak, blocks = measure(fn)
+            print(f"{query:<8} {name:<16} {ms:>9.2f} {peak:>12} {blocks:>8}")
+
+    print(f"\nfirst {PAGE_SIZE} results of broad queries")
+    print(f"{'query':<8} {'variant':<16} {'ms':>9} {'peak bytes':>12} {'blocks':>8}")
+    for query in BROAD_QUERIES:
+        for engine, service in (("trigram", trigram), ("buffer", buffer)):
+            for name, fn in (
+                (f"{engine} all", lambda s=service, q=query: s.list_all(q)[:PAGE_SIZE]),
+                (f"{engine} page", lambda s=service, q=query: s.list_page(q, limit=PAGE_SIZE)),
+            ):
+                ms, peak, blocks = measure(fn)
+                print(f"{query:<8} {name:<16} {ms:>9.2f} {peak:>12} {blocks:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the sharded process-pool scan against the single-threaded corpus buffer.
+
+Builds each engine directly from synthetic normalized fields (skipping note
+creation, which would dominate setup for millions of notes) and reports the best
+``candidates()`` latency per query for the single-buffer scan and for the sharded
+scan at increasing worker counts, up to the number of usable cores.
+
+Run with::
+
+    uv run python benchmarks/bench_sharded.py [corpus size]
+"""
+
+import os
+import random
+import string
+import sys
+import time
+from collections.abc import Iterator
+
+from app.services.corpus_buffer import CorpusBuffer
+from app.services.search_engine import SearchEngine
+from app.services.sharded_scan import ShardedScan
+
+DEFAULT_CORPUS_SIZE = 2_000_000
+REPEATS = 5
+QUERIES = ("zq", "xyzzy", "lorem")
+
+
+def fields(size: int) -> Iterator[tuple[str, str]]:
+    """Yield ``size`` pseudo-random lower-cased (title, content) pairs."""
+    rng = random.Random(1234)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(5000)
+    ]
+    for _ in range(size):
+        yield " ".join(rng.choices(words, k=4)), " ".join(rng.choices(words, k=40))
+
+
+def populate(engine: SearchEngine, size: int) -> SearchEngine:
+    """Add ``size`` synthetic notes to ``engine``."""
+    for position, pair in enumerate(fields(size)):
+        engine.add(position, pair)
+    return engine
+
+
+def best_ms(engine: SearchEngine, query: str) -> float:
+    """Return the best of ``REPEATS`` candidate lookups for ``query``, in ms."""
+    engine.candidates(query)  # warm up: starts workers and attaches shards
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        engine.candidates(query)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print latency and speedup per worker count."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CORPUS_SIZE
+    cores = os.process_cpu_count() or 1
+    print(f"corpus: {size} notes, {cores} usable core(s)")
+
+    baseline = populate(CorpusBuffer(), size)
+    single = {query: best_ms(baseline, query) for query in QUERIES}
+    baseline.clear()
+    for query in QUERIES:
+        print(f"{query:<8} {'buffer':<12} {single[query]:>9.2f} ms")
+
+    workers = 1
+    while True:
+        sharded = populate(ShardedScan(workers=workers), size)
+        for query in QUERIES:
+            ms = best_ms(sharded, query)
+            label = f"sharded x{workers}"
+            print(f"{query:<8} {label:<12} {ms:>9.2f} ms  {single[query] / ms:>5.1f}x")
+        sharded.clear()
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 """Application settings via pydantic-settings."""
 
+from functools import lru_cache
+from pathlib import Path
+
 from pydantic_settings import BaseSettings
 
+from app.services.note_store import StorageBackend
+from app.services.search_engine import SearchEngineName
+from app.services.wal import FsyncPolicy
+
 
 class Settings(BaseSettings):
     """Application configuration loaded from environment variables."""
@@ -11,5 +18,41 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"  # noqa: S104
     port: int = 8000
     log_level: str = "INFO"
+    storage_backend: StorageBackend = "memory"
+    search_engine: SearchEngineName = "trigram"
+    # Persistence is enabled by setting data_dir; otherwise notes live in memory only.
+    data_dir: Path | None = None
+    wal_fsync: FsyncPolicy = "batch"
+    wal_group_commit_ms: float = 5.0
+    snapshot_interval_s: float = 300.0
+    sqlite_path: Path = Path("notes.db")
+    sqlite_readers: int = 4
+    # Worker threads for stores that block (any store except memory without data_dir).
+    repository_threads: int = 8
+    # Inline in-memory searches over at least this many corpus bytes move to a thread.
+    search_offload_bytes: int = 1 << 20
+    search_threads: int = 2
+    # Substring search results cached by the in-memory store (0 entries disables it).
+    search_cache_entries: int = 256
+    search_cache_bytes: int = 8 << 20
+    # Recent creates kept for GET /notes/changes.
+    change_log_size: int = 1024
+    # Events buffered per /notes/events subscriber before it is disconnected as too slow.
+    events_queue_size: int = 64
+    events_heartbeat_s: float = 15.0
+    # Idle seconds before /notes/events subscribers check SQLite for other workers' creates.
+    events_poll_s: float = 1.0
+    # Largest array accepted by POST /notes/bulk.
+    bulk_max_items: int = 1000
 
     model_config = {"env_prefix": "APP_"}
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, loaded once from the environment.
+
+    Returns:
+        Cached Settings instance.
+    """
+    return Settings()
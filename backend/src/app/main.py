@@ -1,27 +1,73 @@
 """FastAPI application factory with lifespan, CORS, and route registration."""
 
+import asyncio
 import logging
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config import Settings
+from app.config import get_settings
 from app.middleware.error_handler import register_error_handlers
+from app.routes.notes import (
+    CHANGE_SEQ_HEADER,
+    HAS_MORE_HEADER,
+    NEXT_CURSOR_HEADER,
+    note_service_instance,
+)
 from app.routes.notes import router as notes_router
+from app.services.note_service import NoteService
+from app.services.persistence import NotePersistence
+from app.services.sqlite_store import SqliteNoteService
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
-settings = Settings()
+settings = get_settings()
+
+
+async def snapshot_periodically(
+    persistence: NotePersistence, service: NoteService, interval_s: float
+) -> None:
+    """Snapshot the note store every ``interval_s`` seconds, off the event loop."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await asyncio.to_thread(persistence.snapshot, service)
+        except Exception:
+            logger.exception("Periodic snapshot failed")
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan — startup/shutdown logic."""
     logger.info("Starting %s", settings.app_name)
+    persistence: NotePersistence | None = None
+    snapshot_task: asyncio.Task[None] | None = None
+    service = note_service_instance
+    # The SQLite backend is durable on its own; the log and snapshots are for the
+    # in-memory store only.
+    if settings.data_dir is not None and isinstance(service, NoteService):
+        persistence = NotePersistence(
+            settings.data_dir,
+            fsync=settings.wal_fsync,
+            group_commit_ms=settings.wal_group_commit_ms,
+        )
+        await asyncio.to_thread(persistence.open, service)
+        if settings.snapshot_interval_s > 0:
+            snapshot_task = asyncio.create_task(
+                snapshot_periodically(persistence, service, settings.snapshot_interval_s)
+            )
     yield
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await snapshot_task
+    if persistence is not None and isinstance(service, NoteService):
+        persistence.close(service)
+    if isinstance(service, SqliteNoteService):
+        service.close()
     logger.info("Shutting down %s", settings.app_name)
 
 
@@ -44,6 +90,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, HAS_MORE_HEADER, CHANGE_SEQ_HEADER],
     )
 
     # Error handlers
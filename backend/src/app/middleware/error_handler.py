@@ -29,6 +29,13 @@ class NotFoundError(AppError):
         )
 
 
+class BadRequestError(AppError):
+    """Request is syntactically valid but semantically unusable."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message=message, code="BAD_REQUEST", status_code=400)
+
+
 def register_error_handlers(app: FastAPI) -> None:
     """Register global exception handlers on the FastAPI app.
 
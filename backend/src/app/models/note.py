@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class NoteCreate(BaseModel):
@@ -19,3 +19,49 @@ class NoteResponse(BaseModel):
     title: str
     content: str
     created_at: datetime
+
+
+class NoteStats(BaseModel):
+    """Schema for note storage statistics."""
+
+    notes: int
+    index_bytes: int | None = Field(
+        description=(
+            "Approximate size of the positional word index, excluding the fuzzy-search"
+            " dictionary; null if unavailable"
+        )
+    )
+    cache_hits: int | None = Field(
+        default=None, description="Searches answered by the result cache; null if uncached"
+    )
+    cache_misses: int | None = Field(
+        default=None, description="Searches the result cache could not answer; null if uncached"
+    )
+    coalesced_searches: int = Field(
+        default=0, description="Searches that shared the result of an identical one in flight"
+    )
+
+    @computed_field
+    @property
+    def index_bytes_per_note(self) -> float | None:
+        """Average word index size per stored note."""
+        if self.index_bytes is None or self.notes == 0:
+            return None
+        return self.index_bytes / self.notes
+
+
+class NoteChanges(BaseModel):
+    """Schema for a delta sync response."""
+
+    seq: int = Field(description="Sequence number of the latest change; pass it as since next")
+    resync: bool = Field(
+        description="True if the changes after since are no longer retained; refetch all notes"
+    )
+    notes: list[NoteResponse] = Field(description="Notes created after since, oldest first")
+
+
+class NoteImportResult(BaseModel):
+    """Schema for the outcome of an NDJSON import."""
+
+    imported: int = Field(description="Notes created")
+    batches: int = Field(description="Durable writes the notes were created in")
@@ -1,49 +1,188 @@
 """API routes for notes CRUD operations."""
 
 import logging
-from collections.abc import Sequence
-from typing import Annotated
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query, status
+import anyio
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 
-from app.models.note import NoteCreate, NoteResponse
-from app.services.note_service import NoteService
+from app.config import get_settings
+from app.middleware.error_handler import BadRequestError, NotFoundError
+from app.models.note import (
+    NoteChanges,
+    NoteCreate,
+    NoteImportResult,
+    NoteResponse,
+    NoteStats,
+)
+from app.services.event_hub import HEARTBEAT_FRAME
+from app.services.fuzzy_index import MAX_DISTANCE as MAX_FUZZY_DISTANCE
+from app.services.ndjson_import import ImportLineError, import_ndjson
+from app.services.note_store import create_note_store
+from app.services.query_language import MatchMode
+from app.services.repository import NoteRepository, create_repository
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
-# Module-level singleton — shared across requests (in-memory storage)
-note_service_instance = NoteService()
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+HAS_MORE_HEADER = "X-Has-More"
+CHANGE_SEQ_HEADER = "X-Change-Seq"
+JSON_MEDIA_TYPE = "application/json"
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+MAX_BULK_ITEMS = get_settings().bulk_max_items
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_LINE_BYTES = 1 << 20
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
+type SearchMode = Literal["substring", "ranked", "boolean"]
+type ExportFormat = Literal["ndjson", "json"]
 
-def get_note_service() -> NoteService:
-    """Dependency that provides the NoteService singleton.
+# Module-level singletons — shared across requests (backend chosen in settings)
+note_service_instance = create_note_store(get_settings())
+note_repository = create_repository(note_service_instance, get_settings())
+
+_NOTES_ADAPTER = TypeAdapter(list[NoteResponse])
+
+
+async def _json_array_body(batches: AsyncGenerator[list[bytes]]) -> AsyncIterator[bytes]:
+    """Encode batches of note JSON as one JSON array, a batch per chunk."""
+    separator = b"["
+    async with aclosing(batches):
+        async for batch in batches:
+            yield separator + b",".join(batch)
+            separator = b","
+    yield b"]" if separator == b"," else b"[]"
+
+
+async def _ndjson_body(batches: AsyncGenerator[list[bytes]]) -> AsyncIterator[bytes]:
+    """Encode batches of note JSON as newline-delimited JSON, a batch per chunk."""
+    async with aclosing(batches):
+        async for batch in batches:
+            yield b"\n".join(batch) + b"\n"
+
+
+def get_note_service() -> NoteRepository:
+    """Dependency that provides the async repository over the note store.
 
     Returns:
-        The shared NoteService instance.
+        The shared NoteRepository instance.
     """
-    return note_service_instance
+    return note_repository
 
 
-NoteServiceDep = Annotated[NoteService, Depends(get_note_service)]
+NoteServiceDep = Annotated[NoteRepository, Depends(get_note_service)]
 
 
 @router.get("", response_model=list[NoteResponse])
 async def list_notes(
     service: NoteServiceDep,
     q: str | None = Query(default=None, description="Search keyword for title/content"),
-) -> Sequence[NoteResponse]:
-    """List all notes, optionally filtered by a search keyword.
+    limit: int | None = Query(
+        default=None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables pagination"
+    ),
+    cursor: str | None = Query(default=None, description="Cursor from X-Next-Cursor"),
+    mode: Annotated[
+        SearchMode,
+        Query(
+            description="substring: literal match; boolean: AND/OR/NOT query language; "
+            "ranked: BM25 relevance"
+        ),
+    ] = "substring",
+    fuzzy: int = Query(
+        default=0, ge=0, le=MAX_FUZZY_DISTANCE, description="Edit distance tolerated per word"
+    ),
+    stream: bool = Query(
+        default=False, description="Stream an unpaginated listing in chunks as it is read"
+    ),
+) -> Response:
+    """List notes, optionally filtered by a search keyword.
+
+    Without ``limit`` or ``cursor`` every matching note is returned. Otherwise one
+    page is returned, the search stops as soon as the page is full, and
+    ``X-Has-More`` says whether another match exists; if so, the cursor for the
+    next page is sent in the ``X-Next-Cursor`` response header.
+
+    An unpaginated listing carries ``X-Change-Seq``: the change sequence number
+    as of just before the listing ran, from which ``GET /notes/changes`` brings
+    the list up to date (notes created meanwhile may appear in both). With
+    ``stream=true`` such a listing is sent as a chunked JSON array read from a
+    snapshot, so the server never holds the whole result.
+
+    With ``mode=boolean``, ``q`` is parsed as a boolean query (``AND``/``OR``/
+    ``NOT``, quoted phrases, ``title:``/``content:`` scoping) and matched against
+    whole words; results keep insertion order and paginate like substring search.
+
+    With ``fuzzy`` set to 1 or 2, each query word also matches indexed words
+    within that many edits (fewer for short words), so misspelled searches still
+    find their notes; matching is then by whole word, even in substring mode.
+
+    With ``mode=ranked`` the notes containing any word of ``q`` are returned best
+    match first, at most ``limit`` of them; ranked results are not paginated.
 
     Args:
-        service: Injected NoteService instance.
+        service: Injected note repository.
         q: Optional case-insensitive search query.
+        limit: Optional maximum number of notes to return.
+        cursor: Optional opaque cursor from a previous page.
+        mode: Substring matching, boolean word matching, or BM25-ranked word matching.
+        fuzzy: Maximum edit distance between a query word and a matching word.
+        stream: Stream an unpaginated substring or boolean listing.
 
     Returns:
-        List of matching notes.
+        JSON array of matching notes, assembled from each note's cached
+        serialization rather than re-validated through ``response_model``.
+
+    Raises:
+        BadRequestError: If the cursor or a boolean query is malformed,
+            ``mode=ranked`` is used without ``q``, with a cursor, or with ``fuzzy``,
+            or ``stream`` is combined with ``mode=ranked``, ``limit``, or ``cursor``.
     """
-    return service.list_all(query=q)
+    if stream and (mode == "ranked" or limit is not None or cursor is not None):
+        raise BadRequestError(
+            "stream=true only applies to unpaginated substring or boolean search"
+        )
+    if mode == "ranked":
+        if q is None:
+            raise BadRequestError("mode=ranked requires q")
+        if cursor is not None:
+            raise BadRequestError("mode=ranked does not support cursor")
+        if fuzzy:
+            raise BadRequestError("mode=ranked does not support fuzzy")
+        body = await service.list_ranked_json(q, limit=limit or DEFAULT_PAGE_SIZE)
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+    match_mode: MatchMode = mode
+    try:
+        if limit is None and cursor is None:
+            seq = service.change_seq
+            headers = {CHANGE_SEQ_HEADER: str(seq)}
+            if stream:
+                batches = await service.export_json(q, mode=match_mode, fuzzy=fuzzy)
+                return StreamingResponse(
+                    _json_array_body(batches), media_type=JSON_MEDIA_TYPE, headers=headers
+                )
+            body = await service.list_all_json(query=q, mode=match_mode, fuzzy=fuzzy)
+            return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
+        page = await service.list_page(
+            q, limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor, mode=match_mode, fuzzy=fuzzy
+        )
+    except ValueError as exc:
+        raise BadRequestError(str(exc)) from exc
+    response = Response(content=page.to_json(), media_type=JSON_MEDIA_TYPE)
+    response.headers[HAS_MORE_HEADER] = "true" if page.has_more else "false"
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return response
 
 
 @router.post("", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
@@ -55,9 +194,260 @@ async def create_note(
 
     Args:
         data: Note creation payload with title and content.
-        service: Injected NoteService instance.
+        service: Injected note repository.
 
     Returns:
         The newly created note.
     """
-    return service.create(data)
+    return await service.create(data)
+
+
+@router.post("/bulk", response_model=list[NoteResponse], status_code=status.HTTP_201_CREATED)
+async def create_notes_bulk(
+    items: Annotated[list[NoteCreate], Body(min_length=1, max_length=MAX_BULK_ITEMS)],
+    service: NoteServiceDep,
+) -> Response:
+    """Create up to ``APP_BULK_MAX_ITEMS`` notes in one request and one durable write.
+
+    The whole array is validated in a single pass before anything is stored, so
+    either every note is created or none is; a 422 response locates each invalid
+    item by its index.
+
+    Args:
+        items: Note creation payloads.
+        service: Injected note repository.
+
+    Returns:
+        JSON array of the created notes, in the order given.
+    """
+    notes = await service.create_many(items)
+    return Response(
+        content=_NOTES_ADAPTER.dump_json(notes),
+        status_code=status.HTTP_201_CREATED,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+@router.post(
+    "/import",
+    response_model=NoteImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_notes(request: Request, service: NoteServiceDep) -> NoteImportResult:
+    """Create notes from a newline-delimited JSON body, one note object per line.
+
+    The body is read as it arrives and stored ``IMPORT_BATCH_SIZE`` notes per
+    durable write, so memory use does not grow with the upload. Progress is
+    logged on the server after every batch; the client only gets the totals. If
+    a line is invalid the import stops there and the notes on earlier lines
+    remain created, so a client can resume from it.
+    ``/notes/events`` subscribers get one ``resync`` event when the import ends
+    rather than one per batch.
+
+    Args:
+        request: Incoming request whose body is streamed.
+        service: Injected note repository.
+
+    Returns:
+        How many notes were imported, in how many batches.
+
+    Raises:
+        BadRequestError: If a line is not a valid note or exceeds
+            ``MAX_IMPORT_LINE_BYTES``; the message gives the line number.
+    """
+    try:
+        async with service.hold_events():
+            return await import_ndjson(
+                request.stream(),
+                service.create_many,
+                batch_size=IMPORT_BATCH_SIZE,
+                max_line_bytes=MAX_IMPORT_LINE_BYTES,
+            )
+    except ImportLineError as exc:
+        raise BadRequestError(str(exc)) from exc
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_notes(
+    service: NoteServiceDep,
+    q: str | None = Query(default=None, description="Export only notes matching this search"),
+    mode: Annotated[
+        MatchMode, Query(description="substring: literal match; boolean: query language")
+    ] = "substring",
+    fuzzy: int = Query(
+        default=0, ge=0, le=MAX_FUZZY_DISTANCE, description="Edit distance tolerated per word"
+    ),
+    fmt: Annotated[
+        ExportFormat,
+        Query(alias="format", description="ndjson: one note per line; json: one JSON array"),
+    ] = "ndjson",
+) -> StreamingResponse:
+    """Stream every note, or every match of ``q``, in insertion order.
+
+    Notes are read from a snapshot taken when the request starts, so notes created
+    during a long download are not included, and are sent a batch at a time, so
+    server memory does not grow with the export.
+
+    Args:
+        service: Injected note repository.
+        q: Optional search query, interpreted as in ``GET /notes``.
+        mode: Substring or boolean matching of ``q``.
+        fuzzy: Maximum edit distance between a query word and a matching word.
+        fmt: ``ndjson`` (the default, accepted by ``POST /notes/import``) or ``json``.
+
+    Returns:
+        A chunked response with the exported notes.
+
+    Raises:
+        BadRequestError: If a boolean query is malformed.
+    """
+    try:
+        batches = await service.export_json(q, mode=mode, fuzzy=fuzzy)
+    except ValueError as exc:
+        raise BadRequestError(str(exc)) from exc
+    if fmt == "json":
+        return StreamingResponse(_json_array_body(batches), media_type=JSON_MEDIA_TYPE)
+    return StreamingResponse(
+        _ndjson_body(batches),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="notes.ndjson"'},
+    )
+
+
+@router.get("/suggest", response_model=list[str])
+async def suggest_notes(
+    service: NoteServiceDep,
+    prefix: str = Query(min_length=1, max_length=200, description="Text typed so far"),
+    limit: int = Query(default=DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+) -> list[str]:
+    """Complete a partially typed search from note titles and the words in them.
+
+    Args:
+        service: Injected note repository.
+        prefix: Text typed so far; matched case-insensitively.
+        limit: Maximum number of completions.
+
+    Returns:
+        Lower-cased completions in alphabetical order.
+    """
+    return await service.suggest(prefix, limit=limit)
+
+
+@router.get("/changes", response_model=NoteChanges)
+async def note_changes(
+    service: NoteServiceDep,
+    since: int = Query(ge=0, description="seq from the previous response or X-Change-Seq"),
+) -> NoteChanges:
+    """Return only the notes created since a previous sync.
+
+    Recent changes are kept in a bounded log. If the changes after ``since`` have
+    already been evicted, or ``since`` came from before a server restart,
+    ``resync`` is true and the client must reload the full list. With SQLite the
+    log is the database itself, shared by every worker and kept across restarts;
+    ``resync`` then means more than ``APP_CHANGE_LOG_SIZE`` notes are new.
+
+    Args:
+        service: Injected note repository.
+        since: Sequence number the client is up to date with.
+
+    Returns:
+        Notes created after ``since``, oldest first, and the sequence number to
+        sync from next.
+    """
+    return await service.changes(since)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def note_events(
+    service: NoteServiceDep,
+    since: int | None = Query(
+        default=None, ge=0, description="Also send the notes created after this change seq"
+    ),
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """Stream a ``note_created`` Server-Sent Event for every new note.
+
+    Each event's id is the change sequence number, so a reconnecting
+    ``EventSource`` resumes from ``Last-Event-ID`` (which takes precedence over
+    ``since``) without missing notes; if the change log no longer reaches back
+    that far a single ``resync`` event tells the client to reload the list. A
+    comment line is sent after ``APP_EVENTS_HEARTBEAT_S`` seconds of silence. A
+    client that falls ``APP_EVENTS_QUEUE_SIZE`` events behind is disconnected and
+    resumes the same way. With SQLite, notes created by other workers arrive
+    within about ``APP_EVENTS_POLL_S`` seconds.
+
+    Args:
+        service: Injected note repository.
+        since: Change sequence number to replay from, e.g. a listing's ``X-Change-Seq``.
+        last_event_id: Id of the last event a reconnecting client received.
+
+    Returns:
+        An endless ``text/event-stream`` response.
+
+    Raises:
+        BadRequestError: If ``Last-Event-ID`` is not a sequence number.
+    """
+    if last_event_id is not None:
+        try:
+            since = int(last_event_id)
+        except ValueError as exc:
+            raise BadRequestError("Last-Event-ID must be a change sequence number") from exc
+    heartbeat_s = get_settings().events_heartbeat_s
+
+    async def stream() -> AsyncIterator[bytes]:
+        async with service.subscribe(since) as subscription:
+            for frame in subscription.backlog:
+                yield frame
+            while True:
+                frame = HEARTBEAT_FRAME
+                with anyio.move_on_after(heartbeat_s):
+                    try:
+                        frame = await subscription.receive()
+                    except anyio.EndOfStream:
+                        logger.info("Disconnected an event subscriber that fell behind")
+                        return
+                yield frame
+
+    return StreamingResponse(
+        stream(),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", response_model=NoteStats)
+async def note_stats(service: NoteServiceDep) -> NoteStats:
+    """Report the note count, word index memory, and search cache and coalescing counters.
+
+    Args:
+        service: Injected note repository.
+
+    Returns:
+        Storage statistics, including the index size per note.
+    """
+    return await service.stats()
+
+
+@router.get("/{note_id}", response_model=NoteResponse)
+async def get_note(note_id: str, service: NoteServiceDep) -> NoteResponse:
+    """Fetch a single note by id.
+
+    Args:
+        note_id: Identifier of the note.
+        service: Injected note repository.
+
+    Returns:
+        The requested note.
+
+    Raises:
+        NotFoundError: If no note has the given id.
+    """
+    note = await service.get(note_id)
+    if note is None:
+        raise NotFoundError("Note", note_id)
+    return note
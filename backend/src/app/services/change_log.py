@@ -0,0 +1,78 @@
+"""Bounded, sequence-numbered log of recent note changes for delta sync."""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+
+from app.models.note import NoteResponse
+
+
+@dataclass(slots=True, frozen=True)
+class Change:
+    """A created note and the sequence number assigned to its creation."""
+
+    seq: int
+    note: NoteResponse
+
+
+def initial_seq() -> int:
+    """Return a starting sequence number above any issued by an earlier process.
+
+    Numbers start at the current time in microseconds. Each change uses up one
+    number, and no process changes notes more than once per microsecond, so a
+    number handed out before a restart is always below the new range. A client
+    holding one is therefore told to resync instead of being sent a wrong delta.
+
+    Returns:
+        The sequence number to give the first change.
+    """
+    return time.time_ns() // 1000
+
+
+class ChangeLog:
+    """Ring buffer of the most recent ``capacity`` changes.
+
+    Sequence numbers are consecutive, so the changes after any number still in
+    range are a suffix of the buffer. Callers must serialize access; the
+    repository only touches it from the event loop.
+    """
+
+    def __init__(self, capacity: int, first_seq: int = 1) -> None:
+        self._changes: deque[Change] = deque(maxlen=capacity)
+        self.last_seq = first_seq - 1
+
+    def __len__(self) -> int:
+        """Return the number of retained changes."""
+        return len(self._changes)
+
+    def append(self, note: NoteResponse) -> Change:
+        """Record the creation of ``note`` under the next sequence number.
+
+        Args:
+            note: The newly created note.
+
+        Returns:
+            The recorded change.
+        """
+        self.last_seq += 1
+        change = Change(self.last_seq, note)
+        self._changes.append(change)
+        return change
+
+    def since(self, seq: int) -> list[Change] | None:
+        """Return the changes made after ``seq``, oldest first.
+
+        Args:
+            seq: Last sequence number the caller has seen.
+
+        Returns:
+            The changes, or None if some were already evicted or ``seq`` was never
+            issued by this log. The caller must then reload everything.
+        """
+        if seq > self.last_seq:
+            return None
+        oldest = self._changes[0].seq if self._changes else self.last_seq + 1
+        if seq < oldest - 1:
+            return None
+        return list(islice(self._changes, seq + 1 - oldest, None))
@@ -0,0 +1,127 @@
+"""Contiguous corpus buffer searched with C-level ``bytearray.find`` scans."""
+
+import struct
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+
+FIELD_SEPARATOR = b"\x00"
+_HEADER = struct.Struct("<Q")
+
+
+class CorpusBuffer:
+    """All normalized note fields concatenated into one UTF-8 buffer.
+
+    Each note occupies ``field\\x00field\\x00...`` starting at the byte offset
+    recorded for its position. A search repeatedly calls ``bytearray.find`` over
+    the whole buffer and maps each hit back to a note with ``bisect``, then skips
+    straight to the next note so every note is reported at most once.
+
+    UTF-8 is self-synchronizing, so a byte-level substring match is exactly a
+    character-level substring match of the encoded text.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._offsets = array("Q")
+
+    def __len__(self) -> int:
+        """Return the number of notes in the buffer."""
+        return len(self._offsets)
+
+    def add(self, position: int, fields: Iterable[str]) -> None:
+        """Append the note stored at ``position`` to the buffer.
+
+        Args:
+            position: Insertion index of the note; must equal the number of notes added.
+            fields: Normalized searchable fields of the note.
+        """
+        if position != len(self._offsets):
+            raise ValueError(f"expected position {len(self._offsets)}, got {position}")
+        self._offsets.append(len(self._buffer))
+        for field in fields:
+            self._buffer += field.encode()
+            self._buffer += FIELD_SEPARATOR
+
+    def candidates(self, query: str) -> Sequence[int]:
+        """Return positions of notes whose buffer region contains ``query``.
+
+        Hits can only straddle a field boundary when the query itself contains the
+        separator byte, so callers should still confirm each candidate.
+
+        Args:
+            query: Normalized (lower-cased) search term.
+
+        Returns:
+            Sorted candidate positions.
+        """
+        if not query:
+            return range(len(self._offsets))
+        return list(self.iter_candidates(query))
+
+    def iter_candidates(self, query: str, start: int = 0) -> Iterator[int]:
+        """Lazily yield positions at or after ``start`` whose region contains ``query``.
+
+        Each ``find`` resumes where the previous hit's note ends, so stopping early
+        leaves the rest of the buffer unscanned.
+
+        Args:
+            query: Normalized (lower-cased) search term.
+            start: Smallest position to report.
+
+        Yields:
+            Candidate positions in ascending order.
+        """
+        buffer, offsets = self._buffer, self._offsets
+        # Bound the scan to what is stored now; notes appended while the caller is
+        # still consuming start at or beyond ``end``.
+        end = len(buffer)
+        count = len(offsets)
+        needle = query.encode()
+        if not needle:
+            yield from range(start, count)
+            return
+        if start >= count:
+            return
+
+        hit = buffer.find(needle, offsets[start], end)
+        while hit != -1:
+            position = bisect_right(offsets, hit, 0, count) - 1
+            yield position
+            if position + 1 == count:
+                return
+            hit = buffer.find(needle, offsets[position + 1], end)
+
+    def clear(self) -> None:
+        """Drop the buffer and its offsets."""
+        self._buffer = bytearray()
+        self._offsets = array("Q")
+
+    def dump(self, count: int) -> bytes:
+        """Serialize the offsets and buffer region of positions below ``count``.
+
+        Args:
+            count: Number of leading positions to include.
+
+        Returns:
+            Compact binary form accepted by :meth:`load`.
+        """
+        offsets = self._offsets[:count]
+        end = self._offsets[count] if count < len(self._offsets) else len(self._buffer)
+        return _HEADER.pack(count) + offsets.tobytes() + bytes(self._buffer[:end])
+
+    def load(self, data: bytes, count: int) -> None:
+        """Replace the buffer with one produced by :meth:`dump`.
+
+        Args:
+            data: Output of :meth:`dump`.
+            count: Number of positions the dump covers.
+        """
+        (stored,) = _HEADER.unpack_from(data)
+        if stored != count:
+            raise ValueError(f"dump covers {stored} notes, expected {count}")
+        offsets = array("Q")
+        start = _HEADER.size
+        offsets.frombytes(data[start : start + count * offsets.itemsize])
+        self._offsets = offsets
+        self._buffer = bytearray(data[start + count * offsets.itemsize :])
@@ -0,0 +1,87 @@
+"""Fan-out of note change events to Server-Sent Events subscribers."""
+
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from anyio import BrokenResourceError, WouldBlock, create_memory_object_stream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from app.services.change_log import Change
+
+NOTE_CREATED_EVENT = "note_created"
+RESYNC_EVENT = "resync"
+# Comment line sent to idle subscribers so proxies and clients keep the stream open.
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+
+
+def sse_frame(event: str, data: bytes, event_id: int | None = None) -> bytes:
+    """Encode one Server-Sent Events message.
+
+    Args:
+        event: Event type.
+        data: Single-line payload, usually JSON.
+        event_id: Value the client sends back in ``Last-Event-ID`` on reconnect.
+
+    Returns:
+        The encoded message, terminated by a blank line.
+    """
+    id_line = b"" if event_id is None else b"id: %d\n" % event_id
+    return id_line + b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+def change_frame(change: Change) -> bytes:
+    """Encode ``change`` as a ``note_created`` event whose id is its sequence number."""
+    return sse_frame(NOTE_CREATED_EVENT, change.note.model_dump_json().encode(), change.seq)
+
+
+class EventHub:
+    """Delivers encoded events to every subscriber through bounded queues.
+
+    :meth:`publish` never waits. A subscriber whose queue is full has fallen too
+    far behind: its queue is closed, so it receives what is already queued and
+    then the end of its stream, and the publisher moves on. An idle subscriber
+    costs one small in-memory stream and no task of its own.
+
+    Publishing and subscribing must happen on the event loop.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._subscribers: set[MemoryObjectSendStream[bytes]] = set()
+
+    def __len__(self) -> int:
+        """Return the number of current subscribers."""
+        return len(self._subscribers)
+
+    @contextmanager
+    def subscribe(self) -> Generator[MemoryObjectReceiveStream[bytes]]:
+        """Receive events published while the context is open.
+
+        Yields:
+            Stream of encoded events; it ends if the subscriber falls behind.
+        """
+        send, receive = create_memory_object_stream[bytes](self.queue_size)
+        self._subscribers.add(send)
+        try:
+            yield receive
+        finally:
+            self._subscribers.discard(send)
+            send.close()
+            receive.close()
+
+    def publish(self, frame: bytes) -> None:
+        """Queue ``frame`` for every subscriber, dropping those whose queue is full.
+
+        Args:
+            frame: Encoded event.
+        """
+        for send in list(self._subscribers):
+            try:
+                send.send_nowait(frame)
+            except WouldBlock:
+                self._subscribers.discard(send)
+                send.close()
+                self.dropped += 1
+            except BrokenResourceError:
+                self._subscribers.discard(send)
@@ -0,0 +1,195 @@
+"""Symmetric-delete dictionary for typo-tolerant term lookup."""
+
+import struct
+
+# Largest edit distance a lookup may ask for; deletions are indexed up to this depth.
+MAX_DISTANCE = 2
+# Longer terms (URLs, encoded blobs) are left out of the dictionary: their deletion
+# variants grow quadratically with length, and such words are matched exactly.
+MAX_TERM_LENGTH = 32
+# Join the terms filed under one variant, and the entries of a dump. Word tokens
+# never contain either; terms that do are left out.
+_SEPARATOR = "\n"
+_ENTRY_SEPARATOR = "\0"
+_SECTIONS = struct.Struct("<QQQ")
+
+
+def allowed_distance(word: str, requested: int) -> int:
+    """Cap ``requested`` for short words, which would otherwise match almost anything.
+
+    Words of one or two characters are matched exactly, three to five characters
+    tolerate one edit, and longer words up to two.
+
+    Args:
+        word: Query word.
+        requested: Edit distance asked for by the caller.
+
+    Returns:
+        The edit distance to search with.
+    """
+    return max(0, min(requested, len(word) // 3, MAX_DISTANCE))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Return the optimal-string-alignment distance between ``a`` and ``b``.
+
+    Insertions, deletions, substitutions, and transpositions of adjacent
+    characters each cost one edit.
+
+    Args:
+        a: First word.
+        b: Second word.
+        limit: Distance beyond which the exact value is irrelevant.
+
+    Returns:
+        The distance, or ``limit + 1`` if it exceeds ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, previous2[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _deletes(word: str, depth: int) -> set[str]:
+    """Return ``word`` and every string obtained by deleting up to ``depth`` characters."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(min(depth, len(word))):
+        # Deleting one more character from each distinct shorter variant; the set
+        # drops the duplicates that repeated letters and deletion order produce.
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class SymmetricDeleteIndex:
+    """Finds dictionary terms within a small edit distance of a word.
+
+    Every term is filed under each string reachable from it by deleting up to
+    ``MAX_DISTANCE`` characters. Two words within edit distance ``d`` always share
+    such a variant once each has had at most ``d`` characters deleted, so a lookup
+    only generates the query word's own deletions, gathers the terms filed under
+    them, and verifies those few candidates — it never compares against the
+    whole vocabulary. The price is memory: a term of length ``n`` is filed under
+    roughly ``n * n / 2`` variants, which is why terms longer than
+    ``MAX_TERM_LENGTH`` are not added and are only ever matched exactly.
+
+    Most variants file a single term, which is stored as a bare string; only
+    shared variants get a list. This keeps millions of tiny lists off the heap
+    and lets :meth:`load` rebuild the table without a per-term Python loop.
+
+    Terms are only ever added; concurrent lookups during an add are safe.
+    """
+
+    def __init__(self) -> None:
+        self._terms: set[str] = set()
+        # A string holds one term, or several joined by _SEPARATOR after a load.
+        self._variants: dict[str, str | list[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of terms in the dictionary."""
+        return len(self._terms)
+
+    def add(self, term: str) -> None:
+        """Add ``term`` to the dictionary; adding a known or overlong term is a no-op.
+
+        Args:
+            term: Normalized word token.
+        """
+        if (
+            term in self._terms
+            or len(term) > MAX_TERM_LENGTH
+            or _SEPARATOR in term
+            or _ENTRY_SEPARATOR in term
+        ):
+            return
+        for variant in _deletes(term, MAX_DISTANCE):
+            filed = self._variants.get(variant)
+            if filed is None:
+                self._variants[variant] = term
+            elif isinstance(filed, str):
+                self._variants[variant] = [*filed.split(_SEPARATOR), term]
+            else:
+                filed.append(term)
+        self._terms.add(term)
+
+    def lookup(self, word: str, distance: int) -> list[str]:
+        """Return dictionary terms within ``distance`` edits of ``word``.
+
+        Args:
+            word: Normalized query word.
+            distance: Maximum edit distance, at most ``MAX_DISTANCE``.
+
+        Returns:
+            Matching terms, closest first, ties in alphabetical order. A word
+            longer than ``MAX_TERM_LENGTH`` only matches itself, so it is returned
+            as is whether or not it was ever indexed.
+        """
+        if len(word) > MAX_TERM_LENGTH:
+            return [word]
+        distance = min(distance, MAX_DISTANCE)
+        if distance <= 0:
+            return [word] if word in self._terms else []
+        scored: dict[str, int] = {}
+        for variant in _deletes(word, distance):
+            filed = self._variants.get(variant)
+            if filed is None:
+                continue
+            for term in filed.split(_SEPARATOR) if isinstance(filed, str) else filed:
+                if term not in scored:
+                    scored[term] = edit_distance(word, term, distance)
+        matches = [(d, term) for term, d in scored.items() if d <= distance]
+        return [term for _, term in sorted(matches)]
+
+    def dump(self) -> bytes:
+        """Serialize the dictionary; safe to run concurrently with :meth:`add`.
+
+        Returns:
+            Compact binary form accepted by :meth:`load`.
+        """
+        # Terms first: every listed term already has all of its variants filed.
+        # list() copies in one C call, so concurrent adds cannot resize mid-copy.
+        terms = _ENTRY_SEPARATOR.join(list(self._terms)).encode()
+        variants = list(self._variants.items())
+        keys = _ENTRY_SEPARATOR.join([variant for variant, _ in variants]).encode()
+        filed = _ENTRY_SEPARATOR.join(
+            [f if isinstance(f, str) else _SEPARATOR.join(f) for _, f in variants]
+        ).encode()
+        return _SECTIONS.pack(len(terms), len(keys), len(filed)) + terms + keys + filed
+
+    def load(self, data: bytes) -> None:
+        """Replace the dictionary with one produced by :meth:`dump`.
+
+        Args:
+            data: Output of :meth:`dump`.
+        """
+        terms_len, keys_len, filed_len = _SECTIONS.unpack_from(data)
+        start = _SECTIONS.size
+        terms = data[start : start + terms_len].decode()
+        start += terms_len
+        keys = data[start : start + keys_len].decode()
+        start += keys_len
+        filed = data[start : start + filed_len].decode()
+        self._terms = set(terms.split(_ENTRY_SEPARATOR)) if terms else set()
+        # Every term is filed under itself, so a non-empty dictionary has a non-empty key.
+        self._variants = (
+            dict(zip(keys.split(_ENTRY_SEPARATOR), filed.split(_ENTRY_SEPARATOR), strict=True))
+            if keys
+            else {}
+        )
+
+    def clear(self) -> None:
+        """Drop every term."""
+        self._terms.clear()
+        self._variants.clear()
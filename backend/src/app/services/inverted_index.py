@@ -0,0 +1,387 @@
+"""Tokenized inverted index with BM25F relevance ranking."""
+
+import heapq
+import math
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+from app.services.fuzzy_index import SymmetricDeleteIndex, allowed_distance
+from app.services.posting_lists import gallop
+
+type Field = Literal["title", "content"]
+
+# BM25 parameters: term-frequency saturation and length normalization.
+K1 = 1.2
+B = 0.75
+# Weight of a title occurrence relative to a content occurrence.
+TITLE_BOOST = 2.0
+_MAX_TF = 0xFFFF
+_TOKEN_RE = re.compile(r"\w+")
+# Serialized form: note count and dictionary size, then per token its encoded
+# length, number of entries, and number of word offsets.
+_HEADER = struct.Struct("<IQ")
+_ENTRY = struct.Struct("<III")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split normalized text into word tokens.
+
+    Args:
+        text: Already-normalized (lower-cased) text.
+
+    Returns:
+        Runs of Unicode word characters, in order.
+    """
+    return _TOKEN_RE.findall(text)
+
+
+@dataclass(slots=True)
+class _Postings:
+    """Positions containing a term, its frequency in each field, and its word offsets.
+
+    Entry ``i``'s word offsets are ``offsets[ends[i - 1]:ends[i]]`` (from 0 for the
+    first entry). ``positions`` is appended last so that a lock-free reader never
+    sees an entry whose other columns are incomplete.
+    """
+
+    positions: array[int] = field(default_factory=lambda: array("I"))
+    title_tf: array[int] = field(default_factory=lambda: array("H"))
+    content_tf: array[int] = field(default_factory=lambda: array("H"))
+    offsets: array[int] = field(default_factory=lambda: array("I"))
+    ends: array[int] = field(default_factory=lambda: array("I"))
+
+    def word_offsets(self, entry: int) -> array[int]:
+        """Return the ascending word offsets of the term in posting ``entry``."""
+        return self.offsets[self.ends[entry - 1] if entry else 0 : self.ends[entry]]
+
+
+# Memory estimate: an empty _Postings with its five arrays, the items one posting
+# entry adds (position, title and content frequency, offsets end), and a word offset.
+_POSTINGS_BYTES = sys.getsizeof(_Postings()) + 5 * sys.getsizeof(array("I"))
+_ENTRY_BYTES = 4 + 2 + 2 + 4
+_OFFSET_BYTES = 4
+
+
+class _ArrayReader:
+    """Reads consecutive native-order arrays out of a buffer."""
+
+    def __init__(self, view: memoryview, offset: int) -> None:
+        self.view = view
+        self.offset = offset
+
+    def take(self, typecode: Literal["H", "I"], length: int) -> array[int]:
+        """Return the next ``length`` items of type ``typecode`` and advance past them."""
+        items = array(typecode)
+        end = self.offset + length * items.itemsize
+        items.frombytes(self.view[self.offset : end])
+        self.offset = end
+        return items
+
+
+class InvertedIndex:
+    """Maps each token to the notes containing it, for BM25F-ranked retrieval.
+
+    Title and content are scored as two fields of one document (BM25F): each
+    field's term frequency is normalized by that field's length, title hits are
+    weighted by ``TITLE_BOOST``, and the combined frequency is saturated once.
+    Ranking only walks the posting lists of the query's tokens, so its cost is
+    proportional to those lists rather than to the corpus.
+
+    Postings also record every occurrence's word offset within the note: title
+    words count from 0 and content words from one past the title's last, so no
+    phrase can span both fields. :meth:`phrase` intersects the phrase's posting
+    lists and then checks the offsets of the surviving notes only.
+
+    Every distinct token also enters a symmetric-delete dictionary, which
+    :meth:`similar_terms` uses for typo-tolerant lookup.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, _Postings] = {}
+        self._dictionary = SymmetricDeleteIndex()
+        self._title_len = array("I")
+        self._content_len = array("I")
+        self._title_total = 0
+        self._content_total = 0
+        # Running size of the postings, kept by add() so that memory_bytes() is O(1).
+        self._postings_bytes = 0
+
+    def add(self, position: int, title: str, content: str) -> None:
+        """Index the note stored at ``position``.
+
+        Args:
+            position: Insertion index of the note; must equal the number of notes added.
+            title: Normalized title.
+            content: Normalized content.
+        """
+        if position != len(self._title_len):
+            raise ValueError(f"expected position {len(self._title_len)}, got {position}")
+        title_tokens = tokenize(title)
+        content_tokens = tokenize(content)
+        occurrences: defaultdict[str, list[int]] = defaultdict(list)
+        for offset, token in enumerate(title_tokens):
+            occurrences[token].append(offset)
+        for offset, token in enumerate(content_tokens, len(title_tokens) + 1):
+            occurrences[token].append(offset)
+        for token, offsets in occurrences.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = _Postings()
+                self._dictionary.add(token)
+                self._postings_bytes += sys.getsizeof(token) + _POSTINGS_BYTES
+            self._postings_bytes += _ENTRY_BYTES + _OFFSET_BYTES * len(offsets)
+            title_tf = bisect_left(offsets, len(title_tokens))
+            postings.title_tf.append(min(title_tf, _MAX_TF))
+            postings.content_tf.append(min(len(offsets) - title_tf, _MAX_TF))
+            postings.offsets.extend(offsets)
+            postings.ends.append(len(postings.offsets))
+            postings.positions.append(position)
+        self._title_len.append(len(title_tokens))
+        self._content_len.append(len(content_tokens))
+        self._title_total += len(title_tokens)
+        self._content_total += len(content_tokens)
+
+    def __len__(self) -> int:
+        """Return the number of indexed notes."""
+        return len(self._title_len)
+
+    def document_frequency(self, token: str) -> int:
+        """Return how many notes contain ``token`` in either field."""
+        postings = self._postings.get(token)
+        return 0 if postings is None else len(postings.positions)
+
+    def postings(self, token: str, field: Field | None = None) -> Sequence[int]:
+        """Return the sorted positions of notes containing ``token``.
+
+        Args:
+            token: Normalized word token.
+            field: Restrict to notes containing the token in this field.
+
+        Returns:
+            Ascending positions; the index's own array when ``field`` is ``None``.
+        """
+        postings = self._postings.get(token)
+        if postings is None:
+            return ()
+        if field is None:
+            return postings.positions
+        tfs = postings.title_tf if field == "title" else postings.content_tf
+        return [position for position, tf in zip(postings.positions, tfs, strict=False) if tf]
+
+    def similar_terms(self, word: str, distance: int) -> list[str]:
+        """Return indexed tokens within ``distance`` edits of ``word``.
+
+        Args:
+            word: Normalized query word.
+            distance: Requested edit distance; capped for short words by
+                :func:`~app.services.fuzzy_index.allowed_distance`.
+
+        Returns:
+            Matching tokens, closest first.
+        """
+        return self._dictionary.lookup(word, allowed_distance(word, distance))
+
+    def phrase(self, tokens: Sequence[str], field: Field | None = None) -> list[int]:
+        """Return positions of notes containing ``tokens`` as consecutive words.
+
+        The rarest token's posting list drives a galloping intersection with the
+        others; only notes containing every token have their word offsets compared.
+
+        Args:
+            tokens: Normalized word tokens, in phrase order.
+            field: Restrict to phrases inside this field.
+
+        Returns:
+            Ascending positions of matching notes.
+        """
+        entries: list[_Postings] = []
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                return []
+            entries.append(postings)
+        count = len(self._title_len)
+        order = sorted(range(len(entries)), key=lambda i: len(entries[i].positions))
+        cursors = [0] * len(entries)
+        matches: list[int] = []
+        for entry, position in enumerate(entries[order[0]].positions):
+            if position >= count:
+                break
+            cursors[order[0]] = entry
+            for i in order[1:]:
+                positions = entries[i].positions
+                cursors[i] = gallop(positions, position, cursors[i])
+                if cursors[i] == len(positions):
+                    return matches
+                if positions[cursors[i]] != position:
+                    break
+            else:
+                if self._adjacent(entries, cursors, position, field):
+                    matches.append(position)
+        return matches
+
+    def _adjacent(
+        self, entries: list[_Postings], cursors: list[int], position: int, field: Field | None
+    ) -> bool:
+        """Return whether the entries at ``cursors`` hold consecutive word offsets."""
+        following = [set(p.word_offsets(c)) for p, c in zip(entries[1:], cursors[1:], strict=True)]
+        title_len = self._title_len[position]
+        for start in entries[0].word_offsets(cursors[0]):
+            if field == "title" and start >= title_len:
+                break
+            if field == "content" and start < title_len:
+                continue
+            if all(start + i in offsets for i, offsets in enumerate(following, 1)):
+                return True
+        return False
+
+    def memory_bytes(self) -> int:
+        """Return the approximate memory held by postings and field statistics.
+
+        The symmetric-delete dictionary behind :meth:`similar_terms` is not included.
+        """
+        containers = (self._postings, self._title_len, self._content_len)
+        return self._postings_bytes + sum(map(sys.getsizeof, containers))
+
+    def top_k(self, query: str, k: int) -> list[int]:
+        """Return the ``k`` best-scoring positions for ``query``.
+
+        Notes match when they contain any query token. Ties keep insertion order.
+
+        Args:
+            query: Normalized (lower-cased) search text.
+            k: Maximum number of results.
+
+        Returns:
+            Positions ordered from most to least relevant.
+        """
+        count = len(self._title_len)
+        if count == 0 or k <= 0:
+            return []
+        title_avg = max(self._title_total / count, 1.0)
+        content_avg = max(self._content_total / count, 1.0)
+        title_len, content_len = self._title_len, self._content_len
+
+        scores: dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            df = len(postings.positions)
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for position, t_tf, c_tf in zip(
+                postings.positions, postings.title_tf, postings.content_tf, strict=False
+            ):
+                if position >= count:
+                    break
+                tf = 0.0
+                if t_tf:
+                    tf += TITLE_BOOST * t_tf / (1 - B + B * title_len[position] / title_avg)
+                if c_tf:
+                    tf += c_tf / (1 - B + B * content_len[position] / content_avg)
+                scores[position] = scores.get(position, 0.0) + idf * tf / (K1 + tf)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [position for position, _ in best]
+
+    def dump(self, count: int) -> bytes:
+        """Serialize the index for positions below ``count``.
+
+        Safe to run concurrently with :meth:`add`: entries below ``count`` are
+        complete and never change.
+
+        Args:
+            count: Number of leading positions to include; all must be indexed.
+
+        Returns:
+            Compact binary form accepted by :meth:`load`.
+        """
+        # The dictionary may also hold words of notes past ``count``; until those
+        # notes are restored such words simply match nothing.
+        dictionary = self._dictionary.dump()
+        parts = [
+            _HEADER.pack(count, len(dictionary)),
+            dictionary,
+            self._title_len[:count].tobytes(),
+            self._content_len[:count].tobytes(),
+        ]
+        # list() copies the items in one C call, so concurrent adds cannot resize the
+        # dict mid-iteration.
+        for token, postings in list(self._postings.items()):
+            entries = bisect_left(postings.positions, count)
+            if entries == 0:
+                continue
+            words = postings.ends[entries - 1]
+            encoded = token.encode()
+            parts += (
+                _ENTRY.pack(len(encoded), entries, words),
+                encoded,
+                postings.positions[:entries].tobytes(),
+                postings.title_tf[:entries].tobytes(),
+                postings.content_tf[:entries].tobytes(),
+                postings.offsets[:words].tobytes(),
+                postings.ends[:entries].tobytes(),
+            )
+        return b"".join(parts)
+
+    def load(self, data: bytes) -> int:
+        """Replace the index with one produced by :meth:`dump`.
+
+        Args:
+            data: Output of :meth:`dump`.
+
+        Returns:
+            Number of positions the loaded index covers.
+        """
+        view = memoryview(data)
+        count, dictionary_len = _HEADER.unpack_from(view)
+        dictionary = SymmetricDeleteIndex()
+        dictionary.load(data[_HEADER.size : _HEADER.size + dictionary_len])
+        reader = _ArrayReader(view, _HEADER.size + dictionary_len)
+        title_len = reader.take("I", count)
+        content_len = reader.take("I", count)
+        postings: dict[str, _Postings] = {}
+        postings_bytes = 0
+        while reader.offset < len(view):
+            token_len, entries, words = _ENTRY.unpack_from(view, reader.offset)
+            reader.offset += _ENTRY.size
+            token = str(view[reader.offset : reader.offset + token_len], "utf-8")
+            reader.offset += token_len
+            postings[token] = _Postings(
+                positions=reader.take("I", entries),
+                title_tf=reader.take("H", entries),
+                content_tf=reader.take("H", entries),
+                offsets=reader.take("I", words),
+                ends=reader.take("I", entries),
+            )
+            postings_bytes += (
+                sys.getsizeof(token)
+                + _POSTINGS_BYTES
+                + _ENTRY_BYTES * entries
+                + _OFFSET_BYTES * words
+            )
+        self._postings = postings
+        self._postings_bytes = postings_bytes
+        self._dictionary = dictionary
+        self._title_len = title_len
+        self._content_len = content_len
+        self._title_total = sum(title_len)
+        self._content_total = sum(content_len)
+        return count
+
+    def clear(self) -> None:
+        """Drop all postings and field statistics."""
+        self._postings.clear()
+        self._dictionary.clear()
+        self._title_len = array("I")
+        self._content_len = array("I")
+        self._title_total = 0
+        self._content_total = 0
+        self._postings_bytes = 0
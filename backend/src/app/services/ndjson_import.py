@@ -0,0 +1,92 @@
+"""Incremental import of notes from a newline-delimited JSON stream."""
+
+import logging
+from collections.abc import AsyncIterable, Awaitable, Callable, Sequence
+
+from pydantic import ValidationError
+
+from app.models.note import NoteCreate, NoteImportResult
+
+logger = logging.getLogger(__name__)
+
+
+class ImportLineError(ValueError):
+    """An NDJSON line could not be imported; every line before it was."""
+
+    def __init__(self, line: int, imported: int, reason: str) -> None:
+        super().__init__(f"line {line}: {reason}; {imported} note(s) before it were imported")
+        self.line = line
+        self.imported = imported
+
+
+async def import_ndjson(
+    chunks: AsyncIterable[bytes],
+    create_many: Callable[[Sequence[NoteCreate]], Awaitable[Sequence[object]]],
+    *,
+    batch_size: int,
+    max_line_bytes: int,
+) -> NoteImportResult:
+    """Parse NDJSON notes from ``chunks`` and create them ``batch_size`` at a time.
+
+    Only the current batch and one partial line are held in memory, however long
+    the stream. Blank lines are skipped. On the first invalid line the notes
+    before it are still created, so the import can resume from that line.
+
+    Args:
+        chunks: Raw body chunks, split anywhere.
+        create_many: Stores one batch of notes durably.
+        batch_size: Notes per ``create_many`` call.
+        max_line_bytes: Longest accepted line, excluding its newline.
+
+    Returns:
+        How many notes were imported, in how many batches.
+
+    Raises:
+        ImportLineError: If a line is too long or is not a valid note.
+    """
+    result = NoteImportResult(imported=0, batches=0)
+    batch: list[NoteCreate] = []
+    pending = bytearray()
+    line_no = 0
+
+    async def flush() -> None:
+        if batch:
+            await create_many(batch)
+            result.imported += len(batch)
+            result.batches += 1
+            batch.clear()
+            logger.info("Imported %d note(s) so far", result.imported)
+
+    async def parse(line: bytes | bytearray) -> None:
+        nonlocal line_no
+        line_no += 1
+        if len(line) > max_line_bytes:
+            await flush()
+            raise ImportLineError(line_no, result.imported, f"longer than {max_line_bytes} bytes")
+        if not line.strip():
+            return
+        try:
+            batch.append(NoteCreate.model_validate_json(line))
+        except ValidationError as exc:
+            await flush()
+            errors = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+            raise ImportLineError(line_no, result.imported, errors or str(exc)) from exc
+        if len(batch) >= batch_size:
+            await flush()
+
+    async for chunk in chunks:
+        pending += chunk
+        start = 0
+        while (end := pending.find(b"\n", start)) != -1:
+            await parse(pending[start:end])
+            start = end + 1
+        del pending[:start]
+        if len(pending) > max_line_bytes:
+            await flush()
+            raise ImportLineError(
+                line_no + 1, result.imported, f"longer than {max_line_bytes} bytes"
+            )
+    if pending:
+        await parse(pending)
+    await flush()
+    return result
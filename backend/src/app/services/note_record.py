@@ -0,0 +1,77 @@
+"""Stored representation of a note with precomputed search and response forms."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Self
+
+from app.models.note import NoteResponse
+
+
+def normalize(text: str) -> str:
+    """Return the case-insensitive search form of ``text``.
+
+    Args:
+        text: Raw title, content, or query text.
+
+    Returns:
+        Lower-cased text, matching the API's case-insensitive substring semantics.
+    """
+    return text.lower()
+
+
+def render_json_array(fragments: Iterable[bytes]) -> bytes:
+    """Join pre-serialized JSON objects into a JSON array body.
+
+    Args:
+        fragments: Serialized JSON objects.
+
+    Returns:
+        UTF-8 encoded JSON array.
+    """
+    return b"[" + b",".join(fragments) + b"]"
+
+
+@dataclass(slots=True, frozen=True)
+class NoteRecord:
+    """A stored note together with its precomputed search keys and JSON body."""
+
+    note: NoteResponse
+    title_key: str
+    content_key: str
+    json: bytes
+
+    @classmethod
+    def from_note(cls, note: NoteResponse) -> Self:
+        """Build a record, normalizing and serializing the note once.
+
+        Args:
+            note: The note to wrap.
+
+        Returns:
+            Record carrying the note, its normalized title and content, and its
+            JSON serialization as returned by the API.
+        """
+        return cls(
+            note=note,
+            title_key=normalize(note.title),
+            content_key=normalize(note.content),
+            json=note.model_dump_json().encode(),
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes) -> Self:
+        """Rebuild a record from its cached JSON, e.g. when restoring from disk.
+
+        Args:
+            data: JSON produced by :meth:`from_note`.
+
+        Returns:
+            Record reusing ``data`` as its serialization.
+        """
+        note = NoteResponse.model_validate_json(data)
+        return cls(
+            note=note,
+            title_key=normalize(note.title),
+            content_key=normalize(note.content),
+            json=data,
+        )
@@ -1,62 +1,501 @@
 """In-memory note storage and business logic."""
 
 import logging
-from collections.abc import Sequence
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
 from datetime import UTC, datetime
+from itertools import takewhile
 from uuid import uuid4
 
-from app.models.note import NoteCreate, NoteResponse
+from app.models.note import NoteCreate, NoteResponse, NoteStats
+from app.services.inverted_index import InvertedIndex
+from app.services.note_record import NoteRecord, normalize, render_json_array
+from app.services.pagination import NotePage, decode_cursor, encode_cursor
+from app.services.query_language import MatchMode, all_words, expand_terms, parse_query
+from app.services.query_planner import QueryPlanner
+from app.services.result_cache import ResultCache
+from app.services.search_engine import SearchEngineName, create_search_engine
+from app.services.suggest_index import SuggestIndex, normalize_prefix
+from app.services.wal import WriteAheadLog
 
 logger = logging.getLogger(__name__)
 
 
 class NoteService:
-    """Service layer for note CRUD operations with in-memory storage."""
+    """Service layer for note CRUD operations with in-memory storage.
 
-    def __init__(self) -> None:
-        self._notes: list[NoteResponse] = []
+    Writes are serialized by a lock; reads are lock-free because records are only
+    ever appended, and a record is always stored before it is indexed.
+
+    Full substring searches (:meth:`list_all`, :meth:`count`) go through a
+    :class:`~app.services.result_cache.ResultCache` of matching positions, which
+    creates patch rather than flush; pages read it but never fill it, since a page
+    usually stops long before a full scan would.
+    """
+
+    def __init__(
+        self,
+        search_engine: SearchEngineName = "trigram",
+        *,
+        cache_entries: int = 256,
+        cache_bytes: int = 8 << 20,
+    ) -> None:
+        self._records: list[NoteRecord] = []
+        self._positions: dict[str, int] = {}
+        self.search_engine: SearchEngineName = search_engine
+        self._index = create_search_engine(search_engine)
+        self._terms = InvertedIndex()
+        self._suggestions = SuggestIndex()
+        self._cache = ResultCache(cache_entries, cache_bytes)
+        self._write_lock = threading.Lock()
+        self._wal: WriteAheadLog | None = None
+        self._corpus_bytes = 0
+
+    def restore(
+        self,
+        notes: Iterable[bytes],
+        index: tuple[str, bytes] | None = None,
+        terms: bytes | None = None,
+    ) -> int:
+        """Load previously persisted notes without logging them again.
+
+        An empty service builds its indexes in bulk: serialized indexes are loaded
+        as is and the suggestion keys are sorted once. Otherwise the notes are
+        indexed one by one, as if created.
+
+        Args:
+            notes: Cached JSON of each note, in original insertion order.
+            index: ``(engine name, data)`` from :meth:`dump_index` covering exactly
+                ``notes``. Used instead of re-indexing when the service is empty and
+                runs the same engine.
+            terms: Word index from :meth:`dump_terms` covering exactly ``notes``.
+                Used instead of re-indexing when the service is empty.
+
+        Returns:
+            Number of notes restored.
+        """
+        with self._write_lock:
+            if self._records:
+                restored = 0
+                for note in notes:
+                    self._insert(NoteRecord.from_json(note))
+                    restored += 1
+                return restored
+            records = [NoteRecord.from_json(note) for note in notes]
+            for position, record in enumerate(records):
+                self._records.append(record)
+                self._positions[record.note.id] = position
+                self._corpus_bytes += len(record.json)
+            if index is not None and index[0] == self.search_engine:
+                self._index.load(index[1], len(records))
+            else:
+                for position, record in enumerate(records):
+                    self._index.add(position, (record.title_key, record.content_key))
+            if not terms or self._terms.load(terms) != len(records):
+                self._terms.clear()
+                for position, record in enumerate(records):
+                    self._terms.add(position, record.title_key, record.content_key)
+            self._suggestions.add_many(record.title_key for record in records)
+            self._cache.clear()
+        return len(records)
+
+    def attach_log(self, wal: WriteAheadLog) -> None:
+        """Log every subsequent create to ``wal``.
+
+        Args:
+            wal: Open write-ahead log.
+        """
+        with self._write_lock:
+            self._wal = wal
+
+    def detach_log(self) -> None:
+        """Close the attached write-ahead log, if any."""
+        with self._write_lock:
+            wal, self._wal = self._wal, None
+        if wal is not None:
+            wal.close()
+
+    def checkpoint(self, cut: Callable[[], None]) -> list[bytes]:
+        """Capture a consistent copy of the store for snapshotting.
+
+        ``cut`` runs while writes are paused, so it can rotate the write-ahead log
+        at exactly the point the returned copy covers.
+
+        Args:
+            cut: Callback invoked with the write lock held.
+
+        Returns:
+            Cached JSON of every stored note, in insertion order.
+        """
+        with self._write_lock:
+            cut()
+            return [record.json for record in self._records]
+
+    def dump_index(self, count: int) -> tuple[str, bytes]:
+        """Serialize the search index for the first ``count`` notes.
+
+        Runs without pausing writes; pair it with :meth:`checkpoint`.
+
+        Args:
+            count: Number of notes returned by :meth:`checkpoint`.
+
+        Returns:
+            ``(engine name, data)`` accepted by :meth:`restore`.
+        """
+        return self.search_engine, self._index.dump(count)
+
+    def dump_terms(self, count: int) -> bytes:
+        """Serialize the word index for the first ``count`` notes.
+
+        Runs without pausing writes; pair it with :meth:`checkpoint`.
+
+        Args:
+            count: Number of notes returned by :meth:`checkpoint`.
+
+        Returns:
+            Data accepted by :meth:`restore` as ``terms``.
+        """
+        return self._terms.dump(count)
 
     def create(self, data: NoteCreate) -> NoteResponse:
         """Create a new note and return it.
 
+        With a write-ahead log attached this blocks until the note is durable under
+        the log's fsync policy, so it must not be called on the event loop.
+
         Args:
             data: Validated note creation payload.
 
         Returns:
             The newly created note with generated id and timestamp.
         """
-        note = NoteResponse(
-            id=str(uuid4()),
-            title=data.title,
-            content=data.content,
-            created_at=datetime.now(UTC),
-        )
-        self._notes.append(note)
+        note = _new_note(data)
+        record = NoteRecord.from_note(note)
+        with self._write_lock:
+            wal = self._wal
+            seq = wal.write(record.json) if wal is not None else 0
+            self._insert(record)
+        if wal is not None:
+            wal.sync(seq)
         logger.info("Created note %s with title '%s'", note.id, note.title)
         return note
 
-    def list_all(self, query: str | None = None) -> Sequence[NoteResponse]:
+    def create_many(self, items: Iterable[NoteCreate]) -> list[NoteResponse]:
+        """Create several notes at once, logging them as a single batch.
+
+        Args:
+            items: Validated note creation payloads.
+
+        Returns:
+            The created notes, in the order given.
+        """
+        records = [NoteRecord.from_note(_new_note(data)) for data in items]
+        with self._write_lock:
+            wal = self._wal
+            seq = wal.write_many(record.json for record in records) if wal is not None else 0
+            for record in records:
+                self._insert(record)
+        if wal is not None and records:
+            wal.sync(seq)
+        logger.info("Created %d note(s) in bulk", len(records))
+        return [record.note for record in records]
+
+    def _insert(self, record: NoteRecord) -> None:
+        """Store and index ``record``; callers must hold the write lock."""
+        position = len(self._records)
+        self._records.append(record)
+        self._index.add(position, (record.title_key, record.content_key))
+        self._terms.add(position, record.title_key, record.content_key)
+        self._suggestions.add(record.title_key)
+        self._positions[record.note.id] = position
+        self._corpus_bytes += len(record.json)
+        self._cache.note_added(position, record.title_key, record.content_key)
+
+    def get(self, note_id: str) -> NoteResponse | None:
+        """Look up a single note by id.
+
+        Args:
+            note_id: Identifier of the note.
+
+        Returns:
+            The note, or None if no note has that id.
+        """
+        position = self._positions.get(note_id)
+        if position is None:
+            return None
+        return self._records[position].note
+
+    def list_all(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Sequence[NoteResponse]:
         """Return all notes, optionally filtered by keyword.
 
         Args:
             query: Case-insensitive search term applied to title and content.
+            mode: ``"substring"`` to match ``query`` literally, or ``"boolean"`` to
+                parse it with the boolean query language.
+            fuzzy: Maximum edit distance (at most 2) tolerated per query word. When
+                non-zero, words match whole indexed words instead of substrings and
+                single words in boolean queries match their near spellings too.
 
         Returns:
             Sequence of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        return [record.note for record in self._match_all(query, mode, fuzzy)]
+
+    def list_all_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> bytes:
+        """Return the JSON array body for :meth:`list_all` from cached fragments.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            UTF-8 encoded JSON array of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        return render_json_array(record.json for record in self._match_all(query, mode, fuzzy))
+
+    def list_page(
+        self,
+        query: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+    ) -> NotePage:
+        """Return one page of notes in insertion order, optionally filtered by keyword.
+
+        Pages are keyed on insertion position, which never changes once assigned, so
+        notes created while a client is paging simply appear on later pages.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            limit: Maximum number of notes on the page.
+            cursor: ``next_cursor`` from the previous page, or None for the first page.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            The page of notes and the cursor for the next page, if any.
+
+        Raises:
+            ValueError: If ``cursor`` or a boolean query is malformed.
+        """
+        start = 0 if cursor is None else decode_cursor(cursor) + 1
+        records = self._records
+        page: list[bytes] = []
+        last = start
+        has_more = False
+        # Stop at the first match past the page: it proves another page exists
+        # without scanning any further.
+        for position in self._iter_matches(query, start, mode, fuzzy):
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(records[position].json)
+            last = position
+        next_cursor = encode_cursor(last) if has_more else None
+        logger.info("Listed page of %d note(s) for query %r", len(page), query)
+        return NotePage(notes_json=page, next_cursor=next_cursor)
+
+    def iter_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Generator[bytes]:
+        """Iterate the JSON of matching notes as of this call, in insertion order.
+
+        Records are append-only, so stopping at the count taken now yields a
+        consistent snapshot however long iteration takes, without copying
+        anything.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            Each note's cached JSON.
+
+        Raises:
+            ValueError: If a boolean query is malformed; raised by this call,
+                before iteration starts.
+        """
+        records = self._records
+        end = len(records)
+        positions = self._iter_matches(query, 0, mode, fuzzy)
+        return (records[position].json for position in takewhile(lambda p: p < end, positions))
+
+    def list_ranked(self, query: str, *, limit: int) -> list[NoteResponse]:
+        """Return the notes most relevant to ``query``, best first.
+
+        Args:
+            query: Search text; notes containing any of its words are ranked.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            Up to ``limit`` notes ordered by BM25 score.
+        """
+        return [self._records[position].note for position in self._rank(query, limit)]
+
+    def list_ranked_json(self, query: str, *, limit: int) -> bytes:
+        """Return the JSON array body for :meth:`list_ranked` from cached fragments.
+
+        Args:
+            query: Search text; notes containing any of its words are ranked.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            UTF-8 encoded JSON array of the best-scoring notes.
+        """
+        return render_json_array(
+            self._records[position].json for position in self._rank(query, limit)
+        )
+
+    def _rank(self, query: str, limit: int) -> list[int]:
+        """Return positions of the ``limit`` best matches for ``query``."""
+        positions = self._terms.top_k(normalize(query), limit)
+        logger.info("Ranked notes for '%s' — %d result(s)", query, len(positions))
+        return positions
+
+    def suggest(self, prefix: str, *, limit: int) -> list[str]:
+        """Complete ``prefix`` from note titles and the words in them.
+
+        Args:
+            prefix: Text typed so far.
+            limit: Maximum number of completions.
+
+        Returns:
+            Normalized completions in alphabetical order.
+        """
+        key = normalize_prefix(prefix)
+        return self._suggestions.complete(key, limit) if key else []
+
+    def count(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> int:
+        """Count notes, optionally filtered by keyword.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            Number of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
         """
         if query is None:
-            logger.info("Listing all notes (count=%d)", len(self._notes))
-            return list(self._notes)
-
-        q_lower = query.lower()
-        results = [
-            note
-            for note in self._notes
-            if q_lower in note.title.lower() or q_lower in note.content.lower()
-        ]
+            return len(self._records)
+        return len(self._match_positions(query, mode, fuzzy))
+
+    def search_cost(self, query: str | None = None) -> int:
+        """Estimate the work of listing or searching notes, in corpus bytes.
+
+        Every stored note may have to be verified or serialized, so the estimate is
+        the total size of the stored JSON regardless of ``query``.
+
+        Args:
+            query: Search term the caller is about to run.
+
+        Returns:
+            Upper bound on the bytes a full listing or search touches.
+        """
+        return self._corpus_bytes
+
+    def stats(self) -> NoteStats:
+        """Report the note count, word index memory, and result cache counters.
+
+        Returns:
+            Storage statistics.
+        """
+        return NoteStats(
+            notes=len(self._records),
+            index_bytes=self._terms.memory_bytes(),
+            cache_hits=self._cache.hits,
+            cache_misses=self._cache.misses,
+        )
+
+    def _match_all(self, query: str | None, mode: MatchMode, fuzzy: int) -> list[NoteRecord]:
+        """Return every record matching ``query`` in insertion order."""
+        records = self._records
+        if query is None:
+            logger.info("Listing all notes (count=%d)", len(records))
+            return list(records)
+
+        results = [records[position] for position in self._match_positions(query, mode, fuzzy)]
         logger.info("Searched notes for '%s' — %d result(s)", query, len(results))
         return results
 
+    def _match_positions(self, query: str, mode: MatchMode, fuzzy: int) -> Sequence[int]:
+        """Return every position matching ``query``, via the cache for substring queries."""
+        if mode == "boolean" or fuzzy:
+            return list(self._iter_matches(query, 0, mode, fuzzy))
+        q_key = normalize(query)
+        cached = self._cache.lookup(q_key)
+        if cached is not None:
+            return cached
+        version = self._cache.version
+        positions = list(self._iter_substring(q_key, 0))
+        self._cache.store(q_key, positions, version)
+        return positions
+
+    def _iter_matches(
+        self, query: str | None, start: int, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Iterator[int]:
+        """Yield positions at or after ``start`` that match ``query``, in order."""
+        if query is None:
+            return iter(range(start, len(self._records)))
+        if mode == "boolean" or fuzzy:
+            node = parse_query(query) if mode == "boolean" else all_words(query)
+            if fuzzy:
+                node = expand_terms(node, lambda word: self._terms.similar_terms(word, fuzzy))
+            positions = QueryPlanner(self._terms).evaluate(node)
+            return iter(positions[bisect_left(positions, start) :])
+        q_key = normalize(query)
+        cached = self._cache.lookup(q_key)
+        if cached is not None:
+            return iter(cached[bisect_left(cached, start) :])
+        return self._iter_substring(q_key, start)
+
+    def _iter_substring(self, q_key: str, start: int) -> Iterator[int]:
+        """Yield positions at or after ``start`` whose fields contain ``q_key``."""
+        records = self._records
+        for position in self._index.iter_candidates(q_key, start):
+            record = records[position]
+            if q_key in record.title_key or q_key in record.content_key:
+                yield position
+
     def clear(self) -> None:
-        """Remove all notes (used in testing)."""
-        self._notes.clear()
+        """Remove all notes, including any logged ones (used in testing)."""
+        with self._write_lock:
+            self._records.clear()
+            self._positions.clear()
+            self._index.clear()
+            self._terms.clear()
+            self._suggestions.clear()
+            self._cache.clear()
+            self._corpus_bytes = 0
+            if self._wal is not None:
+                self._wal.truncate()
+
+
+def _new_note(data: NoteCreate) -> NoteResponse:
+    """Assign an id and creation time to ``data``."""
+    return NoteResponse(
+        id=str(uuid4()),
+        title=data.title,
+        content=data.content,
+        created_at=datetime.now(UTC),
+    )
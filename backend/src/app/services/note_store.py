@@ -0,0 +1,115 @@
+"""Storage backend interface shared by the in-memory and SQLite note stores."""
+
+from collections.abc import Generator, Iterable, Sequence
+from typing import TYPE_CHECKING, Literal, Protocol
+
+from app.models.note import NoteCreate, NoteResponse, NoteStats
+from app.services.note_service import NoteService
+from app.services.pagination import NotePage
+from app.services.query_language import MatchMode
+from app.services.sqlite_store import SqliteNoteService
+
+if TYPE_CHECKING:
+    from app.config import Settings
+
+type StorageBackend = Literal["memory", "sqlite"]
+
+
+class NoteStore(Protocol):
+    """Operations the notes routes need from a storage backend."""
+
+    def create(self, data: NoteCreate) -> NoteResponse:
+        """Create and return a new note."""
+        ...
+
+    def create_many(self, items: Iterable[NoteCreate]) -> list[NoteResponse]:
+        """Create several notes in one durable batch."""
+        ...
+
+    def get(self, note_id: str) -> NoteResponse | None:
+        """Return the note with ``note_id``, if any."""
+        ...
+
+    def list_all(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Sequence[NoteResponse]:
+        """Return every note matching ``query`` in insertion order."""
+        ...
+
+    def list_all_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> bytes:
+        """Return :meth:`list_all` as a JSON array body."""
+        ...
+
+    def list_page(
+        self,
+        query: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+    ) -> NotePage:
+        """Return one keyset-paginated page of matching notes."""
+        ...
+
+    def iter_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Generator[bytes]:
+        """Iterate the JSON of matching notes from a snapshot taken by this call."""
+        ...
+
+    def list_ranked(self, query: str, *, limit: int) -> Sequence[NoteResponse]:
+        """Return up to ``limit`` notes most relevant to ``query``, best first."""
+        ...
+
+    def list_ranked_json(self, query: str, *, limit: int) -> bytes:
+        """Return :meth:`list_ranked` as a JSON array body."""
+        ...
+
+    def suggest(self, prefix: str, *, limit: int) -> list[str]:
+        """Return up to ``limit`` title or title-word completions of ``prefix``."""
+        ...
+
+    def count(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> int:
+        """Return the number of notes matching ``query``."""
+        ...
+
+    def search_cost(self, query: str | None = None) -> int:
+        """Estimate in bytes how much data listing or searching for ``query`` touches."""
+        ...
+
+    def stats(self) -> NoteStats:
+        """Return the note count and word index size."""
+        ...
+
+    def clear(self) -> None:
+        """Remove every note (used in testing)."""
+        ...
+
+
+def create_note_store(settings: "Settings") -> NoteStore:
+    """Instantiate the storage backend selected in settings.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        An in-memory NoteService or a SQLite-backed store.
+    """
+    match settings.storage_backend:
+        case "memory":
+            return NoteService(
+                search_engine=settings.search_engine,
+                cache_entries=settings.search_cache_entries,
+                cache_bytes=settings.search_cache_bytes,
+            )
+        case "sqlite":
+            return SqliteNoteService(
+                settings.sqlite_path,
+                readers=settings.sqlite_readers,
+                synchronous="FULL" if settings.wal_fsync == "always" else "NORMAL",
+            )
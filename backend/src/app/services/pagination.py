@@ -0,0 +1,79 @@
+"""Keyset pagination primitives shared by note storage backends."""
+
+import base64
+import binascii
+from dataclasses import dataclass
+
+from app.models.note import NoteResponse
+from app.services.note_record import render_json_array
+
+_CURSOR_PREFIX = "k:"
+# Keys are SQLite rowids or list positions, so none exceeds a signed 64-bit integer.
+_MAX_KEY = 2**63 - 1
+_MAX_KEY_DIGITS = len(str(_MAX_KEY))
+
+
+def encode_cursor(key: int) -> str:
+    """Encode a storage key as an opaque, URL-safe cursor.
+
+    Args:
+        key: Insertion-order key of the last note on a page.
+
+    Returns:
+        Opaque cursor string.
+    """
+    raw = f"{_CURSOR_PREFIX}{key}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Opaque cursor string from a previous page.
+
+    Returns:
+        The insertion-order key the cursor points at.
+
+    Raises:
+        ValueError: If the cursor is malformed or its key is out of range.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    key = raw.removeprefix(_CURSOR_PREFIX)
+    if (
+        key == raw
+        or not (key.isascii() and key.isdigit())
+        or len(key) > _MAX_KEY_DIGITS
+        or int(key) > _MAX_KEY
+    ):
+        raise ValueError("Invalid cursor")
+    return int(key)
+
+
+@dataclass(slots=True, frozen=True)
+class NotePage:
+    """One page of serialized notes plus the cursor for the following page.
+
+    ``next_cursor`` is set only when another match is known to exist, so clients
+    never fetch an empty trailing page.
+    """
+
+    notes_json: list[bytes]
+    next_cursor: str | None
+
+    @property
+    def notes(self) -> list[NoteResponse]:
+        """The notes on this page, parsed from their JSON."""
+        return [NoteResponse.model_validate_json(data) for data in self.notes_json]
+
+    @property
+    def has_more(self) -> bool:
+        """Whether at least one more matching note follows this page."""
+        return self.next_cursor is not None
+
+    def to_json(self) -> bytes:
+        """Serialize the page's notes as a JSON array from the cached fragments."""
+        return render_json_array(self.notes_json)
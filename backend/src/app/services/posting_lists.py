@@ -0,0 +1,51 @@
+"""Set operations on ascending posting lists."""
+
+from bisect import bisect_left
+from collections.abc import Sequence
+
+
+def gallop(values: Sequence[int], target: int, lo: int = 0) -> int:
+    """Return the first index at or after ``lo`` whose value is not below ``target``.
+
+    Probes ``lo + 1, lo + 3, lo + 7, ...`` until it overshoots, then bisects the
+    last step, so a lookup costs O(log distance) rather than O(log len(values)).
+
+    Args:
+        values: Ascending sequence.
+        target: Value to locate.
+        lo: Index to start from.
+
+    Returns:
+        Insertion point of ``target`` in ``values[lo:]``, as an index into ``values``.
+    """
+    step = 1
+    hi = lo
+    while hi < len(values) and values[hi] < target:
+        lo = hi + 1
+        hi += step
+        step *= 2
+    return bisect_left(values, target, lo, min(hi, len(values)))
+
+
+def intersect(small: Sequence[int], large: Sequence[int]) -> list[int]:
+    """Return values present in both ascending sequences, galloping through ``large``."""
+    result: list[int] = []
+    lo = 0
+    for value in small:
+        lo = gallop(large, value, lo)
+        if lo == len(large):
+            break
+        if large[lo] == value:
+            result.append(value)
+    return result
+
+
+def difference(values: Sequence[int], excluded: Sequence[int]) -> list[int]:
+    """Return values of ``values`` absent from ``excluded``; both ascending."""
+    result: list[int] = []
+    lo = 0
+    for value in values:
+        lo = gallop(excluded, value, lo)
+        if lo == len(excluded) or excluded[lo] != value:
+            result.append(value)
+    return result
@@ -0,0 +1,238 @@
+"""Boolean search query language: lexer, parser, and syntax tree.
+
+Grammar (operators are upper-case; juxtaposed clauses are ANDed)::
+
+    query   := or
+    or      := and ("OR" and)*
+    and     := unary (["AND"] unary)*
+    unary   := ("NOT" | "-") unary | "(" or ")" | term
+    term    := [("title" | "content") ":"] (word | '"' phrase '"')
+
+A term matches notes containing its words as whole tokens, adjacent and in order
+when there are several (a quoted phrase, or a word such as ``e-mail`` that
+tokenizes into more than one). ``title:`` and ``content:`` restrict a term to one
+field. Parentheses and negations may nest at most ``MAX_QUERY_DEPTH`` deep.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from app.services.inverted_index import Field, tokenize
+from app.services.note_record import normalize
+
+type MatchMode = Literal["substring", "boolean"]
+
+# Deepest nesting of parentheses and NOTs accepted; the parser, planner, and SQL
+# translation all recurse once per level.
+MAX_QUERY_DEPTH = 32
+_FIELDS: tuple[Field, ...] = ("title", "content")
+_OPERATORS = frozenset({"AND", "OR", "NOT"})
+_SPECIAL = '()"'
+
+
+@dataclass(slots=True, frozen=True)
+class Term:
+    """Normalized tokens that must appear adjacently, optionally in one field."""
+
+    tokens: tuple[str, ...]
+    field: Field | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class And:
+    """Matches notes matched by every child."""
+
+    children: tuple["Node", ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Or:
+    """Matches notes matched by any child."""
+
+    children: tuple["Node", ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Not:
+    """Matches notes not matched by its child."""
+
+    child: "Node"
+
+
+type Node = Term | And | Or | Not
+
+
+def parse_query(text: str) -> Node:
+    """Parse a boolean query into its syntax tree.
+
+    Args:
+        text: Raw query text.
+
+    Returns:
+        Root node of the query.
+
+    Raises:
+        ValueError: If the query is empty or malformed.
+    """
+    parser = _Parser(_lex(text))
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise ValueError(f"Unexpected {parser.peek()!r} in query")
+    return node
+
+
+def all_words(text: str) -> Node:
+    """Build a query requiring every word of ``text``, as plain search would.
+
+    Args:
+        text: Raw search text.
+
+    Returns:
+        An AND of one term per distinct word.
+
+    Raises:
+        ValueError: If ``text`` contains no searchable words.
+    """
+    words = dict.fromkeys(tokenize(normalize(text)))
+    if not words:
+        raise ValueError(f"Query {text!r} contains no searchable words")
+    terms = tuple(Term((word,)) for word in words)
+    return terms[0] if len(terms) == 1 else And(terms)
+
+
+def expand_terms(node: Node, expand: Callable[[str], list[str]]) -> Node:
+    """Replace each single-word term with an OR of the words ``expand`` returns for it.
+
+    Multi-word terms are phrases and stay exact. A word that expands to nothing is
+    kept as is, so it simply matches no note.
+
+    Args:
+        node: Parsed query.
+        expand: Maps a normalized word to its alternatives, e.g. fuzzy matches.
+
+    Returns:
+        The rewritten query.
+    """
+    match node:
+        case Term((word,), field):
+            alternatives = expand(word)
+            if not alternatives:
+                return node
+            terms = tuple(Term((alternative,), field) for alternative in alternatives)
+            return terms[0] if len(terms) == 1 else Or(terms)
+        case Term():
+            return node
+        case And(children):
+            return And(tuple(expand_terms(child, expand) for child in children))
+        case Or(children):
+            return Or(tuple(expand_terms(child, expand) for child in children))
+        case Not(child):
+            return Not(expand_terms(child, expand))
+
+
+# Lexer output: "(", ")", an operator name, or a Term.
+type _Token = str | Term
+
+
+def _lex(text: str) -> list[_Token]:
+    """Split query text into parentheses, operators, and terms."""
+    tokens: list[_Token] = []
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        if char.isspace():
+            i += 1
+        elif char in "()":
+            tokens.append(char)
+            i += 1
+        elif char == "-" and i + 1 < n and not text[i + 1].isspace():
+            tokens.append("NOT")
+            i += 1
+        else:
+            i = _lex_term(text, i, tokens)
+    return tokens
+
+
+def _lex_term(text: str, i: int, tokens: list[_Token]) -> int:
+    """Append the operator or term starting at ``text[i]``; return the index after it."""
+    field: Field | None = None
+    for name in _FIELDS:
+        if text.startswith(f"{name}:", i):
+            field = name
+            i += len(name) + 1
+            break
+
+    if i < len(text) and text[i] == '"':
+        end = text.find('"', i + 1)
+        if end == -1:
+            raise ValueError("Unterminated quoted phrase in query")
+        raw, i = text[i + 1 : end], end + 1
+    else:
+        start = i
+        while i < len(text) and not text[i].isspace() and text[i] not in _SPECIAL:
+            i += 1
+        raw = text[start:i]
+        if field is None and raw in _OPERATORS:
+            tokens.append(raw)
+            return i
+
+    words = tuple(tokenize(normalize(raw)))
+    if not words:
+        raise ValueError(f"Query term {raw!r} contains no searchable words")
+    tokens.append(Term(words, field))
+    return i
+
+
+class _Parser:
+    """Recursive-descent parser over the lexer's tokens."""
+
+    def __init__(self, tokens: list[_Token]) -> None:
+        self._tokens = tokens
+        self._pos = 0
+        self._depth = 0
+
+    def peek(self) -> _Token | None:
+        """Return the next token without consuming it."""
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _take(self) -> _Token:
+        lexeme = self.peek()
+        if lexeme is None:
+            raise ValueError("Query ended unexpectedly")
+        self._pos += 1
+        return lexeme
+
+    def parse_or(self) -> Node:
+        """Parse ``and ("OR" and)*``."""
+        children = [self._parse_and()]
+        while self.peek() == "OR":
+            self._take()
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def _parse_and(self) -> Node:
+        children = [self._parse_unary()]
+        while (lexeme := self.peek()) is not None and lexeme not in ("OR", ")"):
+            if lexeme == "AND":
+                self._take()
+            children.append(self._parse_unary())
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def _parse_unary(self) -> Node:
+        lexeme = self._take()
+        if isinstance(lexeme, Term):
+            return lexeme
+        if lexeme not in ("NOT", "("):
+            raise ValueError(f"Unexpected {lexeme!r} in query")
+        if self._depth == MAX_QUERY_DEPTH:
+            raise ValueError(f"Query nests parentheses and NOT more than {MAX_QUERY_DEPTH} deep")
+        self._depth += 1
+        if lexeme == "NOT":
+            node: Node = Not(self._parse_unary())
+        else:
+            node = self.parse_or()
+            if self._take() != ")":
+                raise ValueError("Expected ')' in query")
+        self._depth -= 1
+        return node
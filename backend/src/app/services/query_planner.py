@@ -0,0 +1,95 @@
+"""Cost-based evaluation of boolean queries over an inverted index."""
+
+import heapq
+from collections.abc import Sequence
+
+from app.services.inverted_index import InvertedIndex
+from app.services.posting_lists import difference, intersect
+from app.services.query_language import And, Node, Not, Or, Term
+
+
+class QueryPlanner:
+    """Evaluates a parsed query against an :class:`InvertedIndex`.
+
+    Every clause's result size is estimated from document frequencies before
+    anything is read: a term costs its rarest token's posting list, an AND its
+    cheapest positive clause, an OR the sum of its clauses. AND clauses are then
+    evaluated cheapest first and each further clause is intersected into the
+    running result by galloping, so a rare term bounds the work done against a
+    common one and an empty intermediate result stops evaluation early. Negated
+    clauses are subtracted last, and only match against the whole corpus when an
+    AND has no positive clause.
+    """
+
+    def __init__(self, index: InvertedIndex) -> None:
+        self._index = index
+
+    def evaluate(self, node: Node) -> list[int]:
+        """Return the ascending positions matching ``node``.
+
+        Args:
+            node: Parsed query, from :func:`~app.services.query_language.parse_query`.
+
+        Returns:
+            Matching positions in insertion order.
+        """
+        match node:
+            case Term():
+                return self._term(node)
+            case And(children):
+                return self._and(children)
+            case Or(children):
+                return self._or(children)
+            case Not(child):
+                return difference(range(len(self._index)), self.evaluate(child))
+
+    def estimate(self, node: Node) -> int:
+        """Return an upper bound on the number of positions matching ``node``."""
+        total = len(self._index)
+        match node:
+            case Term(tokens):
+                return min(self._index.document_frequency(token) for token in tokens)
+            case And(children):
+                positive = [self.estimate(c) for c in children if not isinstance(c, Not)]
+                return min(positive, default=total)
+            case Or(children):
+                return min(sum(self.estimate(child) for child in children), total)
+            case Not():
+                return total
+
+    def _term(self, term: Term) -> list[int]:
+        first, *rest = term.tokens
+        if rest:
+            return self._index.phrase(term.tokens, term.field)
+        return list(self._index.postings(first, term.field))
+
+    def _and(self, children: tuple[Node, ...]) -> list[int]:
+        positive = sorted(
+            (child for child in children if not isinstance(child, Not)), key=self.estimate
+        )
+        negative = [child.child for child in children if isinstance(child, Not)]
+
+        positions: Sequence[int] = (
+            self.evaluate(positive[0]) if positive else range(len(self._index))
+        )
+        for child in positive[1:]:
+            if not positions:
+                return []
+            if isinstance(child, Term) and len(child.tokens) == 1:
+                positions = intersect(
+                    positions, self._index.postings(child.tokens[0], child.field)
+                )
+            else:
+                positions = intersect(positions, self.evaluate(child))
+        for child in negative:
+            if not positions:
+                return []
+            positions = difference(positions, self.evaluate(child))
+        return list(positions)
+
+    def _or(self, children: tuple[Node, ...]) -> list[int]:
+        positions: list[int] = []
+        for position in heapq.merge(*(self.evaluate(child) for child in children)):
+            if not positions or positions[-1] != position:
+                positions.append(position)
+        return positions
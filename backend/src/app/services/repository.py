@@ -0,0 +1,713 @@
+"""Async repository interface the notes routes depend on."""
+
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from contextlib import AbstractAsyncContextManager, ExitStack, asynccontextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Protocol, cast
+
+from anyio import CancelScope, CapacityLimiter, Lock, current_time, move_on_after, to_thread
+from anyio.streams.memory import MemoryObjectReceiveStream
+
+from app.models.note import NoteChanges, NoteCreate, NoteResponse, NoteStats
+from app.services.change_log import Change, ChangeLog, initial_seq
+from app.services.event_hub import RESYNC_EVENT, EventHub, change_frame, sse_frame
+from app.services.note_service import NoteService
+from app.services.note_store import NoteStore
+from app.services.pagination import NotePage
+from app.services.query_language import MatchMode
+from app.services.singleflight import SingleFlight
+from app.services.sqlite_store import SqliteNoteService
+
+if TYPE_CHECKING:
+    from app.config import Settings
+
+
+@dataclass(slots=True, frozen=True)
+class Subscription:
+    """A client's live note events and the events it missed before subscribing."""
+
+    backlog: list[bytes]
+    events: MemoryObjectReceiveStream[bytes]
+    # Publishes changes made by other processes; None if every change is made here.
+    poll: Callable[[], Awaitable[None]] | None = None
+    poll_s: float = 1.0
+
+    async def receive(self) -> bytes:
+        """Return the next live event, polling for other processes' changes while idle.
+
+        Returns:
+            The encoded event.
+
+        Raises:
+            anyio.EndOfStream: If the subscriber fell too far behind.
+        """
+        while self.poll is not None:
+            with move_on_after(self.poll_s):
+                return await self.events.receive()
+            # Finish a poll once started so that a shared high-water mark stays consistent.
+            with CancelScope(shield=True):
+                await self.poll()
+        return await self.events.receive()
+
+
+def _resync_frame(seq: int) -> bytes:
+    """Encode a ``resync`` event telling clients to reload from change ``seq``."""
+    return sse_frame(RESYNC_EVENT, b'{"seq":%d}' % seq, seq)
+
+
+class NoteRepository(Protocol):
+    """Awaitable note operations, safe to call from the event loop."""
+
+    @property
+    def change_seq(self) -> int:
+        """Sequence number of the latest change."""
+        ...
+
+    async def create(self, data: NoteCreate) -> NoteResponse:
+        """Create and return a new note."""
+        ...
+
+    async def create_many(self, items: Sequence[NoteCreate]) -> list[NoteResponse]:
+        """Create several notes in one durable batch."""
+        ...
+
+    async def get(self, note_id: str) -> NoteResponse | None:
+        """Return the note with ``note_id``, if any."""
+        ...
+
+    async def list_all(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Sequence[NoteResponse]:
+        """Return every note matching ``query`` in insertion order."""
+        ...
+
+    async def list_all_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> bytes:
+        """Return :meth:`list_all` as a JSON array body."""
+        ...
+
+    async def list_page(
+        self,
+        query: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+    ) -> NotePage:
+        """Return one keyset-paginated page of matching notes."""
+        ...
+
+    async def list_ranked_json(self, query: str, *, limit: int) -> bytes:
+        """Return up to ``limit`` notes most relevant to ``query`` as a JSON array body."""
+        ...
+
+    async def suggest(self, prefix: str, *, limit: int) -> list[str]:
+        """Return up to ``limit`` title or title-word completions of ``prefix``."""
+        ...
+
+    async def count(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> int:
+        """Return the number of notes matching ``query``."""
+        ...
+
+    async def stats(self) -> NoteStats:
+        """Return the note count and word index size."""
+        ...
+
+    async def changes(self, since: int) -> NoteChanges:
+        """Return the notes created after change ``since``."""
+        ...
+
+    def subscribe(self, since: int | None = None) -> AbstractAsyncContextManager[Subscription]:
+        """Stream Server-Sent Events for changes after ``since``, then live ones."""
+        ...
+
+    def hold_events(self) -> AbstractAsyncContextManager[None]:
+        """Replace the events for creates made inside the block with one ``resync``."""
+        ...
+
+    async def export_json(
+        self,
+        query: str | None = None,
+        *,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+        batch_size: int = 256,
+    ) -> AsyncGenerator[list[bytes]]:
+        """Return batches of the JSON of matching notes from a consistent snapshot."""
+        ...
+
+
+class StoreRepository:
+    """Adapts a synchronous NoteStore to :class:`NoteRepository`.
+
+    With a ``limiter`` every call runs in a worker thread, at most
+    ``limiter.total_tokens`` at a time, so stores that block on disk or locks never
+    stall the event loop. Without one, calls run inline — only appropriate for
+    stores whose operations never block.
+
+    Listings and searches are CPU-bound even on a non-blocking store, so when an
+    inline store's :meth:`~app.services.note_store.NoteStore.search_cost` reaches
+    ``offload_bytes`` the call moves to a worker thread capped by
+    ``search_limiter``. Cheaper calls stay inline, where a thread hop would cost
+    more than the work itself.
+
+    Searches that leave the event loop are coalesced: a search identical to one
+    already running waits for that one's result instead of scanning again, so a
+    burst of the same query costs one scan. Inline searches never overlap, so
+    there is nothing to coalesce.
+
+    Every create made through the repository is recorded in a
+    :class:`~app.services.change_log.ChangeLog` of the last ``change_log_size``
+    changes, so polling clients can fetch only what is new, and published to an
+    :class:`~app.services.event_hub.EventHub` whose subscribers each buffer at
+    most ``event_queue_size`` events.
+    """
+
+    def __init__(
+        self,
+        store: NoteStore,
+        *,
+        limiter: CapacityLimiter | None = None,
+        search_limiter: CapacityLimiter | None = None,
+        offload_bytes: int = 0,
+        change_log_size: int = 1024,
+        event_queue_size: int = 64,
+    ) -> None:
+        self.store = store
+        self.limiter = limiter
+        self.search_limiter = search_limiter
+        self.offload_bytes = offload_bytes
+        self._flights = SingleFlight[tuple[object, ...], object]()
+        self._changes = ChangeLog(change_log_size, initial_seq())
+        self._events = EventHub(event_queue_size)
+        # Open hold_events() blocks, and the latest change when the first one opened.
+        self._holds = 0
+        self._held_from = 0
+
+    @property
+    def change_seq(self) -> int:
+        """Sequence number of the latest change; read it before listing to sync from."""
+        return self._changes.last_seq
+
+    async def _call[T](self, func: Callable[[], T]) -> T:
+        """Run ``func`` inline or on a worker thread, depending on the limiter."""
+        if self.limiter is None:
+            return func()
+        return await to_thread.run_sync(func, limiter=self.limiter)
+
+    async def _search[T](
+        self, func: Callable[[], T], query: str | None, key: tuple[object, ...] | None
+    ) -> T:
+        """Run a scan over the store, offloading it when its estimated cost is high.
+
+        An offloaded scan shares the result of a running scan with the same ``key``
+        that started since the latest create, so a client always sees its own
+        writes; scans without a key are never shared.
+        """
+        limiter = self.limiter
+        if limiter is None:
+            if self.search_limiter is None or self.store.search_cost(query) < self.offload_bytes:
+                return func()
+            limiter = self.search_limiter
+
+        if key is None:
+            return await to_thread.run_sync(func, limiter=limiter)
+
+        async def run() -> object:
+            return await to_thread.run_sync(func, limiter=limiter)
+
+        return cast("T", await self._flights.do((self.change_seq, *key), run))
+
+    async def create(self, data: NoteCreate) -> NoteResponse:
+        """Create and return a new note.
+
+        Args:
+            data: Validated note creation payload.
+
+        Returns:
+            The newly created note.
+        """
+        note = await self._call(lambda: self.store.create(data))
+        await self._record((note,))
+        return note
+
+    async def create_many(self, items: Sequence[NoteCreate]) -> list[NoteResponse]:
+        """Create several notes in one durable batch.
+
+        Args:
+            items: Validated note creation payloads.
+
+        Returns:
+            The created notes, in the order given.
+        """
+        notes = await self._call(lambda: self.store.create_many(items))
+        await self._record(notes)
+        return notes
+
+    async def _record(self, notes: Sequence[NoteResponse]) -> None:
+        """Log the creation of ``notes`` and publish it to subscribers unless held."""
+        changes = [self._changes.append(note) for note in notes]
+        if not self._holds:
+            self._publish(changes, self._changes.last_seq)
+
+    def _publish(self, changes: Sequence[Change], last_seq: int) -> None:
+        """Publish ``changes``, the latest of which is ``last_seq``, to subscribers.
+
+        A batch too large for subscriber queues is announced as one ``resync``
+        event instead of overflowing and disconnecting every subscriber.
+        """
+        # Encode once for all subscribers, and not at all when nobody listens.
+        if not self._events or not changes:
+            return
+        if len(changes) > self._events.queue_size:
+            self._events.publish(_resync_frame(last_seq))
+            return
+        for change in changes:
+            self._events.publish(change_frame(change))
+
+    async def get(self, note_id: str) -> NoteResponse | None:
+        """Look up a single note by id.
+
+        Args:
+            note_id: Identifier of the note.
+
+        Returns:
+            The note, or None if no note has that id.
+        """
+        return await self._call(lambda: self.store.get(note_id))
+
+    async def list_all(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Sequence[NoteResponse]:
+        """Return all notes, optionally filtered by keyword.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: ``"substring"`` or ``"boolean"`` query interpretation.
+            fuzzy: Edit distance tolerated per query word, or 0 for exact matching.
+
+        Returns:
+            Sequence of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        return await self._search(
+            lambda: self.store.list_all(query, mode=mode, fuzzy=fuzzy),
+            query,
+            ("list_all", query, mode, fuzzy),
+        )
+
+    async def list_all_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> bytes:
+        """Return the JSON array body for :meth:`list_all`.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: ``"substring"`` or ``"boolean"`` query interpretation.
+            fuzzy: Edit distance tolerated per query word, or 0 for exact matching.
+
+        Returns:
+            UTF-8 encoded JSON array of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        return await self._search(
+            lambda: self.store.list_all_json(query, mode=mode, fuzzy=fuzzy),
+            query,
+            ("list_all_json", query, mode, fuzzy),
+        )
+
+    async def list_page(
+        self,
+        query: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+    ) -> NotePage:
+        """Return one page of notes in insertion order.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            limit: Maximum number of notes on the page.
+            cursor: ``next_cursor`` from the previous page, or None for the first page.
+            mode: ``"substring"`` or ``"boolean"`` query interpretation.
+            fuzzy: Edit distance tolerated per query word, or 0 for exact matching.
+
+        Returns:
+            The page of notes and the cursor for the next page, if any.
+
+        Raises:
+            ValueError: If ``cursor`` or a boolean query is malformed.
+        """
+
+        def page() -> NotePage:
+            return self.store.list_page(query, limit=limit, cursor=cursor, mode=mode, fuzzy=fuzzy)
+
+        # Without a query a page touches at most ``limit`` notes; a search may scan them all.
+        if query is None:
+            return await self._call(page)
+        return await self._search(page, query, ("list_page", query, limit, cursor, mode, fuzzy))
+
+    async def export_json(
+        self,
+        query: str | None = None,
+        *,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+        batch_size: int = 256,
+    ) -> AsyncGenerator[list[bytes]]:
+        """Stream the JSON of every matching note without materializing the result.
+
+        The store takes its snapshot, and rejects a malformed query, before this
+        returns. Each batch is then read like a search, inline or on a worker
+        thread, so at most ``batch_size`` notes are held at a time.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: ``"substring"`` or ``"boolean"`` query interpretation.
+            fuzzy: Edit distance tolerated per query word, or 0 for exact matching.
+            batch_size: Notes per batch.
+
+        Returns:
+            Async iterator of non-empty batches of note JSON, in insertion order.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        notes = await self._search(
+            lambda: self.store.iter_json(query, mode=mode, fuzzy=fuzzy), query, None
+        )
+
+        def take() -> list[bytes]:
+            return list(islice(notes, batch_size))
+
+        async def batches() -> AsyncGenerator[list[bytes]]:
+            try:
+                while batch := await self._search(take, query, None):
+                    yield batch
+            finally:
+                notes.close()
+
+        return batches()
+
+    async def list_ranked_json(self, query: str, *, limit: int) -> bytes:
+        """Return the JSON array body of the notes most relevant to ``query``.
+
+        Ranking walks only the posting lists of the query's words, so it stays
+        inline on a non-blocking store regardless of corpus size.
+
+        Args:
+            query: Search text; notes containing any of its words are ranked.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            UTF-8 encoded JSON array, best match first.
+        """
+        return await self._call(lambda: self.store.list_ranked_json(query, limit=limit))
+
+    async def count(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> int:
+        """Count notes, optionally filtered by keyword.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: ``"substring"`` or ``"boolean"`` query interpretation.
+            fuzzy: Edit distance tolerated per query word, or 0 for exact matching.
+
+        Returns:
+            Number of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        if query is None:
+            return await self._call(self.store.count)
+        return await self._search(
+            lambda: self.store.count(query, mode=mode, fuzzy=fuzzy),
+            query,
+            ("count", query, mode, fuzzy),
+        )
+
+    async def suggest(self, prefix: str, *, limit: int) -> list[str]:
+        """Complete ``prefix`` from note titles and title words.
+
+        A lookup is a bounded range scan of a sorted index, so it stays inline on a
+        non-blocking store.
+
+        Args:
+            prefix: Text typed so far.
+            limit: Maximum number of completions.
+
+        Returns:
+            Normalized completions in alphabetical order.
+        """
+        return await self._call(lambda: self.store.suggest(prefix, limit=limit))
+
+    async def stats(self) -> NoteStats:
+        """Report storage statistics and how many searches were coalesced.
+
+        Returns:
+            Note count, word index size, cache counters, and coalesced searches.
+        """
+        stats = await self._call(self.store.stats)
+        return stats.model_copy(update={"coalesced_searches": self._flights.coalesced})
+
+    async def changes(self, since: int) -> NoteChanges:
+        """Return the notes created after change ``since``, from the change log.
+
+        Args:
+            since: Sequence number from a previous call or from :attr:`change_seq`.
+
+        Returns:
+            The new notes and the sequence number to pass next time; ``resync`` is
+            set instead if the log no longer covers ``since``.
+        """
+        changes = self._changes.since(since)
+        if changes is None:
+            return NoteChanges(seq=self._changes.last_seq, resync=True, notes=[])
+        return NoteChanges(
+            seq=self._changes.last_seq,
+            resync=False,
+            notes=[change.note for change in changes],
+        )
+
+    @asynccontextmanager
+    async def subscribe(self, since: int | None = None) -> AsyncGenerator[Subscription]:
+        """Subscribe to ``note_created`` events.
+
+        The backlog is taken in the same event loop step as the subscription, so
+        no change is either missed or delivered twice between them.
+
+        Args:
+            since: Last sequence number the client has seen, e.g. from
+                ``Last-Event-ID``; None for live events only.
+
+        Yields:
+            The changes after ``since`` (or a single ``resync`` event if the change
+            log no longer covers it) and the live event stream.
+        """
+        with self._events.subscribe() as events:
+            backlog: list[bytes] = []
+            if since is not None:
+                changes = self._changes.since(since)
+                if changes is None:
+                    backlog.append(_resync_frame(self._changes.last_seq))
+                else:
+                    backlog.extend(map(change_frame, changes))
+            yield Subscription(backlog, events)
+
+    @asynccontextmanager
+    async def hold_events(self) -> AsyncGenerator[None]:
+        """Publish a single ``resync`` event instead of the creates made inside the block.
+
+        Meant for long imports, whose every batch would otherwise make each
+        subscriber reload. Creates are still logged as they happen, so
+        :meth:`changes` and new subscriptions see them; live events for them, and
+        for any other create made meanwhile, are replaced by one ``resync`` when the
+        last open block exits, if anything was created.
+
+        Yields:
+            Nothing; the block runs with events held.
+        """
+        if not self._holds:
+            self._held_from = self.change_seq
+        self._holds += 1
+        try:
+            yield
+        finally:
+            self._holds -= 1
+            if not self._holds:
+                # Subscribers must hear about the held creates even if the import fails.
+                with CancelScope(shield=True):
+                    await self._release(self._held_from)
+
+    async def _release(self, since: int) -> None:
+        """Announce the creates held back since change ``since`` with one ``resync``."""
+        last = self._changes.last_seq
+        if last > since and self._events:
+            self._events.publish(_resync_frame(last))
+
+
+class SharedStoreRepository(StoreRepository):
+    """A :class:`StoreRepository` over a database other processes write to as well.
+
+    Change sequence numbers are the store's durable ``notes.seq``, assigned in
+    commit order and shared by every worker, so :meth:`changes` answers from the
+    database for creates made by any of them, and a ``since`` stays valid across
+    restarts. Creates made through this repository are published to subscribers
+    immediately; those made by other processes are picked up by subscribers
+    polling the database after ``poll_s`` seconds without an event, at most once
+    per ``poll_s`` for all of them together.
+    """
+
+    store: SqliteNoteService
+
+    def __init__(
+        self,
+        store: SqliteNoteService,
+        *,
+        limiter: CapacityLimiter,
+        change_log_size: int = 1024,
+        event_queue_size: int = 64,
+        poll_s: float = 1.0,
+    ) -> None:
+        super().__init__(
+            store,
+            limiter=limiter,
+            change_log_size=change_log_size,
+            event_queue_size=event_queue_size,
+        )
+        self.poll_s = poll_s
+        self._change_log_size = change_log_size
+        # Latest change published to subscribers; every later one is still unseen.
+        _, self._published = store.changes_after(0, limit=0)
+        self._pulled_at = float("-inf")
+        self._pull_lock = Lock()
+
+    @property
+    def change_seq(self) -> int:
+        """Sequence number of the latest change; read it before listing to sync from."""
+        return self._published
+
+    async def _record(self, notes: Sequence[NoteResponse]) -> None:
+        """Publish the creation of ``notes``, with any other process's creates before it."""
+        await self._pull(force=True)
+
+    async def _poll(self) -> None:
+        """Publish other processes' creates, unless another subscriber just did."""
+        await self._pull(force=False)
+
+    async def _pull(self, *, force: bool) -> None:
+        """Publish every change committed since the last pull."""
+        async with self._pull_lock:
+            if not force and current_time() - self._pulled_at < self.poll_s:
+                return
+            published = self._published
+            # Only the count matters past a subscriber queue's worth: more means resync.
+            # Held changes are only counted as published; _release() announces them.
+            limit = self._events.queue_size + 1 if self._events and not self._holds else 0
+            changes, last = await self._call(
+                lambda: self.store.changes_after(published, limit=limit)
+            )
+            self._publish(changes, last)
+            self._published = last
+            self._pulled_at = current_time()
+
+    async def _release(self, since: int) -> None:
+        """Announce the creates held back since change ``since`` with one ``resync``."""
+        async with self._pull_lock:
+            published = self._published
+            _, last = await self._call(lambda: self.store.changes_after(published, limit=0))
+            if last > since and self._events:
+                self._events.publish(_resync_frame(last))
+            self._published = last
+            self._pulled_at = current_time()
+
+    async def _backlog(self, since: int, upto: int) -> list[Change] | None:
+        """Return the changes after ``since`` up to ``upto``, or None if too many."""
+        if since > upto:
+            return None
+        limit = self._change_log_size
+        changes, _ = await self._call(
+            lambda: self.store.changes_after(since, limit=limit + 1, upto=upto)
+        )
+        return None if len(changes) > limit else changes
+
+    async def changes(self, since: int) -> NoteChanges:
+        """Return the notes created after change ``since``, by any process.
+
+        Args:
+            since: Sequence number from a previous call or from :attr:`change_seq`.
+
+        Returns:
+            The new notes and the sequence number to pass next time; ``resync`` is
+            set instead if ``since`` was never issued or more than
+            ``change_log_size`` notes were created after it.
+        """
+        limit = self._change_log_size
+        changes, last = await self._call(lambda: self.store.changes_after(since, limit=limit + 1))
+        if since > last or len(changes) > limit:
+            return NoteChanges(seq=last, resync=True, notes=[])
+        return NoteChanges(seq=last, resync=False, notes=[change.note for change in changes])
+
+    @asynccontextmanager
+    async def subscribe(self, since: int | None = None) -> AsyncGenerator[Subscription]:
+        """Subscribe to ``note_created`` events from every process.
+
+        The backlog is read up to the last published change while holding the lock
+        that publishing takes, so no change is either missed or delivered twice.
+
+        Args:
+            since: Last sequence number the client has seen, e.g. from
+                ``Last-Event-ID``; None for live events only.
+
+        Yields:
+            The changes after ``since`` (or a single ``resync`` event if ``since``
+            is unknown or too old) and the live event stream, which polls the
+            database while idle.
+        """
+        if since is not None:
+            # Catch up with other processes so the backlog reaches the latest change.
+            await self._pull(force=True)
+        with ExitStack() as stack:
+            backlog: list[bytes] = []
+            async with self._pull_lock:
+                events = stack.enter_context(self._events.subscribe())
+                if since is not None:
+                    changes = await self._backlog(since, self._published)
+                    if changes is None:
+                        backlog.append(_resync_frame(self._published))
+                    else:
+                        backlog.extend(map(change_frame, changes))
+            yield Subscription(backlog, events, self._poll, self.poll_s)
+
+
+def create_repository(store: NoteStore, settings: "Settings") -> StoreRepository:
+    """Wrap ``store`` so that only non-blocking stores run on the event loop.
+
+    The in-memory service without a data directory never touches disk and is called
+    inline, except for searches costing at least ``settings.search_offload_bytes``,
+    which run on at most ``settings.search_threads`` worker threads. Any other store
+    runs in a thread pool bounded by ``settings.repository_threads``. A SQLite store
+    may be shared by several workers, so its changes are tracked in the database.
+
+    Args:
+        store: Store selected by :func:`~app.services.note_store.create_note_store`.
+        settings: Application settings.
+
+    Returns:
+        The repository the routes depend on.
+    """
+    if isinstance(store, NoteService) and settings.data_dir is None:
+        return StoreRepository(
+            store,
+            search_limiter=CapacityLimiter(settings.search_threads),
+            offload_bytes=settings.search_offload_bytes,
+            change_log_size=settings.change_log_size,
+            event_queue_size=settings.events_queue_size,
+        )
+    if isinstance(store, SqliteNoteService):
+        return SharedStoreRepository(
+            store,
+            limiter=CapacityLimiter(settings.repository_threads),
+            change_log_size=settings.change_log_size,
+            event_queue_size=settings.events_queue_size,
+            poll_s=settings.events_poll_s,
+        )
+    return StoreRepository(
+        store,
+        limiter=CapacityLimiter(settings.repository_threads),
+        change_log_size=settings.change_log_size,
+        event_queue_size=settings.events_queue_size,
+    )
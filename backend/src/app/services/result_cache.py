@@ -0,0 +1,134 @@
+"""Bounded LRU cache of substring search results, patched in place on create."""
+
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+
+# Bookkeeping charged per entry on top of its key and positions.
+_ENTRY_OVERHEAD = 128
+
+
+class ResultCache:
+    """Remembers the matching positions of recent substring queries.
+
+    Entries are kept current instead of being flushed: :meth:`note_added` tests
+    the new note against every cached query and appends its position to those it
+    matches, so a create costs one substring test per cached query and popular
+    queries keep hitting.
+
+    A query is admitted on its second miss; the first only records it with a
+    doorkeeper, so one-off searches do not evict popular ones. Memory is bounded
+    by entry count and by an estimate of the bytes held by keys and positions,
+    and the least recently used entries are evicted first.
+
+    Searches run without the store's write lock and may race a create. Each
+    create bumps :attr:`version`; :meth:`store` drops a result computed at an
+    older version, and :meth:`note_added` skips positions an entry already holds.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 8 << 20) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.version = 0
+        self._entries: OrderedDict[str, array[int]] = OrderedDict()
+        self._doorkeeper: set[str] = set()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached queries."""
+        return len(self._entries)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated bytes held by cached keys and positions."""
+        return self._bytes
+
+    def lookup(self, key: str) -> Sequence[int] | None:
+        """Return the cached positions for ``key`` and mark it recently used.
+
+        The returned array is live: creates matching ``key`` append to it.
+
+        Args:
+            key: Normalized query.
+
+        Returns:
+            Ascending positions of matching notes, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(self, key: str, positions: Iterable[int], version: int) -> None:
+        """Cache the result of a search that started at store ``version``.
+
+        Args:
+            key: Normalized query.
+            positions: Ascending positions of every matching note.
+            version: Value of :attr:`version` read before the search ran.
+        """
+        with self._lock:
+            if version != self.version or self.max_entries <= 0:
+                return
+            if key not in self._doorkeeper:
+                if len(self._doorkeeper) >= 4 * self.max_entries:
+                    self._doorkeeper.clear()
+                self._doorkeeper.add(key)
+                return
+            self._doorkeeper.discard(key)
+            entry = array("I", positions)
+            if _cost(key, entry) > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= _cost(key, previous)
+            self._entries[key] = entry
+            self._bytes += _cost(key, entry)
+            self._evict()
+
+    def note_added(self, position: int, title_key: str, content_key: str) -> None:
+        """Bump :attr:`version` and append ``position`` to every entry the note matches.
+
+        Args:
+            position: Insertion position of the new note.
+            title_key: Normalized title.
+            content_key: Normalized content.
+        """
+        with self._lock:
+            self.version += 1
+            for key, entry in self._entries.items():
+                if (key in title_key or key in content_key) and (
+                    not entry or entry[-1] < position
+                ):
+                    entry.append(position)
+                    self._bytes += entry.itemsize
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both bounds hold; caller holds the lock."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= _cost(key, entry)
+
+    def clear(self) -> None:
+        """Drop every entry and invalidate searches still in flight."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._doorkeeper.clear()
+            self._bytes = 0
+
+
+def _cost(key: str, entry: array[int]) -> int:
+    """Return the bytes charged for caching ``entry`` under ``key``."""
+    return _ENTRY_OVERHEAD + len(key) + entry.itemsize * len(entry)
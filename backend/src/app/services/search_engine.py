@@ -0,0 +1,63 @@
+"""Pluggable substring search engines used by NoteService."""
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Literal, Protocol
+
+from app.services.corpus_buffer import CorpusBuffer
+from app.services.sharded_scan import ShardedScan
+from app.services.trigram_index import TrigramIndex
+
+type SearchEngineName = Literal["trigram", "buffer", "sharded"]
+
+
+class SearchEngine(Protocol):
+    """Narrows a substring query down to candidate note positions."""
+
+    def add(self, position: int, fields: Iterable[str]) -> None:
+        """Index the note stored at ``position``."""
+        ...
+
+    def candidates(self, query: str) -> Sequence[int]:
+        """Return a sorted superset of the positions matching ``query``."""
+        ...
+
+    def iter_candidates(self, query: str, start: int = 0) -> Iterator[int]:
+        """Lazily yield candidate positions at or after ``start``, in ascending order.
+
+        Work is done only as results are consumed, so callers that stop early never
+        pay for the rest of the corpus.
+        """
+        ...
+
+    def clear(self) -> None:
+        """Drop all indexed data."""
+        ...
+
+    def dump(self, count: int) -> bytes:
+        """Serialize the index restricted to positions below ``count``.
+
+        Safe to call while other threads keep adding positions at or above ``count``.
+        """
+        ...
+
+    def load(self, data: bytes, count: int) -> None:
+        """Replace the index with one produced by :meth:`dump` for ``count`` notes."""
+        ...
+
+
+def create_search_engine(name: SearchEngineName) -> SearchEngine:
+    """Instantiate the search engine selected in settings.
+
+    Args:
+        name: Engine identifier — ``"trigram"``, ``"buffer"``, or ``"sharded"``.
+
+    Returns:
+        A fresh, empty search engine.
+    """
+    match name:
+        case "trigram":
+            return TrigramIndex()
+        case "buffer":
+            return CorpusBuffer()
+        case "sharded":
+            return ShardedScan()
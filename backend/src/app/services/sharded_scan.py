@@ -0,0 +1,286 @@
+"""Corpus split into shared-memory shards and scanned in parallel by a process pool."""
+
+import atexit
+import mmap
+import multiprocessing
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import weakref
+from array import array
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Generator, Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.corpus_buffer import CorpusBuffer
+
+# Notes per sealed shard. Small enough that a multi-million-note corpus yields more
+# shards than cores, large enough that per-task IPC stays negligible.
+SHARD_NOTES = 16_384
+# tmpfs, so shard files live in shared memory rather than on disk.
+_SHM_DIR = "/dev/shm"  # noqa: S108
+_HEADER = struct.Struct("<Q")
+_OFFSET_SIZE = array("Q").itemsize
+
+# Shards mapped by this worker process, keyed by file path.
+_attached: dict[str, tuple[mmap.mmap, memoryview]] = {}
+
+
+def _detach_all() -> None:
+    """Release this worker's shard mappings."""
+    for mapping, offsets in _attached.values():
+        offsets.release()
+        mapping.close()
+    _attached.clear()
+
+
+def _init_worker() -> None:
+    """Pool worker initializer."""
+    atexit.register(_detach_all)
+
+
+def _scan_shard(path: str, count: int, size: int, needle: bytes, start: int) -> list[int]:
+    """Return shard-relative positions from ``start`` whose region contains ``needle``.
+
+    Runs in pool workers, which map each shard file read-only on first use and
+    search it in place with ``mmap.find``.
+    """
+    cached = _attached.get(path)
+    if cached is None:
+        with Path(path).open("rb") as fh:
+            mapping = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        cached = (mapping, memoryview(mapping)[: count * _OFFSET_SIZE].cast("Q"))
+        _attached[path] = cached
+    mapping, offsets = cached
+
+    buffer_start = count * _OFFSET_SIZE
+    end = buffer_start + size
+    results: list[int] = []
+    hit = mapping.find(needle, buffer_start + offsets[start], end)
+    while hit != -1:
+        position = bisect_right(offsets, hit - buffer_start) - 1
+        results.append(position)
+        if position + 1 == count:
+            break
+        hit = mapping.find(needle, buffer_start + offsets[position + 1], end)
+    return results
+
+
+@dataclass(slots=True, frozen=True)
+class _Shard:
+    """A sealed, immutable run of notes stored as ``offsets + buffer`` in a tmpfs file."""
+
+    path: Path
+    base: int
+    count: int
+    size: int
+
+
+@dataclass(slots=True)
+class _Resources:
+    """Shard directory and worker processes released when the engine is dropped."""
+
+    directory: Path | None = None
+    pool: ProcessPoolExecutor | None = None
+
+    def release(self) -> None:
+        """Shut the pool down and delete every shard."""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+def _take(layout: bytes, total: int, count: int) -> tuple[array[int], bytes]:
+    """Split an ``offsets + buffer`` layout and keep only its first ``count`` notes."""
+    offsets = array("Q")
+    offsets.frombytes(layout[: total * _OFFSET_SIZE])
+    buffer = layout[total * _OFFSET_SIZE :]
+    if count < total:
+        buffer = buffer[: offsets[count]]
+        del offsets[count:]
+    return offsets, buffer
+
+
+class ShardedScan:
+    """Corpus buffer scan fanned out across a process pool.
+
+    Notes accumulate in an in-process :class:`CorpusBuffer` tail. Every
+    ``shard_notes`` notes the tail is sealed into a file on tmpfs (shared memory
+    on Linux) laid out as the tail's offsets followed by its buffer, and dropped
+    from the parent process. A search sends the needle to the
+    pool once per sealed shard, keeping up to ``workers`` scans in flight, and
+    yields the hits shard by shard followed by the tail's, which keeps them in
+    creation order.
+
+    Worker processes use the spawn start method, start on the first search that
+    has sealed shards, and map each shard once. Dump format is identical to
+    :class:`CorpusBuffer`.
+    """
+
+    def __init__(self, *, workers: int | None = None, shard_notes: int = SHARD_NOTES) -> None:
+        self.workers = workers or os.process_cpu_count() or 1
+        self.shard_notes = shard_notes
+        self._pool_lock = threading.Lock()
+        self._resources = _Resources()
+        self._finalizer = weakref.finalize(self, self._resources.release)
+        # (sealed shards, first tail position, tail) — swapped as one value so that
+        # lock-free readers never see a seal half done.
+        self._state: tuple[tuple[_Shard, ...], int, CorpusBuffer] = ((), 0, CorpusBuffer())
+
+    def add(self, position: int, fields: Iterable[str]) -> None:
+        """Append the note stored at ``position``, sealing the tail when it is full.
+
+        Args:
+            position: Insertion index of the note; must equal the number of notes added.
+            fields: Normalized searchable fields of the note.
+        """
+        _, base, tail = self._state
+        tail.add(position - base, fields)
+        if len(tail) == self.shard_notes:
+            self._seal(tail.dump(len(tail))[_HEADER.size :], len(tail))
+
+    def _seal(self, layout: bytes, count: int) -> None:
+        """Move ``count`` notes laid out as ``offsets + buffer`` into a new shard."""
+        shards, base, _ = self._state
+        if self._resources.directory is None:
+            parent = _SHM_DIR if Path(_SHM_DIR).is_dir() else None
+            self._resources.directory = Path(tempfile.mkdtemp(prefix="notes-shards-", dir=parent))
+        path = self._resources.directory / f"{base:012d}.shard"
+        path.write_bytes(layout)
+        shard = _Shard(path, base, count, len(layout) - count * _OFFSET_SIZE)
+        self._state = ((*shards, shard), base + count, CorpusBuffer())
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        with self._pool_lock:
+            if self._resources.pool is None:
+                self._resources.pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._resources.pool
+
+    def candidates(self, query: str) -> Sequence[int]:
+        """Return positions of notes whose buffer region contains ``query``.
+
+        Args:
+            query: Normalized (lower-cased) search term.
+
+        Returns:
+            Sorted candidate positions.
+        """
+        if not query:
+            _, base, tail = self._state
+            return range(base + len(tail))
+        return list(self.iter_candidates(query))
+
+    def iter_candidates(self, query: str, start: int = 0) -> Generator[int]:
+        """Lazily yield positions at or after ``start`` whose region contains ``query``.
+
+        At most ``workers`` shard scans are in flight: each shard consumed submits
+        the next one, and scans still pending when the caller stops are cancelled.
+        The tail is scanned last, in-process.
+
+        Args:
+            query: Normalized (lower-cased) search term.
+            start: Smallest position to report.
+
+        Yields:
+            Candidate positions in ascending order.
+        """
+        shards, base, tail = self._state
+        needle = query.encode()
+        if not needle:
+            yield from range(start, base + len(tail))
+            return
+
+        remaining = deque(shard for shard in shards if shard.base + shard.count > start)
+        if remaining:
+            pool = self._pool()
+            in_flight: deque[tuple[_Shard, Future[list[int]]]] = deque()
+            try:
+                while remaining or in_flight:
+                    while remaining and len(in_flight) < self.workers:
+                        shard = remaining.popleft()
+                        first = max(start - shard.base, 0)
+                        future = pool.submit(
+                            _scan_shard, str(shard.path), shard.count, shard.size, needle, first
+                        )
+                        in_flight.append((shard, future))
+                    shard, future = in_flight.popleft()
+                    for position in future.result():
+                        yield shard.base + position
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+        for position in tail.iter_candidates(query, max(start - base, 0)):
+            yield base + position
+
+    def clear(self) -> None:
+        """Drop every shard and stop the worker pool."""
+        with self._pool_lock:
+            self._resources.release()
+        self._state = ((), 0, CorpusBuffer())
+
+    def dump(self, count: int) -> bytes:
+        """Serialize positions below ``count`` in :class:`CorpusBuffer` dump format.
+
+        Args:
+            count: Number of leading positions to include.
+
+        Returns:
+            Compact binary form accepted by :meth:`load`.
+        """
+        shards, _, tail = self._state
+        parts = [(shard.path.read_bytes(), shard.count) for shard in shards]
+        parts.append((tail.dump(len(tail))[_HEADER.size :], len(tail)))
+        offsets = array("Q")
+        buffers: list[bytes] = []
+        start = 0
+        remaining = count
+        for layout, total in parts:
+            if remaining == 0:
+                break
+            part_offsets, buffer = _take(layout, total, min(total, remaining))
+            offsets.extend(offset + start for offset in part_offsets)
+            buffers.append(buffer)
+            start += len(buffer)
+            remaining -= len(part_offsets)
+        return _HEADER.pack(count) + offsets.tobytes() + b"".join(buffers)
+
+    def load(self, data: bytes, count: int) -> None:
+        """Replace the corpus with one produced by :meth:`dump`.
+
+        Args:
+            data: Output of :meth:`dump` or :meth:`CorpusBuffer.dump`.
+            count: Number of positions the dump covers.
+        """
+        (stored,) = _HEADER.unpack_from(data)
+        if stored != count:
+            raise ValueError(f"dump covers {stored} notes, expected {count}")
+        self.clear()
+        offsets, buffer = _take(data[_HEADER.size :], count, count)
+        sealed = count - count % self.shard_notes
+        for first in range(0, sealed, self.shard_notes):
+            last = first + self.shard_notes
+            start = offsets[first]
+            end = offsets[last] if last < count else len(buffer)
+            shard_offsets = array("Q", (offset - start for offset in offsets[first:last]))
+            self._seal(shard_offsets.tobytes() + buffer[start:end], self.shard_notes)
+
+        start = offsets[sealed] if sealed < count else len(buffer)
+        tail_offsets = array("Q", (offset - start for offset in offsets[sealed:]))
+        tail = CorpusBuffer()
+        tail.load(
+            _HEADER.pack(count - sealed) + tail_offsets.tobytes() + buffer[start:], count - sealed
+        )
+        self._state = (self._state[0], sealed, tail)
@@ -0,0 +1,67 @@
+"""Coalescing of identical concurrent async calls."""
+
+from collections.abc import Awaitable, Callable, Hashable
+from typing import cast
+
+from anyio import CancelScope, Event
+
+
+class _Flight[V]:
+    """Outcome of one in-flight call, awaited by every caller sharing it."""
+
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: V | None = None
+        self.error: Exception | None = None
+
+
+class SingleFlight[K: Hashable, V]:
+    """Runs at most one call per key at a time and shares its outcome.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    before it finishes wait and receive the same result or exception instead
+    of running their own. A finished call is forgotten immediately, so this
+    never serves stale results, only deduplicates overlapping ones.
+
+    The leader's call is shielded from cancellation: waiting callers depend on
+    it even if the leader's own request goes away.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[K, _Flight[V]] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """Return ``await func()``, sharing an identical call already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable.
+            func: Starts the call; only invoked when no call for ``key`` is running.
+
+        Returns:
+            The call's result, shared by every caller that waited on it.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            await flight.done.wait()
+        else:
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+            try:
+                with CancelScope(shield=True):
+                    flight.result = await func()
+            except Exception as exc:
+                flight.error = exc
+            finally:
+                del self._flights[key]
+                flight.done.set()
+        if flight.error is not None:
+            raise flight.error
+        return cast("V", flight.result)
@@ -0,0 +1,132 @@
+"""Compact binary snapshots of the note store."""
+
+import os
+import struct
+import zlib
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+MAGIC = b"MNSNAP2\n"
+_COUNT = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_INDEX = struct.Struct("<HQ")
+_CRC = struct.Struct("<I")
+
+
+class SnapshotError(Exception):
+    """A snapshot file is truncated or fails its checksum."""
+
+
+@dataclass(slots=True, frozen=True)
+class Snapshot:
+    """Contents of a snapshot file."""
+
+    notes: list[bytes]
+    index_name: str
+    index_data: bytes
+    terms_data: bytes = b""
+
+
+def write_snapshot(
+    path: Path,
+    notes: Sequence[bytes],
+    index_name: str = "",
+    index_data: bytes = b"",
+    terms_data: bytes = b"",
+) -> None:
+    """Atomically write serialized notes and serialized indexes to ``path``.
+
+    Layout: magic, note count, each note's cached JSON prefixed by its length, the
+    search index section, the word index prefixed by its length, and a CRC32 of
+    everything before it. Storing the cached
+    JSON means a restore parses each note once instead of also re-serializing it.
+
+    The file is written to a temporary sibling, fsynced, and renamed into place,
+    so a crash never leaves a partially written snapshot under ``path``.
+
+    Args:
+        path: Destination file.
+        notes: Cached JSON of every note, in insertion order.
+        index_name: Search engine that produced ``index_data``.
+        index_data: Search index covering exactly ``notes``.
+        terms_data: Word index covering exactly ``notes``, or empty.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    crc = 0
+    with tmp.open("wb") as fh:
+        for chunk in _encode(notes, index_name, index_data, terms_data):
+            crc = zlib.crc32(chunk, crc)
+            fh.write(chunk)
+        fh.write(_CRC.pack(crc))
+        fh.flush()
+        os.fsync(fh.fileno())
+    tmp.replace(path)
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def read_snapshot(path: Path) -> Snapshot:
+    """Load a snapshot written by :func:`write_snapshot`.
+
+    Args:
+        path: Snapshot file.
+
+    Returns:
+        The serialized notes in insertion order and the serialized indexes.
+
+    Raises:
+        SnapshotError: If the file is truncated or corrupt.
+    """
+    data = path.read_bytes()
+    body_end = len(data) - _CRC.size
+    if body_end < len(MAGIC) + _COUNT.size or not data.startswith(MAGIC):
+        raise SnapshotError(f"{path} is not a notes snapshot")
+    (expected,) = _CRC.unpack_from(data, body_end)
+    if zlib.crc32(memoryview(data)[:body_end]) != expected:
+        raise SnapshotError(f"{path} failed its checksum")
+
+    (count,) = _COUNT.unpack_from(data, len(MAGIC))
+    offset = len(MAGIC) + _COUNT.size
+    notes: list[bytes] = []
+    unpack_length = _LENGTH.unpack_from
+    for _ in range(count):
+        (length,) = unpack_length(data, offset)
+        offset += _LENGTH.size
+        notes.append(data[offset : offset + length])
+        offset += length
+
+    name_len, data_len = _INDEX.unpack_from(data, offset)
+    offset += _INDEX.size
+    index_name = data[offset : offset + name_len].decode()
+    offset += name_len
+    index_data = data[offset : offset + data_len]
+    offset += data_len
+    (terms_len,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    terms_data = data[offset : offset + terms_len]
+    return Snapshot(
+        notes=notes, index_name=index_name, index_data=index_data, terms_data=terms_data
+    )
+
+
+def _encode(
+    notes: Sequence[bytes], index_name: str, index_data: bytes, terms_data: bytes
+) -> Iterator[bytes]:
+    """Yield the snapshot body in moderately sized chunks."""
+    yield MAGIC + _COUNT.pack(len(notes))
+    parts: list[bytes] = []
+    for i, note in enumerate(notes, start=1):
+        parts += (_LENGTH.pack(len(note)), note)
+        if i % 4096 == 0:
+            yield b"".join(parts)
+            parts.clear()
+    yield b"".join(parts)
+    encoded_name = index_name.encode()
+    yield _INDEX.pack(len(encoded_name), len(index_data)) + encoded_name
+    yield index_data
+    yield _COUNT.pack(len(terms_data))
+    yield terms_data
@@ -0,0 +1,656 @@
+"""SQLite-backed note storage with FTS5 trigram search."""
+
+import logging
+import queue
+import sqlite3
+import threading
+from collections.abc import Generator, Iterable, Sequence
+from contextlib import closing, contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Literal, cast
+from uuid import uuid4
+
+from app.models.note import NoteCreate, NoteResponse, NoteStats
+from app.services.change_log import Change
+from app.services.fuzzy_index import SymmetricDeleteIndex, allowed_distance
+from app.services.inverted_index import TITLE_BOOST, tokenize
+from app.services.note_record import normalize, render_json_array
+from app.services.pagination import NotePage, decode_cursor, encode_cursor
+from app.services.query_language import (
+    And,
+    MatchMode,
+    Node,
+    Not,
+    Or,
+    Term,
+    all_words,
+    expand_terms,
+    parse_query,
+)
+from app.services.suggest_index import normalize_prefix, suggestion_keys
+from app.services.trigram_index import TRIGRAM_SIZE
+
+logger = logging.getLogger(__name__)
+
+type SynchronousMode = Literal["FULL", "NORMAL", "OFF"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    json BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, content, content='notes', content_rowid='seq', tokenize='trigram'
+);
+CREATE TABLE IF NOT EXISTS note_suggestions (key TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, title, content) VALUES (new.seq, new.title, new.content);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_terms USING fts5(
+    title, content, content='notes', content_rowid='seq',
+    tokenize='unicode61 remove_diacritics 0'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_terms_vocab USING fts5vocab(notes_terms, 'row');
+CREATE TRIGGER IF NOT EXISTS notes_terms_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_terms(rowid, title, content) VALUES (new.seq, new.title, new.content);
+END;
+"""
+
+_INSERT = "INSERT INTO notes (id, title, content, created_at, json) VALUES (?, ?, ?, ?, ?)"
+_INSERT_SUGGESTION = "INSERT OR IGNORE INTO note_suggestions (key) VALUES (?)"
+
+# Rows are fetched in batches while filtering so that paged searches stop early.
+_FETCH_BATCH = 256
+# Notes read per connection checkout while exporting.
+_EXPORT_WINDOW = 1024
+# Upper ``seq`` bound for searches that are not limited to a snapshot.
+_MAX_SEQ = 2**63 - 1
+
+
+def _fts_phrase(query: str) -> str:
+    """Quote ``query`` as a single FTS5 phrase string."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _fts_boolean(node: Node) -> str | None:
+    """Translate a parsed boolean query into an FTS5 expression over ``notes_terms``.
+
+    Returns:
+        The expression, or None if the query negates a clause outside an AND that
+        also has a positive clause, which FTS5's binary ``NOT`` cannot express.
+    """
+    match node:
+        case Term(tokens, field):
+            phrase = _fts_phrase(" ".join(tokens))
+            return phrase if field is None else f"{field} : {phrase}"
+        case And(children):
+            positive = [_fts_boolean(c) for c in children if not isinstance(c, Not)]
+            negative = [_fts_boolean(c.child) for c in children if isinstance(c, Not)]
+            if not positive or None in positive or None in negative:
+                return None
+            expression = "(" + " AND ".join(cast("list[str]", positive)) + ")"
+            return "".join([expression, *(f" NOT ({clause})" for clause in negative)])
+        case Or(children):
+            clauses = [_fts_boolean(child) for child in children]
+            if None in clauses:
+                return None
+            return "(" + " OR ".join(cast("list[str]", clauses)) + ")"
+        case Not():
+            return None
+
+
+def _boolean_filter(node: Node, params: dict[str, str]) -> str:
+    """Return a condition on ``notes.seq`` selecting the notes that match ``node``.
+
+    Each largest clause FTS5 can express becomes one ``MATCH`` subquery over the
+    ``:after``/``:upto`` range, its expression added to ``params``; the negations
+    FTS5 cannot express are combined around those with SQL's own ``NOT``, ``AND``,
+    and ``OR``.
+    """
+    expression = _fts_boolean(node)
+    if expression is not None:
+        name = f"match{len(params)}"
+        params[name] = expression
+        return (
+            "seq IN (SELECT rowid FROM notes_terms WHERE notes_terms MATCH "  # noqa: S608
+            f":{name} AND rowid > :after AND rowid <= :upto)"
+        )
+    match node:
+        case Not(child):
+            return f"NOT {_boolean_filter(child, params)}"
+        case And(children):
+            return "(" + " AND ".join(_boolean_filter(c, params) for c in children) + ")"
+        case Or(children):
+            return "(" + " OR ".join(_boolean_filter(c, params) for c in children) + ")"
+        case Term():
+            raise AssertionError("a term is always an FTS5 expression")
+
+
+def _suggestions(title: str) -> list[tuple[str]]:
+    """Parameter rows adding ``title``'s completions to ``note_suggestions``."""
+    return [(key,) for key in suggestion_keys(normalize(title))]
+
+
+def _row(note: NoteResponse) -> tuple[str, str, str, str, bytes]:
+    """Column values for inserting ``note``."""
+    return (
+        note.id,
+        note.title,
+        note.content,
+        note.created_at.isoformat(),
+        note.model_dump_json().encode(),
+    )
+
+
+def _confirmed(
+    rows: Iterable[tuple[object, ...]], q_key: str | None
+) -> Generator[tuple[int, bytes]]:
+    """Yield ``(seq, json)`` of the rows from :meth:`SqliteNoteService._compile` that match."""
+    for row in rows:
+        if q_key is None:
+            yield cast("tuple[int, bytes]", row)
+            continue
+        seq, title, content, data = cast("tuple[int, str, str, bytes]", row)
+        if q_key in normalize(title) or q_key in normalize(content):
+            yield seq, data
+
+
+class SqliteNoteService:
+    """Note storage in a SQLite database in WAL mode.
+
+    One writer connection is serialized by a lock; reads check a connection out of
+    a small pool so they run concurrently with writes. ``?q=`` search narrows rows
+    with an FTS5 trigram index and then confirms each hit with the same
+    lower-cased substring test as the in-memory service. Queries shorter than a
+    trigram, or containing a NUL character, cannot use the index and scan the
+    table instead. Boolean queries are translated to FTS5 expressions over the
+    word index, whose phrase and column filters already match the query
+    language's semantics.
+
+    Every method blocks on disk I/O and must be called off the event loop.
+    """
+
+    def __init__(
+        self, path: Path, *, readers: int = 4, synchronous: SynchronousMode = "NORMAL"
+    ) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = self._connect(synchronous)
+        self._writer.executescript(_SCHEMA)
+        self._write_lock = threading.Lock()
+        self._dictionary: SymmetricDeleteIndex | None = None
+        self._readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self._all: list[sqlite3.Connection] = [self._writer]
+        for _ in range(readers):
+            conn = self._connect(synchronous)
+            self._readers.put(conn)
+            self._all.append(conn)
+        logger.info("Opened SQLite note store %s with %d reader(s)", path, readers)
+
+    def _connect(self, synchronous: SynchronousMode) -> sqlite3.Connection:
+        """Open a connection configured for WAL-mode concurrency."""
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _reader(self) -> Generator[sqlite3.Connection]:
+        """Check a read connection out of the pool for the duration of the block."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def create(self, data: NoteCreate) -> NoteResponse:
+        """Create a new note and return it once committed.
+
+        Args:
+            data: Validated note creation payload.
+
+        Returns:
+            The newly created note with generated id and timestamp.
+        """
+        note = NoteResponse(
+            id=str(uuid4()),
+            title=data.title,
+            content=data.content,
+            created_at=datetime.now(UTC),
+        )
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                self._writer.execute(_INSERT, _row(note))
+                self._writer.executemany(_INSERT_SUGGESTION, _suggestions(note.title))
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+            self._learn_terms([note])
+        logger.info("Created note %s with title '%s'", note.id, note.title)
+        return note
+
+    def create_many(self, items: Iterable[NoteCreate]) -> list[NoteResponse]:
+        """Create several notes in a single transaction.
+
+        Args:
+            items: Validated note creation payloads.
+
+        Returns:
+            The created notes, in the order given.
+        """
+        notes = [
+            NoteResponse(
+                id=str(uuid4()),
+                title=data.title,
+                content=data.content,
+                created_at=datetime.now(UTC),
+            )
+            for data in items
+        ]
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                self._writer.executemany(_INSERT, [_row(note) for note in notes])
+                self._writer.executemany(
+                    _INSERT_SUGGESTION, [row for note in notes for row in _suggestions(note.title)]
+                )
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+            self._learn_terms(notes)
+        logger.info("Created %d note(s) in bulk", len(notes))
+        return notes
+
+    def get(self, note_id: str) -> NoteResponse | None:
+        """Look up a single note by id.
+
+        Args:
+            note_id: Identifier of the note.
+
+        Returns:
+            The note, or None if no note has that id.
+        """
+        with self._reader() as conn:
+            row = conn.execute("SELECT json FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return None if row is None else NoteResponse.model_validate_json(row[0])
+
+    def list_all(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Sequence[NoteResponse]:
+        """Return all notes, optionally filtered by keyword.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: ``"substring"`` to match ``query`` literally, or ``"boolean"`` to
+                parse it with the boolean query language.
+            fuzzy: Maximum edit distance (at most 2) tolerated per query word. When
+                non-zero, words match whole indexed words instead of substrings and
+                single words in boolean queries match their near spellings too.
+
+        Returns:
+            Sequence of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        matches = self._matches(query, 0, mode, fuzzy)
+        return [NoteResponse.model_validate_json(data) for _, data in matches]
+
+    def list_all_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> bytes:
+        """Return the JSON array body for :meth:`list_all`.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            UTF-8 encoded JSON array of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        return render_json_array(data for _, data in self._matches(query, 0, mode, fuzzy))
+
+    def list_page(
+        self,
+        query: str | None = None,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        mode: MatchMode = "substring",
+        fuzzy: int = 0,
+    ) -> NotePage:
+        """Return one page of notes in insertion order, optionally filtered by keyword.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            limit: Maximum number of notes on the page.
+            cursor: ``next_cursor`` from the previous page, or None for the first page.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            The page of notes and the cursor for the next page, if any.
+
+        Raises:
+            ValueError: If ``cursor`` or a boolean query is malformed.
+        """
+        after = 0 if cursor is None else decode_cursor(cursor)
+        page: list[bytes] = []
+        last = after
+        has_more = False
+        with closing(self._matches(query, after, mode, fuzzy)) as matches:
+            for seq, data in matches:
+                if len(page) == limit:
+                    has_more = True
+                    break
+                page.append(data)
+                last = seq
+        next_cursor = encode_cursor(last) if has_more else None
+        return NotePage(notes_json=page, next_cursor=next_cursor)
+
+    def iter_json(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Generator[bytes]:
+        """Iterate the JSON of matching notes as of this call, in insertion order.
+
+        The highest ``seq`` is read now and notes are then fetched in windows of
+        rows up to it, each with its own connection checkout, so concurrent
+        creates never show up and a slow consumer does not hold a connection.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            Each note's stored JSON.
+
+        Raises:
+            ValueError: If a boolean query is malformed; raised by this call,
+                before iteration starts.
+        """
+        sql, params, q_key = self._compile(query, mode, fuzzy)
+        with self._reader() as conn:
+            (upto,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM notes").fetchone()
+        return self._export(sql, params, q_key, upto)
+
+    def list_ranked(self, query: str, *, limit: int) -> list[NoteResponse]:
+        """Return the notes most relevant to ``query``, best first.
+
+        Args:
+            query: Search text; notes containing any of its words are ranked.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            Up to ``limit`` notes ordered by BM25 score.
+        """
+        return [NoteResponse.model_validate_json(data) for data in self._rank(query, limit)]
+
+    def list_ranked_json(self, query: str, *, limit: int) -> bytes:
+        """Return the JSON array body for :meth:`list_ranked`.
+
+        Args:
+            query: Search text; notes containing any of its words are ranked.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            UTF-8 encoded JSON array of the best-scoring notes.
+        """
+        return render_json_array(self._rank(query, limit))
+
+    def _rank(self, query: str, limit: int) -> list[bytes]:
+        """Return the JSON of the ``limit`` best matches, scored by FTS5's bm25()."""
+        tokens = tokenize(normalize(query))
+        if not tokens or limit <= 0:
+            return []
+        match = " OR ".join(_fts_phrase(token) for token in dict.fromkeys(tokens))
+        with self._reader() as conn:
+            rows = conn.execute(
+                "SELECT notes.json FROM notes_terms JOIN notes ON notes.seq = notes_terms.rowid "
+                "WHERE notes_terms MATCH ? "
+                "ORDER BY bm25(notes_terms, ?, 1.0), notes.seq LIMIT ?",
+                (match, TITLE_BOOST, limit),
+            ).fetchall()
+        return [data for (data,) in rows]
+
+    def changes_after(
+        self, seq: int, *, limit: int, upto: int | None = None
+    ) -> tuple[list[Change], int]:
+        """Return notes created after ``seq``, numbered by their durable ``seq``.
+
+        ``seq`` is assigned in commit order and shared by every process using the
+        database, so it serves as the change sequence number for all of them.
+
+        Args:
+            seq: Sequence number the caller is up to date with.
+            limit: Maximum number of changes to return.
+            upto: Only return changes at or below this sequence number.
+
+        Returns:
+            Up to ``limit`` changes, oldest first, and the latest sequence number,
+            both read from the same snapshot.
+        """
+        bound = _MAX_SEQ if upto is None else upto
+        with self._reader() as conn:
+            conn.execute("BEGIN")
+            try:
+                rows = conn.execute(
+                    "SELECT seq, json FROM notes WHERE seq > ? AND seq <= ? ORDER BY seq LIMIT ?",
+                    (seq, bound, limit),
+                ).fetchall()
+                (last,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM notes").fetchone()
+            finally:
+                conn.execute("COMMIT")
+        changes = [
+            Change(row_seq, NoteResponse.model_validate_json(data)) for row_seq, data in rows
+        ]
+        return changes, last
+
+    def suggest(self, prefix: str, *, limit: int) -> list[str]:
+        """Complete ``prefix`` from note titles and the words in them.
+
+        Served by a range scan of the ``note_suggestions`` primary key.
+
+        Args:
+            prefix: Text typed so far.
+            limit: Maximum number of completions.
+
+        Returns:
+            Normalized completions in alphabetical order.
+        """
+        key = normalize_prefix(prefix)
+        if not key:
+            return []
+        with self._reader() as conn:
+            rows = conn.execute(
+                "SELECT key FROM note_suggestions WHERE key >= ? ORDER BY key LIMIT ?",
+                (key, limit),
+            ).fetchall()
+        return [completion for (completion,) in rows if completion.startswith(key)]
+
+    def count(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> int:
+        """Count notes, optionally filtered by keyword.
+
+        Args:
+            query: Case-insensitive search term applied to title and content.
+            mode: How ``query`` is interpreted; see :meth:`list_all`.
+            fuzzy: Edit distance tolerated per word; see :meth:`list_all`.
+
+        Returns:
+            Number of matching notes.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        if query is None:
+            with self._reader() as conn:
+                (total,) = conn.execute("SELECT count(*) FROM notes").fetchone()
+            return int(total)
+        return sum(1 for _ in self._matches(query, 0, mode, fuzzy))
+
+    def search_cost(self, query: str | None = None) -> int:
+        """Estimate the work of listing or searching notes, in database bytes.
+
+        Args:
+            query: Search term the caller is about to run.
+
+        Returns:
+            Size of the main database file.
+        """
+        with self._reader() as conn:
+            (pages,) = conn.execute("PRAGMA page_count").fetchone()
+            (page_size,) = conn.execute("PRAGMA page_size").fetchone()
+        return int(pages) * int(page_size)
+
+    def stats(self) -> NoteStats:
+        """Report the note count and the on-disk size of the FTS5 word index.
+
+        The size comes from the ``dbstat`` virtual table and is None when SQLite
+        was built without it.
+
+        Returns:
+            Storage statistics.
+        """
+        with self._reader() as conn:
+            (notes,) = conn.execute("SELECT count(*) FROM notes").fetchone()
+            try:
+                (size,) = conn.execute(
+                    "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name LIKE 'notes_terms%'"
+                ).fetchone()
+            except sqlite3.OperationalError:
+                size = None
+        return NoteStats(notes=int(notes), index_bytes=None if size is None else int(size))
+
+    def _similar_terms(self, word: str, distance: int) -> list[str]:
+        """Return indexed words within ``distance`` edits of ``word``.
+
+        The symmetric-delete dictionary is built from the FTS5 vocabulary on the
+        first fuzzy search, under the write lock so that no create is missed, and
+        kept current by every create after that.
+        """
+        dictionary = self._dictionary
+        if dictionary is None:
+            with self._write_lock:
+                if self._dictionary is None:
+                    loaded = SymmetricDeleteIndex()
+                    for (term,) in self._writer.execute("SELECT term FROM notes_terms_vocab"):
+                        loaded.add(term)
+                    self._dictionary = loaded
+                dictionary = self._dictionary
+        return dictionary.lookup(word, allowed_distance(word, distance))
+
+    def _learn_terms(self, notes: Iterable[NoteResponse]) -> None:
+        """Add the words of ``notes`` to a loaded dictionary; callers hold the write lock."""
+        if self._dictionary is None:
+            return
+        for note in notes:
+            for token in tokenize(normalize(f"{note.title} {note.content}")):
+                self._dictionary.add(token)
+
+    def _compile(
+        self, query: str | None, mode: MatchMode, fuzzy: int
+    ) -> tuple[str, dict[str, str], str | None]:
+        """Translate ``query`` into a statement selecting matching notes in a ``seq`` range.
+
+        The statement takes the bounds as the ``:after`` (exclusive) and ``:upto``
+        (inclusive) parameters and orders rows by ``seq``.
+
+        Returns:
+            The SQL, its remaining parameters, and the normalized substring each
+            row must still be confirmed against, or None if every row matches.
+            Rows carry title and content before the JSON only in the latter case.
+
+        Raises:
+            ValueError: If a boolean query is malformed.
+        """
+        if query is None:
+            sql = "SELECT seq, json FROM notes WHERE seq > :after AND seq <= :upto ORDER BY seq"
+            return sql, {}, None
+        if mode == "boolean" or fuzzy:
+            node = parse_query(query) if mode == "boolean" else all_words(query)
+            if fuzzy:
+                node = expand_terms(node, lambda word: self._similar_terms(word, fuzzy))
+            params: dict[str, str] = {}
+            condition = _boolean_filter(node, params)
+            sql = (
+                "SELECT seq, json FROM notes WHERE seq > :after AND seq <= :upto "  # noqa: S608
+                f"AND {condition} ORDER BY seq"
+            )
+            return sql, params, None
+        q_key = normalize(query)
+        # FTS5 string literals end at a NUL, so such queries take the scan path.
+        if len(q_key) >= TRIGRAM_SIZE and "\x00" not in query:
+            sql = (
+                "SELECT seq, title, content, json FROM notes WHERE seq > :after "
+                "AND seq <= :upto AND seq IN (SELECT rowid FROM notes_fts WHERE notes_fts "
+                "MATCH :match AND rowid > :after AND rowid <= :upto) ORDER BY seq"
+            )
+            return sql, {"match": _fts_phrase(query)}, q_key
+        sql = (
+            "SELECT seq, title, content, json FROM notes "
+            "WHERE seq > :after AND seq <= :upto ORDER BY seq"
+        )
+        return sql, {}, q_key
+
+    def _matches(
+        self, query: str | None, after: int, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Generator[tuple[int, bytes]]:
+        """Yield ``(seq, json)`` of notes after ``after`` matching ``query``, in order."""
+        # Parse first so that a malformed query fails before a connection is checked out.
+        sql, params, q_key = self._compile(query, mode, fuzzy)
+        with self._reader() as conn:
+            cursor = conn.execute(sql, {**params, "after": after, "upto": _MAX_SEQ})
+            while batch := cursor.fetchmany(_FETCH_BATCH):
+                yield from _confirmed(batch, q_key)
+
+    def _export(
+        self, sql: str, params: dict[str, str], q_key: str | None, upto: int
+    ) -> Generator[bytes]:
+        """Yield the JSON of matches with ``seq`` up to ``upto``, a window of rows at a time.
+
+        A read connection is checked out only while one window is fetched, so a
+        slow consumer never holds one.
+        """
+        after = 0
+        while after < upto:
+            with self._reader() as conn:
+                row = conn.execute(
+                    "SELECT seq FROM notes WHERE seq > ? AND seq <= ? ORDER BY seq "
+                    "LIMIT 1 OFFSET ?",
+                    (after, upto, _EXPORT_WINDOW - 1),
+                ).fetchone()
+                end = upto if row is None else row[0]
+                rows = conn.execute(sql, {**params, "after": after, "upto": end}).fetchall()
+            for _, data in _confirmed(rows, q_key):
+                yield data
+            after = end
+
+    def clear(self) -> None:
+        """Remove all notes (used in testing)."""
+        with self._write_lock:
+            self._writer.execute("DELETE FROM notes")
+            self._writer.execute("DELETE FROM note_suggestions")
+            self._writer.execute("INSERT INTO notes_fts(notes_fts) VALUES ('delete-all')")
+            self._writer.execute("INSERT INTO notes_terms(notes_terms) VALUES ('delete-all')")
+            self._dictionary = None
+
+    def close(self) -> None:
+        """Close every connection."""
+        for conn in self._all:
+            conn.close()
+        logger.info("Closed SQLite note store %s", self.path)
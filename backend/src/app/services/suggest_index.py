@@ -0,0 +1,133 @@
+"""Sorted prefix index of note titles for search-as-you-type suggestions."""
+
+import re
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+
+from app.services.inverted_index import tokenize
+from app.services.note_record import normalize
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Normalize typed text for prefix lookup, keeping one trailing space.
+
+    Args:
+        prefix: Raw text from the search box.
+
+    Returns:
+        Lower-cased text with whitespace runs collapsed and leading space removed.
+    """
+    return _WHITESPACE_RE.sub(" ", normalize(prefix)).lstrip()
+
+
+def suggestion_keys(title_key: str) -> list[str]:
+    """Return the completions a note title contributes: the title itself and its words.
+
+    Args:
+        title_key: Normalized title.
+
+    Returns:
+        Distinct non-empty keys, title first.
+    """
+    title = " ".join(title_key.split())
+    return [key for key in dict.fromkeys([title, *tokenize(title_key)]) if key]
+
+
+class SuggestIndex:
+    """Distinct normalized titles and title words kept in sorted chunks.
+
+    Keys are split into sorted runs of at most ``chunk_size``, with the largest
+    key of each run in a separate list. A prefix lookup bisects that list to
+    find the run, then bisects the run and walks forward, so it costs
+    O(log n + limit) whatever the corpus size. An insert copies one run, and
+    the list of runs only when that run splits, instead of shifting every key
+    of one flat list. A key already present costs only a set lookup.
+
+    Writers replace runs instead of mutating them, and publish a split in one
+    assignment, so :meth:`complete` needs no lock; at worst it misses a key
+    being inserted meanwhile. Writers must be serialized by the caller.
+    """
+
+    def __init__(self, chunk_size: int = 256) -> None:
+        self.chunk_size = chunk_size
+        # (sorted runs, largest key of each run), replaced as a whole on update.
+        self._runs: tuple[list[list[str]], list[str]] = ([], [])
+        self._known: set[str] = set()
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys."""
+        return len(self._known)
+
+    def add(self, title_key: str) -> None:
+        """Index the completions of a note title.
+
+        Args:
+            title_key: Normalized title.
+        """
+        for key in suggestion_keys(title_key):
+            if key not in self._known:
+                self._insert(key)
+                self._known.add(key)
+
+    def add_many(self, title_keys: Iterable[str]) -> None:
+        """Index the completions of many note titles with a single sort.
+
+        Args:
+            title_keys: Normalized titles.
+        """
+        for title_key in title_keys:
+            self._known.update(suggestion_keys(title_key))
+        keys = sorted(self._known)
+        size = self.chunk_size
+        runs = [keys[i : i + size] for i in range(0, len(keys), size)]
+        self._runs = (runs, [run[-1] for run in runs])
+
+    def _insert(self, key: str) -> None:
+        """Insert a key that is not yet present."""
+        runs, maxes = self._runs
+        if not runs:
+            self._runs = ([[key]], [key])
+            return
+        i = min(bisect_left(maxes, key), len(runs) - 1)
+        run = runs[i].copy()
+        insort(run, key)
+        if len(run) <= self.chunk_size:
+            # A reader sees the old or the new run; either is sorted and consistent.
+            runs[i] = run
+            maxes[i] = run[-1]
+            return
+        half = len(run) // 2
+        self._runs = (
+            [*runs[:i], run[:half], run[half:], *runs[i + 1 :]],
+            [*maxes[:i], run[half - 1], run[-1], *maxes[i + 1 :]],
+        )
+
+    def complete(self, prefix: str, limit: int) -> list[str]:
+        """Return up to ``limit`` keys starting with ``prefix``, in sorted order.
+
+        Args:
+            prefix: Normalized prefix.
+            limit: Maximum number of completions.
+
+        Returns:
+            Matching keys.
+        """
+        runs, maxes = self._runs
+        matches: list[str] = []
+        i = bisect_left(maxes, prefix)
+        start = bisect_left(runs[i], prefix) if i < len(runs) else 0
+        while i < len(runs) and len(matches) < limit:
+            for key in runs[i][start : start + limit - len(matches)]:
+                if not key.startswith(prefix):
+                    return matches
+                matches.append(key)
+            i += 1
+            start = 0
+        return matches
+
+    def clear(self) -> None:
+        """Drop every key."""
+        self._runs = ([], [])
+        self._known.clear()
@@ -0,0 +1,151 @@
+"""Trigram index for fast case-insensitive substring search."""
+
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Sequence
+
+TRIGRAM_SIZE = 3
+# Dump layout per trigram: <gram byte length><posting count><gram><uint32 postings>.
+_ENTRY = struct.Struct("<BI")
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the distinct trigrams of ``text``.
+
+    Args:
+        text: Already-normalized (lower-cased) text.
+
+    Returns:
+        Set of every length-3 substring of ``text``.
+    """
+    return {text[i : i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+def _contains(postings: list[int], position: int) -> bool:
+    """Binary-search a sorted posting list for ``position``."""
+    i = bisect_left(postings, position)
+    return i < len(postings) and postings[i] == position
+
+
+class TrigramIndex:
+    """Maps every trigram to the sorted positions of the notes containing it.
+
+    Positions are insertion indexes into the owning store. Because notes are only
+    ever appended, each posting list stays sorted without any extra work.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, list[int]] = {}
+        self._size = 0
+
+    def add(self, position: int, fields: Iterable[str]) -> None:
+        """Index the note stored at ``position``.
+
+        Args:
+            position: Insertion index of the note; must exceed every indexed position.
+            fields: Normalized searchable fields of the note.
+        """
+        grams: set[str] = set()
+        for field in fields:
+            grams |= trigrams(field)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(position)
+        self._size = position + 1
+
+    def candidates(self, query: str) -> Sequence[int]:
+        """Return positions of notes that may contain ``query``.
+
+        The result is a superset of the true matches: every trigram of the query
+        occurs somewhere in the note, but callers must still confirm the substring.
+
+        Args:
+            query: Normalized (lower-cased) search term.
+
+        Returns:
+            Sorted candidate positions. Queries too short to narrow the search yield a
+            lazy ``range`` over every position rather than a materialized list.
+        """
+        if not trigrams(query):
+            return range(self._size)
+        return list(self.iter_candidates(query))
+
+    def iter_candidates(self, query: str, start: int = 0) -> Iterator[int]:
+        """Lazily yield candidate positions at or after ``start``, in ascending order.
+
+        Walks the shortest posting list from ``start`` and probes the others per
+        position, so stopping early skips the rest of the intersection.
+
+        Args:
+            query: Normalized (lower-cased) search term.
+            start: Smallest position to report.
+
+        Yields:
+            Candidate positions, a superset of the true matches.
+        """
+        grams = trigrams(query)
+        if not grams:
+            yield from range(start, self._size)
+            return
+
+        lists: list[list[int]] = []
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                return
+            lists.append(postings)
+
+        lists.sort(key=len)
+        smallest, rest = lists[0], lists[1:]
+        for i in range(bisect_left(smallest, start), len(smallest)):
+            position = smallest[i]
+            if all(_contains(other, position) for other in rest):
+                yield position
+
+    def clear(self) -> None:
+        """Drop all postings."""
+        self._postings.clear()
+        self._size = 0
+
+    def dump(self, count: int) -> bytes:
+        """Serialize postings for positions below ``count``.
+
+        Args:
+            count: Number of leading positions to include.
+
+        Returns:
+            Compact binary form accepted by :meth:`load`.
+        """
+        parts: list[bytes] = []
+        # list() copies the items in one C call, so concurrent adds cannot resize the
+        # dict mid-iteration; posting lists only grow past ``count`` meanwhile.
+        for gram, postings in list(self._postings.items()):
+            end = bisect_left(postings, count)
+            if end == 0:
+                continue
+            encoded = gram.encode()
+            parts += (_ENTRY.pack(len(encoded), end), encoded)
+            parts.append(array("I", postings[:end]).tobytes())
+        return b"".join(parts)
+
+    def load(self, data: bytes, count: int) -> None:
+        """Replace the index with one produced by :meth:`dump`.
+
+        Args:
+            data: Output of :meth:`dump`.
+            count: Number of positions the dump covers.
+        """
+        postings: dict[str, list[int]] = {}
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            gram_len, size = _ENTRY.unpack_from(view, offset)
+            offset += _ENTRY.size
+            gram = str(view[offset : offset + gram_len], "utf-8")
+            offset += gram_len
+            positions = array("I")
+            positions.frombytes(view[offset : offset + size * positions.itemsize])
+            offset += size * positions.itemsize
+            postings[gram] = positions.tolist()
+        self._postings = postings
+        self._size = count
@@ -0,0 +1,45 @@
+"""Unit tests for the change log ring buffer."""
+
+from datetime import UTC, datetime
+
+from app.models.note import NoteResponse
+from app.services.change_log import ChangeLog, initial_seq
+
+
+def _note(title: str) -> NoteResponse:
+    """Build a note without going through a store."""
+    return NoteResponse(id=title, title=title, content="x", created_at=datetime.now(UTC))
+
+
+class TestChangeLog:
+    """Unit tests for ChangeLog."""
+
+    def test_since_returns_later_changes(self) -> None:
+        """Changes after a retained sequence number come back oldest first."""
+        log = ChangeLog(10, first_seq=5)
+        assert log.since(4) == []
+        for title in ("a", "b", "c"):
+            log.append(_note(title))
+        assert log.last_seq == 7
+        assert [change.note.title for change in log.since(5) or []] == ["b", "c"]
+        assert [change.seq for change in log.since(4) or []] == [5, 6, 7]
+        assert log.since(7) == []
+
+    def test_evicted_or_unknown_seq_requires_resync(self) -> None:
+        """Asking from before the oldest retained change, or from the future, returns None."""
+        log = ChangeLog(2)
+        for title in ("a", "b", "c"):
+            log.append(_note(title))
+        assert len(log) == 2
+        assert log.since(0) is None
+        assert [change.note.title for change in log.since(1) or []] == ["b", "c"]
+        assert log.since(4) is None
+
+    def test_restarted_log_starts_above_earlier_numbers(self) -> None:
+        """A log started later rejects sequence numbers handed out by an earlier one."""
+        old = ChangeLog(10, first_seq=initial_seq())
+        for title in ("a", "b"):
+            old.append(_note(title))
+        new = ChangeLog(10, first_seq=old.last_seq + 1_000)
+        assert new.since(old.last_seq) is None
+        assert initial_seq() > 1_700_000_000_000_000
@@ -0,0 +1,80 @@
+"""Unit tests for the corpus buffer search engine."""
+
+import random
+
+import pytest
+
+from app.models.note import NoteCreate
+from app.services.corpus_buffer import CorpusBuffer
+from app.services.note_service import NoteService
+
+
+class TestCorpusBuffer:
+    """Unit tests for CorpusBuffer."""
+
+    def test_candidates_map_hits_to_positions(self) -> None:
+        """Hits anywhere in a note's region map back to that note once."""
+        buffer = CorpusBuffer()
+        buffer.add(0, ("python tips", "python body"))
+        buffer.add(1, ("rust tips", "body"))
+        buffer.add(2, ("guide", "learn python"))
+        assert buffer.candidates("python") == [0, 2]
+        assert buffer.candidates("tips") == [0, 1]
+        assert buffer.candidates("zzz") == []
+
+    def test_iter_candidates_resumes_from_start(self) -> None:
+        """iter_candidates() skips positions below start and ignores later appends."""
+        buffer = CorpusBuffer()
+        for position in range(6):
+            buffer.add(position, ("python" if position % 2 else "rust", "body"))
+        assert list(buffer.iter_candidates("python", 2)) == [3, 5]
+        assert list(buffer.iter_candidates("", 4)) == [4, 5]
+        matches = buffer.iter_candidates("python")
+        assert next(matches) == 1
+        buffer.add(6, ("python", "late"))
+        assert list(matches) == [3, 5]
+
+    def test_empty_query_returns_every_position(self) -> None:
+        """An empty query matches every note."""
+        buffer = CorpusBuffer()
+        buffer.add(0, ("a", "b"))
+        assert list(buffer.candidates("")) == [0]
+
+    def test_matches_do_not_span_fields(self) -> None:
+        """The field separator keeps matches inside a single field."""
+        buffer = CorpusBuffer()
+        buffer.add(0, ("ab", "cd"))
+        assert buffer.candidates("bc") == []
+
+    def test_add_rejects_out_of_order_position(self) -> None:
+        """Positions must be appended contiguously."""
+        buffer = CorpusBuffer()
+        with pytest.raises(ValueError, match="expected position 0"):
+            buffer.add(3, ("a", "b"))
+
+    def test_clear_drops_everything(self) -> None:
+        """clear() should empty the buffer."""
+        buffer = CorpusBuffer()
+        buffer.add(0, ("hello", "world"))
+        buffer.clear()
+        assert buffer.candidates("hello") == []
+
+    def test_search_matches_linear_scan(self) -> None:
+        """A buffer-backed service returns exactly what a naive scan returns."""
+        rng = random.Random(7)  # noqa: S311
+        alphabet = "abcAB İß é"
+        service = NoteService(search_engine="buffer")
+        notes = [
+            service.create(
+                NoteCreate(
+                    title="".join(rng.choices(alphabet, k=8)),
+                    content="".join(rng.choices(alphabet, k=30)),
+                )
+            )
+            for _ in range(200)
+        ]
+        for _ in range(100):
+            query = "".join(rng.choices(alphabet, k=rng.randint(1, 5)))
+            q = query.lower()
+            expected = [n for n in notes if q in n.title.lower() or q in n.content.lower()]
+            assert list(service.list_all(query=query)) == expected
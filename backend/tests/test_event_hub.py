@@ -0,0 +1,48 @@
+"""Unit tests for the Server-Sent Events hub."""
+
+from datetime import UTC, datetime
+
+import anyio
+import pytest
+
+from app.models.note import NoteResponse
+from app.services.change_log import Change
+from app.services.event_hub import EventHub, change_frame, sse_frame
+
+
+class TestEventHub:
+    """Unit tests for EventHub and event encoding."""
+
+    def test_frames_follow_the_sse_format(self) -> None:
+        """Events carry an optional id, the event type, and one data line."""
+        assert sse_frame("resync", b"{}") == b"event: resync\ndata: {}\n\n"
+        note = NoteResponse(id="n1", title="T", content="c", created_at=datetime.now(UTC))
+        frame = change_frame(Change(7, note))
+        assert frame.startswith(b"id: 7\nevent: note_created\ndata: {")
+        assert frame.endswith(b"}\n\n")
+
+    async def test_publish_reaches_every_subscriber(self) -> None:
+        """Each subscriber receives every event published while subscribed."""
+        hub = EventHub(queue_size=4)
+        with hub.subscribe() as first, hub.subscribe() as second:
+            assert len(hub) == 2
+            hub.publish(b"a")
+            hub.publish(b"b")
+            assert [await first.receive(), await first.receive()] == [b"a", b"b"]
+            assert await second.receive() == b"a"
+        assert len(hub) == 0
+        hub.publish(b"c")
+
+    async def test_slow_subscriber_is_dropped_after_its_queue(self) -> None:
+        """A full queue closes the subscription; queued events are still delivered."""
+        hub = EventHub(queue_size=2)
+        with hub.subscribe() as slow, hub.subscribe() as fast:
+            for frame in (b"a", b"b"):
+                hub.publish(frame)
+                assert await fast.receive() == frame
+            hub.publish(b"c")
+            assert (len(hub), hub.dropped) == (1, 1)
+            assert [await slow.receive(), await slow.receive()] == [b"a", b"b"]
+            with pytest.raises(anyio.EndOfStream):
+                await slow.receive()
+            assert await fast.receive() == b"c"
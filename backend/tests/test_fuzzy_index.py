@@ -0,0 +1,121 @@
+"""Unit tests for the symmetric-delete fuzzy dictionary."""
+
+import random
+
+from app.services.fuzzy_index import (
+    MAX_TERM_LENGTH,
+    SymmetricDeleteIndex,
+    allowed_distance,
+    edit_distance,
+)
+
+
+def _reference_distance(a: str, b: str) -> int:
+    """Unbounded optimal-string-alignment distance, computed on the full matrix."""
+    rows = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        rows[i][0] = i
+    for j in range(len(b) + 1):
+        rows[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            rows[i][j] = min(
+                rows[i - 1][j] + 1,
+                rows[i][j - 1] + 1,
+                rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+class TestEditDistance:
+    """Unit tests for edit_distance()."""
+
+    def test_counts_transpositions_as_one_edit(self) -> None:
+        """Swapping adjacent letters costs one edit."""
+        assert edit_distance("python", "pyhton", 2) == 1
+        assert edit_distance("python", "python", 2) == 0
+        assert edit_distance("python", "pythons", 2) == 1
+
+    def test_matches_reference_up_to_limit(self) -> None:
+        """The bounded computation agrees with the full matrix, capped at limit + 1."""
+        rng = random.Random(8)  # noqa: S311
+        for _ in range(500):
+            a = "".join(rng.choices("abc", k=rng.randint(0, 7)))
+            b = "".join(rng.choices("abc", k=rng.randint(0, 7)))
+            limit = rng.randint(0, 2)
+            expected = min(_reference_distance(a, b), limit + 1)
+            assert edit_distance(a, b, limit) == expected, (a, b, limit)
+
+
+class TestSymmetricDeleteIndex:
+    """Unit tests for SymmetricDeleteIndex."""
+
+    def test_lookup_matches_brute_force(self) -> None:
+        """lookup() finds exactly the terms a full scan with edit_distance() finds."""
+        rng = random.Random(9)  # noqa: S311
+        vocabulary = {"".join(rng.choices("abcd", k=rng.randint(1, 8))) for _ in range(400)}
+        index = SymmetricDeleteIndex()
+        for term in vocabulary:
+            index.add(term)
+        assert len(index) == len(vocabulary)
+        for _ in range(200):
+            word = "".join(rng.choices("abcd", k=rng.randint(1, 8)))
+            for distance in (1, 2):
+                expected = {t for t in vocabulary if _reference_distance(word, t) <= distance}
+                assert set(index.lookup(word, distance)) == expected, (word, distance)
+
+    def test_lookup_orders_closest_first(self) -> None:
+        """Exact matches come before one-edit matches, which come before two-edit ones."""
+        index = SymmetricDeleteIndex()
+        for term in ("pythons", "python", "typhon", "pyhton"):
+            index.add(term)
+        assert index.lookup("python", 2) == ["python", "pyhton", "pythons", "typhon"]
+        assert index.lookup("python", 0) == ["python"]
+        assert index.lookup("missing", 0) == []
+
+    def test_allowed_distance_shrinks_for_short_words(self) -> None:
+        """Short words tolerate fewer edits than requested."""
+        assert allowed_distance("go", 2) == 0
+        assert allowed_distance("rust", 2) == 1
+        assert allowed_distance("python", 2) == 2
+        assert allowed_distance("python", 1) == 1
+
+    def test_overlong_terms_are_matched_exactly(self) -> None:
+        """Terms past MAX_TERM_LENGTH stay out of the dictionary but still match themselves."""
+        index = SymmetricDeleteIndex()
+        blob = "x" * 5000
+        index.add(blob)
+        index.add("y" * MAX_TERM_LENGTH)
+        assert len(index) == 1
+        assert index.lookup(blob, 2) == [blob]
+        assert index.lookup("y" * (MAX_TERM_LENGTH - 1), 1) == ["y" * MAX_TERM_LENGTH]
+
+    def test_load_restores_a_dump(self) -> None:
+        """A loaded dump answers like the original and keeps accepting new terms."""
+        rng = random.Random(5)  # noqa: S311
+        vocabulary = {"".join(rng.choices("abc", k=rng.randint(1, 6))) for _ in range(300)}
+        original = SymmetricDeleteIndex()
+        for term in vocabulary:
+            original.add(term)
+        loaded = SymmetricDeleteIndex()
+        loaded.load(original.dump())
+        assert len(loaded) == len(original)
+        for word in ("", "a", "abc", "cabba", "ccccc"):
+            assert loaded.lookup(word, 2) == original.lookup(word, 2), word
+        for index in (original, loaded):
+            index.add("abcabc")
+        assert loaded.lookup("abcab", 1) == original.lookup("abcab", 1)
+        empty = SymmetricDeleteIndex()
+        empty.load(SymmetricDeleteIndex().dump())
+        assert len(empty) == 0
+        assert empty.lookup("abc", 1) == []
+
+    def test_clear_drops_everything(self) -> None:
+        """clear() empties the dictionary."""
+        index = SymmetricDeleteIndex()
+        index.add("hello")
+        index.clear()
+        assert index.lookup("hello", 1) == []
+        assert len(index) == 0
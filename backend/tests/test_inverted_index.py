@@ -0,0 +1,104 @@
+"""Unit tests for the BM25 inverted index."""
+
+import pytest
+
+from app.services.inverted_index import InvertedIndex, tokenize
+
+
+class TestInvertedIndex:
+    """Unit tests for InvertedIndex."""
+
+    def test_tokenize_splits_on_non_word_characters(self) -> None:
+        """Tokens are runs of Unicode word characters."""
+        assert tokenize("héllo, wörld! 42-x_y") == ["héllo", "wörld", "42", "x_y"]
+
+    def test_title_hits_outrank_content_hits(self) -> None:
+        """A term in the title scores above the same term in the content."""
+        index = InvertedIndex()
+        index.add(0, "notes", "python")
+        index.add(1, "python", "notes")
+        assert index.top_k("python", 10) == [1, 0]
+
+    def test_rare_terms_weigh_more(self) -> None:
+        """Matching a rare query term beats matching a common one."""
+        index = InvertedIndex()
+        index.add(0, "a", "common")
+        index.add(1, "b", "common")
+        index.add(2, "c", "rare")
+        index.add(3, "d", "common")
+        assert index.top_k("common rare", 2) == [2, 0]
+
+    def test_ties_keep_insertion_order_and_respect_k(self) -> None:
+        """Equal scores come back in insertion order, truncated to k."""
+        index = InvertedIndex()
+        for position in range(5):
+            index.add(position, "same", "text")
+        assert index.top_k("same", 3) == [0, 1, 2]
+        assert index.top_k("missing", 3) == []
+        assert index.top_k("same", 0) == []
+
+    def test_phrase_requires_consecutive_words(self) -> None:
+        """phrase() matches adjacent words in order, never across the two fields."""
+        index = InvertedIndex()
+        index.add(0, "new york", "trip notes")
+        index.add(1, "york new", "new new york")
+        index.add(2, "visit new", "york city")
+        index.add(3, "other", "nothing")
+        assert index.phrase(["new", "york"]) == [0, 1]
+        assert index.phrase(["new", "york"], "title") == [0]
+        assert index.phrase(["new", "york"], "content") == [1]
+        assert index.phrase(["new", "new", "york"]) == [1]
+        assert index.phrase(["york", "trip"]) == []
+        assert index.phrase(["new", "missing"]) == []
+
+    def test_memory_grows_with_postings(self) -> None:
+        """memory_bytes() accounts for every posting and word offset added or loaded."""
+        index = InvertedIndex()
+        empty = index.memory_bytes()
+        for position in range(100):
+            index.add(position, f"title {position}", "some shared content words")
+        assert index.memory_bytes() > empty + 100 * 4 * 6
+        loaded = InvertedIndex()
+        loaded.load(index.dump(100))
+        assert abs(loaded.memory_bytes() - index.memory_bytes()) < 100 * 4
+        index.clear()
+        assert index.memory_bytes() < empty + 100 * 4
+
+    def test_load_restores_a_prefix_dump(self) -> None:
+        """A dump of the first notes loads into an index that answers like the original."""
+        notes = [
+            ("new york", "trip notes"),
+            ("york new", "new new york"),
+            ("python tips", "new python"),
+            ("later", "new york python"),
+        ]
+        original = InvertedIndex()
+        for position, (title, content) in enumerate(notes):
+            original.add(position, title, content)
+        prefix = InvertedIndex()
+        for position, (title, content) in enumerate(notes[:3]):
+            prefix.add(position, title, content)
+        loaded = InvertedIndex()
+        assert loaded.load(original.dump(3)) == 3
+        for query in ("new", "york python", "trip"):
+            assert loaded.top_k(query, 10) == prefix.top_k(query, 10)
+        assert loaded.phrase(["new", "york"]) == [0, 1]
+        assert loaded.postings("python", "title") == [2]
+        assert loaded.similar_terms("pyhton", 1) == ["python"]
+        assert loaded.top_k("later", 10) == []
+        loaded.add(3, *notes[3])
+        assert loaded.top_k("later", 10) == [3]
+
+    def test_add_rejects_out_of_order_position(self) -> None:
+        """Positions must be appended contiguously."""
+        with pytest.raises(ValueError, match="expected position 0"):
+            InvertedIndex().add(2, "a", "b")
+
+    def test_clear_drops_everything(self) -> None:
+        """clear() should empty the index."""
+        index = InvertedIndex()
+        index.add(0, "hello", "world")
+        index.clear()
+        assert index.top_k("hello", 5) == []
+        index.add(0, "hello", "again")
+        assert index.top_k("hello", 5) == [0]
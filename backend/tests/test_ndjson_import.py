@@ -0,0 +1,66 @@
+"""Unit tests for streaming NDJSON import."""
+
+from collections.abc import AsyncIterator, Sequence
+
+import pytest
+
+from app.models.note import NoteCreate
+from app.services.ndjson_import import ImportLineError, import_ndjson
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield ``data`` in pieces of ``size`` bytes, splitting lines arbitrarily."""
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class _Sink:
+    """Collects the batches passed to create_many."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    async def create_many(self, items: Sequence[NoteCreate]) -> list[NoteCreate]:
+        self.batches.append([item.title for item in items])
+        return list(items)
+
+
+def _lines(count: int) -> bytes:
+    return b"".join(b'{"title": "t%d", "content": "c"}\n' % i for i in range(count))
+
+
+class TestImportNdjson:
+    """Unit tests for import_ndjson()."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    async def test_imports_in_batches_across_chunk_boundaries(self, chunk_size: int) -> None:
+        """Lines split across chunks are reassembled and stored batch by batch."""
+        sink = _Sink()
+        data = _lines(5) + b"\n" + b'{"title": "last", "content": "c"}'
+        result = await import_ndjson(
+            _chunks(data, chunk_size), sink.create_many, batch_size=2, max_line_bytes=100
+        )
+        assert (result.imported, result.batches) == (6, 3)
+        assert sink.batches == [["t0", "t1"], ["t2", "t3"], ["t4", "last"]]
+
+    async def test_invalid_line_stops_after_storing_earlier_lines(self) -> None:
+        """The error names the line; every note before it is already stored."""
+        sink = _Sink()
+        data = _lines(3) + b'{"title": ""}\n' + _lines(2)
+        with pytest.raises(ImportLineError, match="line 4: title") as info:
+            await import_ndjson(
+                _chunks(data, 10), sink.create_many, batch_size=2, max_line_bytes=100
+            )
+        assert info.value.imported == 3
+        assert sink.batches == [["t0", "t1"], ["t2"]]
+
+    @pytest.mark.parametrize("chunk_size", [5, 4096])
+    async def test_rejects_overlong_lines(self, chunk_size: int) -> None:
+        """A line longer than the limit is rejected, whether or not it is complete."""
+        sink = _Sink()
+        data = _lines(1) + b'{"title": "t", "content": "' + b"x" * 200 + b'"}\n'
+        with pytest.raises(ImportLineError, match="line 2: longer than 100 bytes"):
+            await import_ndjson(
+                _chunks(data, chunk_size), sink.create_many, batch_size=10, max_line_bytes=100
+            )
+        assert sink.batches == [["t0"]]
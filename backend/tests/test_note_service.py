@@ -1,7 +1,12 @@
 """Unit tests for NoteService business logic."""
 
-from app.models.note import NoteCreate
+import json
+
+import pytest
+
+from app.models.note import NoteCreate, NoteResponse
 from app.services.note_service import NoteService
+from app.services.pagination import encode_cursor
 
 
 class TestNoteService:
@@ -51,6 +56,172 @@ class TestNoteService:
         assert len(service.list_all(query="python")) == 1
         assert len(service.list_all(query="PYTHON")) == 1
 
+    def test_get_returns_note_by_id(self) -> None:
+        """get() should return the note with the given id."""
+        service = NoteService()
+        service.create(NoteCreate(title="A", content="one"))
+        note = service.create(NoteCreate(title="B", content="two"))
+        assert service.get(note.id) == note
+
+    def test_get_unknown_id_returns_none(self) -> None:
+        """get() should return None for an unknown id."""
+        service = NoteService()
+        assert service.get("missing") is None
+
+    def test_list_page_walks_all_notes_in_order(self) -> None:
+        """Following next_cursor should visit every note exactly once, in order."""
+        service = NoteService()
+        created = [service.create(NoteCreate(title=f"N{i}", content="x")) for i in range(5)]
+        seen: list[NoteResponse] = []
+        cursor: str | None = None
+        while True:
+            page = service.list_page(limit=2, cursor=cursor)
+            seen.extend(page.notes)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert seen == created
+
+    def test_list_page_is_stable_under_concurrent_creates(self) -> None:
+        """Notes created between pages appear later without duplicating earlier ones."""
+        service = NoteService()
+        created = [service.create(NoteCreate(title=f"match {i}", content="x")) for i in range(3)]
+        page = service.list_page("match", limit=2)
+        assert page.notes == created[:2]
+        assert page.has_more
+        late = service.create(NoteCreate(title="match late", content="x"))
+        service.create(NoteCreate(title="other", content="x"))
+        page = service.list_page("match", limit=2, cursor=page.next_cursor)
+        assert page.notes == [created[2], late]
+        assert page.next_cursor is None
+
+    def test_list_page_exact_fill_has_no_next_page(self) -> None:
+        """A page that ends on the last match reports has_more=False."""
+        service = NoteService(search_engine="buffer")
+        for i in range(3):
+            service.create(NoteCreate(title=f"match {i}", content="x"))
+        page = service.list_page("match", limit=3)
+        assert len(page.notes) == 3
+        assert not page.has_more
+        assert page.next_cursor is None
+
+    def test_list_page_rejects_invalid_cursor(self) -> None:
+        """Malformed and out-of-range cursors should raise ValueError."""
+        service = NoteService()
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            service.list_page(limit=1, cursor="not-a-cursor")
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            service.list_page(limit=1, cursor=encode_cursor(2**63))
+
+    def test_list_all_json_matches_model_serialization(self) -> None:
+        """Cached JSON fragments should serialize exactly like the response model."""
+        service = NoteService()
+        notes = [
+            service.create(NoteCreate(title='Quote " é ✓', content="line\nbreak")),
+            service.create(NoteCreate(title="Plain", content="text")),
+        ]
+        expected = [note.model_dump(mode="json") for note in notes]
+        assert json.loads(service.list_all_json()) == expected
+        assert json.loads(service.list_all_json(query="plain")) == expected[1:]
+
+    def test_create_many_preserves_order(self) -> None:
+        """create_many() should store every note in the order given."""
+        service = NoteService()
+        created = service.create_many(NoteCreate(title=f"T{i}", content="x") for i in range(3))
+        assert [note.title for note in created] == ["T0", "T1", "T2"]
+        assert list(service.list_all()) == created
+        assert service.get(created[2].id) == created[2]
+
+    def test_count_matches_list_all(self) -> None:
+        """count() should agree with the length of list_all()."""
+        service = NoteService()
+        service.create(NoteCreate(title="Python", content="x"))
+        service.create(NoteCreate(title="Rust", content="python"))
+        service.create(NoteCreate(title="Go", content="x"))
+        assert service.count() == 3
+        assert service.count("python") == 2
+        assert service.count("zzz") == 0
+
+    def test_boolean_mode_lists_pages_and_counts(self) -> None:
+        """mode="boolean" applies the query language across every read method."""
+        service = NoteService()
+        service.create(NoteCreate(title="Python tips", content="comprehensions"))
+        service.create(NoteCreate(title="Rust", content="python bindings"))
+        service.create(NoteCreate(title="Pythonic", content="style"))
+        service.create(NoteCreate(title="Go", content="python vs rust"))
+        query = "python -title:rust"
+        assert [n.title for n in service.list_all(query, mode="boolean")] == ["Python tips", "Go"]
+        assert service.count(query, mode="boolean") == 2
+        assert service.count("python", mode="substring") == 4
+        page = service.list_page(query, limit=1, mode="boolean")
+        assert page.has_more
+        rest = service.list_page(query, limit=5, cursor=page.next_cursor, mode="boolean")
+        assert [json.loads(n)["title"] for n in rest.notes_json] == ["Go"]
+        with pytest.raises(ValueError, match="Unterminated"):
+            service.list_all('"python', mode="boolean")
+
+    def test_fuzzy_matches_misspelled_words(self) -> None:
+        """fuzzy tolerates typos in every query word and matches whole words only."""
+        service = NoteService()
+        service.create(NoteCreate(title="Python tips", content="list comprehensions"))
+        service.create(NoteCreate(title="Rust", content="ownership"))
+        service.create(NoteCreate(title="Pythonic", content="style"))
+        assert [n.title for n in service.list_all("pyhton", fuzzy=1)] == ["Python tips"]
+        assert [n.title for n in service.list_all("pyhton comprehnsions", fuzzy=2)] == [
+            "Python tips"
+        ]
+        assert service.count("pyhton ownership", fuzzy=2) == 0
+        page = service.list_page("title:pyhton OR ownrship", limit=5, mode="boolean", fuzzy=1)
+        assert len(page.notes_json) == 2
+        assert service.list_all("pyhton") == []
+
+    def test_suggest_completes_titles_and_title_words(self) -> None:
+        """suggest() should complete from titles created so far, case-insensitively."""
+        service = NoteService()
+        service.create(NoteCreate(title="Python Tips", content="x"))
+        service.create(NoteCreate(title="Rust", content="python"))
+        assert service.suggest("PY", limit=5) == ["python", "python tips"]
+        assert service.suggest("tip", limit=5) == ["tips"]
+        assert service.suggest("  ", limit=5) == []
+
+    def test_cached_searches_stay_current(self) -> None:
+        """Repeated searches are served from the cache and still see newer notes."""
+        service = NoteService()
+        service.create(NoteCreate(title="Python", content="x"))
+        for _ in range(3):
+            assert [note.title for note in service.list_all("PYTHON")] == ["Python"]
+        service.create(NoteCreate(title="Rust", content="python bindings"))
+        service.create(NoteCreate(title="Go", content="y"))
+        assert [note.title for note in service.list_all("python")] == ["Python", "Rust"]
+        assert service.count("python") == 2
+        page = service.list_page("python", limit=1)
+        assert page.next_cursor is not None
+        assert len(service.list_page("python", limit=1, cursor=page.next_cursor).notes_json) == 1
+        stats = service.stats()
+        assert (stats.cache_hits, stats.cache_misses) == (5, 2)
+
+    def test_iter_json_reads_a_snapshot(self) -> None:
+        """Notes created after iter_json() is called are not iterated."""
+        service = NoteService()
+        service.create(NoteCreate(title="Python", content="x"))
+        notes = service.iter_json("python")
+        everything = service.iter_json()
+        service.create(NoteCreate(title="Python 2", content="x"))
+        assert [json.loads(data)["title"] for data in notes] == ["Python"]
+        assert len(list(everything)) == 1
+        with pytest.raises(ValueError, match=r"(?i)query"):
+            service.iter_json("a OR", mode="boolean")
+
+    def test_list_ranked_matches_json(self) -> None:
+        """list_ranked_json() should serialize exactly the notes list_ranked() returns."""
+        service = NoteService()
+        service.create(NoteCreate(title="Rust", content="python bindings"))
+        service.create(NoteCreate(title="Python", content="x"))
+        ranked = service.list_ranked("python", limit=5)
+        assert [note.title for note in ranked] == ["Python", "Rust"]
+        expected = [note.model_dump(mode="json") for note in ranked]
+        assert json.loads(service.list_ranked_json("python", limit=5)) == expected
+
     def test_clear_removes_all_notes(self) -> None:
         """clear() should remove all notes."""
         service = NoteService()
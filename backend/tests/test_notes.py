@@ -1,7 +1,19 @@
 """Tests for the notes API endpoints."""
 
+import json
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import cast
+
+import pytest
 from httpx import AsyncClient
 
+from app.config import Settings
+from app.middleware.error_handler import BadRequestError
+from app.models.note import NoteCreate
+from app.routes.notes import MAX_BULK_ITEMS, note_events
+from app.services.note_service import NoteService
+from app.services.repository import StoreRepository
+
 
 class TestCreateNote:
     """POST /notes tests."""
@@ -97,3 +109,327 @@ class TestListNotes:
         response = await client.get("/notes")
         assert response.status_code == 200
         assert len(response.json()) == 2
+
+    async def test_list_notes_matches_single_note_serialization(self, client: AsyncClient) -> None:
+        """Listed notes should be byte-for-byte what GET /notes/{id} returns."""
+        created = await client.post("/notes", json={"title": "Ünïcode ✓", "content": 'a "q"'})
+        listed = await client.get("/notes")
+        single = await client.get(f"/notes/{created.json()['id']}")
+        assert listed.headers["content-type"] == "application/json"
+        assert listed.content == b"[" + single.content + b"]"
+
+    async def test_list_notes_paginates_with_cursor(self, client: AsyncClient) -> None:
+        """limit should page results and X-Next-Cursor should fetch the rest."""
+        for i in range(3):
+            await client.post("/notes", json={"title": f"Note {i}", "content": "body"})
+        first = await client.get("/notes", params={"limit": 2})
+        assert [n["title"] for n in first.json()] == ["Note 0", "Note 1"]
+        cursor = first.headers["x-next-cursor"]
+        second = await client.get("/notes", params={"limit": 2, "cursor": cursor})
+        assert [n["title"] for n in second.json()] == ["Note 2"]
+        assert "x-next-cursor" not in second.headers
+
+    async def test_search_notes_paginates(self, client: AsyncClient) -> None:
+        """Pagination should apply to search results too."""
+        for title in ("Python A", "Rust", "Python B"):
+            await client.post("/notes", json={"title": title, "content": "body"})
+        first = await client.get("/notes", params={"q": "python", "limit": 1})
+        assert [n["title"] for n in first.json()] == ["Python A"]
+        assert first.headers["x-has-more"] == "true"
+        second = await client.get(
+            "/notes",
+            params={"q": "python", "limit": 1, "cursor": first.headers["x-next-cursor"]},
+        )
+        assert [n["title"] for n in second.json()] == ["Python B"]
+        assert second.headers["x-has-more"] == "false"
+        assert "x-next-cursor" not in second.headers
+
+    async def test_list_notes_invalid_cursor_returns_400(self, client: AsyncClient) -> None:
+        """A malformed cursor should return a structured 400 error."""
+        response = await client.get("/notes", params={"cursor": "garbage"})
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "BAD_REQUEST"
+
+    async def test_ranked_search_orders_by_relevance(self, client: AsyncClient) -> None:
+        """mode=ranked should put title matches first and cap results at limit."""
+        for title, content in (
+            ("Groceries", "buy python book"),
+            ("Python tips", "use list comprehensions"),
+            ("Rust", "ownership"),
+            ("Reading", "python notes"),
+        ):
+            await client.post("/notes", json={"title": title, "content": content})
+        response = await client.get("/notes", params={"q": "Python", "mode": "ranked"})
+        assert response.status_code == 200
+        titles = [n["title"] for n in response.json()]
+        assert titles[0] == "Python tips"
+        assert sorted(titles) == ["Groceries", "Python tips", "Reading"]
+        limited = await client.get("/notes", params={"q": "python", "mode": "ranked", "limit": 1})
+        assert [n["title"] for n in limited.json()] == ["Python tips"]
+
+    async def test_ranked_search_requires_query(self, client: AsyncClient) -> None:
+        """mode=ranked without q, or with a cursor, should return 400."""
+        response = await client.get("/notes", params={"mode": "ranked"})
+        assert response.status_code == 400
+        response = await client.get("/notes", params={"q": "x", "mode": "ranked", "cursor": "c"})
+        assert response.status_code == 400
+
+    async def test_boolean_search_filters_and_paginates(self, client: AsyncClient) -> None:
+        """mode=boolean should parse q as a boolean query and keep insertion order."""
+        for title, content in (
+            ("Python tips", "comprehensions"),
+            ("Rust", "python bindings"),
+            ("Go", "python and rust"),
+        ):
+            await client.post("/notes", json={"title": title, "content": content})
+        params = {"q": 'python NOT title:rust OR "bindings"', "mode": "boolean"}
+        response = await client.get("/notes", params=params)
+        assert [n["title"] for n in response.json()] == ["Python tips", "Rust", "Go"]
+        page = await client.get("/notes", params={"q": "rust", "mode": "boolean", "limit": 1})
+        assert [n["title"] for n in page.json()] == ["Rust"]
+        assert page.headers["x-has-more"] == "true"
+
+    async def test_boolean_search_malformed_query_returns_400(self, client: AsyncClient) -> None:
+        """A query that does not parse or nests too deeply should return 400, paged or not."""
+        response = await client.get("/notes", params={"q": "(python", "mode": "boolean"})
+        assert response.status_code == 400
+        response = await client.get("/notes", params={"q": "OR", "mode": "boolean", "limit": 5})
+        assert response.status_code == 400
+        for query in ("(" * 1200 + "python" + ")" * 1200, "-" * 1200 + "python"):
+            response = await client.get("/notes", params={"q": query, "mode": "boolean"})
+            assert response.status_code == 400
+
+    async def test_fuzzy_search_tolerates_typos(self, client: AsyncClient) -> None:
+        """fuzzy=1 should match words one edit away; ranked search rejects it."""
+        await client.post("/notes", json={"title": "Python tips", "content": "x"})
+        await client.post("/notes", json={"title": "Rust", "content": "y"})
+        response = await client.get("/notes", params={"q": "pyhton", "fuzzy": 1})
+        assert [n["title"] for n in response.json()] == ["Python tips"]
+        response = await client.get("/notes", params={"q": "pyhton", "fuzzy": 3})
+        assert response.status_code == 422
+        response = await client.get("/notes", params={"q": "x", "mode": "ranked", "fuzzy": 1})
+        assert response.status_code == 400
+
+
+class TestSuggestNotes:
+    """GET /notes/suggest tests."""
+
+    async def test_suggest_returns_title_completions(self, client: AsyncClient) -> None:
+        """Completions come from titles and their words, capped at limit."""
+        for title in ("Python tips", "Pytest", "Rust"):
+            await client.post("/notes", json={"title": title, "content": "x"})
+        response = await client.get("/notes/suggest", params={"prefix": "Py"})
+        assert response.status_code == 200
+        assert response.json() == ["pytest", "python", "python tips"]
+        response = await client.get("/notes/suggest", params={"prefix": "py", "limit": 1})
+        assert response.json() == ["pytest"]
+
+    async def test_suggest_requires_prefix(self, client: AsyncClient) -> None:
+        """A missing or empty prefix is a validation error."""
+        assert (await client.get("/notes/suggest")).status_code == 422
+        assert (await client.get("/notes/suggest", params={"prefix": ""})).status_code == 422
+
+
+class TestNoteStats:
+    """GET /notes/stats tests."""
+
+    async def test_stats_reports_index_memory_per_note(self, client: AsyncClient) -> None:
+        """GET /notes/stats should report the word index size per note."""
+        empty = (await client.get("/notes/stats")).json()
+        assert empty["notes"] == 0
+        assert empty["index_bytes_per_note"] is None
+        for title in ("One", "Two"):
+            await client.post("/notes", json={"title": title, "content": "some words"})
+        stats = (await client.get("/notes/stats")).json()
+        assert stats["notes"] == 2
+        assert stats["index_bytes_per_note"] == stats["index_bytes"] / 2
+
+
+class TestGetNote:
+    """GET /notes/{id} tests."""
+
+    async def test_get_note_returns_note(self, client: AsyncClient) -> None:
+        """Should return the note with the given id."""
+        created = (await client.post("/notes", json={"title": "A", "content": "one"})).json()
+        response = await client.get(f"/notes/{created['id']}")
+        assert response.status_code == 200
+        assert response.json() == created
+
+    async def test_get_unknown_note_returns_404(self, client: AsyncClient) -> None:
+        """Unknown ids should return a structured 404 error."""
+        response = await client.get("/notes/missing")
+        assert response.status_code == 404
+        assert response.json()["error"]["code"] == "NOT_FOUND"
+
+
+class TestNoteChanges:
+    """GET /notes/changes tests."""
+
+    async def test_changes_since_listing(self, client: AsyncClient) -> None:
+        """Notes created after a listing are returned from its X-Change-Seq."""
+        await client.post("/notes", json={"title": "Old", "content": "x"})
+        listing = await client.get("/notes")
+        seq = int(listing.headers["X-Change-Seq"])
+
+        response = await client.get("/notes/changes", params={"since": seq})
+        assert response.json() == {"seq": seq, "resync": False, "notes": []}
+
+        await client.post("/notes", json={"title": "New", "content": "y"})
+        data = (await client.get("/notes/changes", params={"since": seq})).json()
+        assert data["resync"] is False
+        assert data["seq"] == seq + 1
+        assert [note["title"] for note in data["notes"]] == ["New"]
+
+    async def test_unknown_seq_requires_resync(self, client: AsyncClient) -> None:
+        """A sequence number the log does not cover asks the client to reload."""
+        response = await client.get("/notes/changes", params={"since": 0})
+        assert response.status_code == 200
+        assert response.json()["resync"] is True
+        assert response.json()["notes"] == []
+
+    async def test_since_is_required(self, client: AsyncClient) -> None:
+        """Omitting since is a validation error."""
+        response = await client.get("/notes/changes")
+        assert response.status_code == 422
+
+
+class TestNoteEvents:
+    """GET /notes/events tests."""
+
+    async def test_streams_created_notes(self) -> None:
+        """The stream replays from since, then carries new notes as they are created."""
+        repo = StoreRepository(NoteService())
+        await repo.create(NoteCreate(title="Before", content="x"))
+        seq = repo.change_seq
+        response = await note_events(service=repo, since=seq - 1, last_event_id=None)
+        assert response.media_type == "text/event-stream"
+        body = cast("AsyncIterator[bytes]", response.body_iterator)
+        assert b"Before" in await anext(body)
+        await repo.create(NoteCreate(title="After", content="y"))
+        frame = await anext(body)
+        assert frame.startswith(b"id: %d\nevent: note_created\n" % (seq + 1))
+        assert b"After" in frame
+        await cast("AsyncGenerator[bytes]", body).aclose()
+
+    async def test_idle_stream_sends_heartbeats(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A comment line is sent when nothing happens for the heartbeat interval."""
+        monkeypatch.setattr(
+            "app.routes.notes.get_settings", lambda: Settings(events_heartbeat_s=0.01)
+        )
+        response = await note_events(
+            service=StoreRepository(NoteService()), since=None, last_event_id=None
+        )
+        body = cast("AsyncGenerator[bytes]", response.body_iterator)
+        assert await anext(body) == b": heartbeat\n\n"
+        await body.aclose()
+
+    async def test_rejects_malformed_last_event_id(self) -> None:
+        """Last-Event-ID must be a sequence number we issued."""
+        with pytest.raises(BadRequestError):
+            await note_events(
+                service=StoreRepository(NoteService()), since=None, last_event_id="x"
+            )
+
+
+class TestCreateNotesBulk:
+    """POST /notes/bulk tests."""
+
+    async def test_creates_every_note_in_order(self, client: AsyncClient) -> None:
+        """All notes are created and returned in the order given."""
+        payload = [{"title": f"Note {i}", "content": "body"} for i in range(3)]
+        response = await client.post("/notes/bulk", json=payload)
+        assert response.status_code == 201
+        created = response.json()
+        assert [note["title"] for note in created] == ["Note 0", "Note 1", "Note 2"]
+        listed = (await client.get("/notes")).json()
+        assert [note["id"] for note in listed] == [note["id"] for note in created]
+
+    async def test_invalid_item_rejects_the_batch(self, client: AsyncClient) -> None:
+        """One invalid item fails the whole request, and the error gives its index."""
+        payload = [{"title": "Good", "content": "x"}, {"title": "", "content": "x"}]
+        response = await client.post("/notes/bulk", json=payload)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", 1, "title"]
+        assert (await client.get("/notes")).json() == []
+
+    async def test_rejects_empty_and_oversized_batches(self, client: AsyncClient) -> None:
+        """The array must hold between one and MAX_BULK_ITEMS notes."""
+        assert (await client.post("/notes/bulk", json=[])).status_code == 422
+        payload = [{"title": "t", "content": "c"}] * (MAX_BULK_ITEMS + 1)
+        assert (await client.post("/notes/bulk", json=payload)).status_code == 422
+
+
+class TestImportNotes:
+    """POST /notes/import tests."""
+
+    async def test_imports_streamed_ndjson(self, client: AsyncClient) -> None:
+        """Notes from a chunked NDJSON body are created in order."""
+
+        async def body() -> AsyncIterator[bytes]:
+            yield b'{"title": "One", "content": "x"}\n{"title": "Tw'
+            yield b'o", "content": "y"}\n'
+
+        response = await client.post(
+            "/notes/import", content=body(), headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"imported": 2, "batches": 1}
+        titles = [note["title"] for note in (await client.get("/notes")).json()]
+        assert titles == ["One", "Two"]
+
+    async def test_invalid_line_returns_400(self, client: AsyncClient) -> None:
+        """The error gives the failing line; earlier lines stay imported."""
+        body = b'{"title": "One", "content": "x"}\nnot json\n'
+        response = await client.post("/notes/import", content=body)
+        assert response.status_code == 400
+        assert "line 2" in response.json()["error"]["message"]
+        assert len((await client.get("/notes")).json()) == 1
+
+
+class TestExportNotes:
+    """GET /notes/export and streamed listing tests."""
+
+    async def test_exports_ndjson_and_json(self, client: AsyncClient) -> None:
+        """Both formats carry every note, in order, and honour q."""
+        notes = [{"title": f"N{i}", "content": "x"} for i in range(300)]
+        await client.post("/notes/bulk", json=notes)
+        await client.post("/notes", json={"title": "Other", "content": "y"})
+
+        response = await client.get("/notes/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.content.splitlines()
+        assert [json.loads(line)["title"] for line in lines] == [
+            *(f"N{i}" for i in range(300)),
+            "Other",
+        ]
+
+        response = await client.get("/notes/export", params={"format": "json", "q": "other"})
+        assert [note["title"] for note in response.json()] == ["Other"]
+        response = await client.get("/notes/export", params={"format": "json", "q": "zzz"})
+        assert response.json() == []
+
+    async def test_malformed_boolean_query_returns_400(self, client: AsyncClient) -> None:
+        """Query errors are reported before streaming starts."""
+        response = await client.get("/notes/export", params={"q": "(", "mode": "boolean"})
+        assert response.status_code == 400
+
+    async def test_streamed_listing_matches_buffered(self, client: AsyncClient) -> None:
+        """stream=true returns the same JSON array as a buffered listing."""
+        notes = [{"title": f"N{i}", "content": "x"} for i in range(5)]
+        await client.post("/notes/bulk", json=notes)
+        buffered = await client.get("/notes", params={"q": "n"})
+        streamed = await client.get("/notes", params={"q": "n", "stream": "true"})
+        assert streamed.json() == buffered.json()
+        assert streamed.headers["X-Change-Seq"] == buffered.headers["X-Change-Seq"]
+
+    async def test_stream_rejects_paging_and_ranking(self, client: AsyncClient) -> None:
+        """stream=true with limit, cursor, or mode=ranked returns 400 instead of buffering."""
+        for params in (
+            {"stream": "true", "limit": "5"},
+            {"stream": "true", "cursor": "garbage"},
+            {"stream": "true", "q": "n", "mode": "ranked"},
+        ):
+            response = await client.get("/notes", params=params)
+            assert response.status_code == 400, params
+            assert "stream=true" in response.json()["error"]["message"]
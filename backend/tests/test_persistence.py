@@ -0,0 +1,114 @@
+"""Tests for snapshots and NoteService persistence."""
+
+from pathlib import Path
+
+import pytest
+
+from app.models.note import NoteCreate, NoteResponse
+from app.services.note_service import NoteService
+from app.services.persistence import NotePersistence
+from app.services.search_engine import SearchEngineName
+from app.services.snapshot import SnapshotError, read_snapshot, write_snapshot
+
+
+def _create(service: NoteService, count: int, prefix: str = "T") -> list[NoteResponse]:
+    """Create ``count`` notes titled with ``prefix``."""
+    return [service.create(NoteCreate(title=f"{prefix}{i}", content="body")) for i in range(count)]
+
+
+def _reopen(
+    data_dir: Path, engine: SearchEngineName = "trigram"
+) -> tuple[NoteService, NotePersistence]:
+    """Start a fresh service from ``data_dir``."""
+    service = NoteService(search_engine=engine)
+    persistence = NotePersistence(data_dir, fsync="always")
+    persistence.open(service)
+    return service, persistence
+
+
+class TestSnapshot:
+    """Unit tests for the snapshot file format."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Notes read back from a snapshot equal the notes written."""
+        notes = [note.model_dump_json().encode() for note in _create(NoteService(), 3)]
+        notes.append('{"title": "Ünï ✓"}'.encode())
+        path = tmp_path / "snap.bin"
+        write_snapshot(path, notes, "trigram", b"index")
+        snapshot = read_snapshot(path)
+        assert snapshot.notes == notes
+        assert (snapshot.index_name, snapshot.index_data) == ("trigram", b"index")
+        assert snapshot.terms_data == b""
+        write_snapshot(path, notes, "trigram", b"index", b"terms")
+        assert read_snapshot(path).terms_data == b"terms"
+
+    def test_corrupt_snapshot_is_rejected(self, tmp_path: Path) -> None:
+        """A flipped byte fails the checksum."""
+        path = tmp_path / "snap.bin"
+        write_snapshot(path, [b"{}", b"{}"])
+        data = bytearray(path.read_bytes())
+        data[len(data) // 2] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with pytest.raises(SnapshotError, match="checksum"):
+            read_snapshot(path)
+
+
+class TestNotePersistence:
+    """NoteService durability through NotePersistence."""
+
+    def test_notes_survive_restart(self, tmp_path: Path) -> None:
+        """Notes created with persistence enabled are restored by a fresh service."""
+        service, persistence = _reopen(tmp_path)
+        created = _create(service, 3)
+        persistence.close(service)
+
+        restored, persistence = _reopen(tmp_path)
+        assert list(restored.list_all()) == created
+        assert restored.get(created[1].id) == created[1]
+        assert list(restored.list_all(query="t2")) == [created[2]]
+        persistence.close(restored)
+
+    @pytest.mark.parametrize(
+        ("written_by", "read_by"),
+        [("trigram", "trigram"), ("buffer", "buffer"), ("trigram", "buffer")],
+    )
+    def test_snapshot_compacts_log_and_restores_tail(
+        self, tmp_path: Path, written_by: SearchEngineName, read_by: SearchEngineName
+    ) -> None:
+        """Startup loads the snapshot and its index, then replays only later segments."""
+        service, persistence = _reopen(tmp_path, written_by)
+        before = _create(service, 3, "before")
+        snapshot = persistence.snapshot(service)
+        after = _create(service, 2, "after")
+        persistence.close(service)
+
+        assert snapshot is not None
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "snapshot-00000002.bin",
+            "wal-00000002.log",
+        ]
+        restored, persistence = _reopen(tmp_path, read_by)
+        assert list(restored.list_all()) == before + after
+        assert list(restored.list_all(query="after1")) == [after[1]]
+        assert list(restored.list_all(query="before")) == before
+        assert restored.list_ranked("before1 after1", limit=5) == [before[1], after[1]]
+        assert restored.suggest("after", limit=5) == ["after0", "after1"]
+        persistence.close(restored)
+
+    def test_bulk_create_survives_restart(self, tmp_path: Path) -> None:
+        """Notes logged as one batch are all restored."""
+        service, persistence = _reopen(tmp_path)
+        created = service.create_many(NoteCreate(title=f"B{i}", content="x") for i in range(4))
+        persistence.close(service)
+
+        restored, persistence = _reopen(tmp_path)
+        assert list(restored.list_all()) == created
+        persistence.close(restored)
+
+    def test_snapshot_skipped_without_new_writes(self, tmp_path: Path) -> None:
+        """No snapshot is written when nothing was logged since the last one."""
+        service, persistence = _reopen(tmp_path)
+        _create(service, 1)
+        assert persistence.snapshot(service) is not None
+        assert persistence.snapshot(service) is None
+        persistence.close(service)
@@ -0,0 +1,90 @@
+"""Unit tests for the boolean query parser."""
+
+import pytest
+
+from app.services.query_language import (
+    MAX_QUERY_DEPTH,
+    And,
+    Not,
+    Or,
+    Term,
+    all_words,
+    expand_terms,
+    parse_query,
+)
+
+
+class TestParseQuery:
+    """Unit tests for parse_query()."""
+
+    def test_juxtaposed_terms_are_anded(self) -> None:
+        """Adjacent terms and explicit AND both build an And node."""
+        expected = And((Term(("python",)), Term(("rust",))))
+        assert parse_query("Python rust") == expected
+        assert parse_query("python AND rust") == expected
+
+    def test_or_binds_looser_than_and(self) -> None:
+        """``a b OR c`` groups as ``(a b) OR c``; parentheses override it."""
+        a, b, c = Term(("a",)), Term(("b",)), Term(("c",))
+        assert parse_query("a b OR c") == Or((And((a, b)), c))
+        assert parse_query("a (b OR c)") == And((a, Or((b, c))))
+
+    def test_not_and_minus_negate(self) -> None:
+        """NOT and a leading minus negate the following clause."""
+        assert parse_query("a NOT b") == And((Term(("a",)), Not(Term(("b",)))))
+        assert parse_query("-(a OR b)") == Not(Or((Term(("a",)), Term(("b",)))))
+
+    def test_phrases_and_field_scopes(self) -> None:
+        """Quoted phrases and multi-word tokens become multi-token terms."""
+        assert parse_query('title:"Hello, World"') == Term(("hello", "world"), "title")
+        assert parse_query("content:e-mail") == Term(("e", "mail"), "content")
+        assert parse_query("author:x") == Term(("author", "x"))
+
+    def test_lowercase_operators_are_terms(self) -> None:
+        """Only upper-case words are operators."""
+        assert parse_query("this or that") == And(
+            (Term(("this",)), Term(("or",)), Term(("that",)))
+        )
+
+    def test_all_words_and_expand_terms(self) -> None:
+        """Plain text becomes an AND of words; expansion rewrites single-word terms."""
+        assert all_words("Rust, rust and Go") == And(
+            (Term(("rust",)), Term(("and",)), Term(("go",)))
+        )
+        with pytest.raises(ValueError, match="no searchable words"):
+            all_words("!!")
+        node = parse_query('title:pyhton -"new york" rust')
+        expanded = expand_terms(node, lambda word: {"pyhton": ["python", "typhon"]}.get(word, []))
+        assert expanded == And(
+            (
+                Or((Term(("python",), "title"), Term(("typhon",), "title"))),
+                Not(Term(("new", "york"))),
+                Term(("rust",)),
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "query", ["", "  ", '"open', "(a", "a)", "OR a", "a NOT", "title:", "++"]
+    )
+    def test_malformed_queries_raise(self, query: str) -> None:
+        """Empty, unbalanced, dangling, or wordless queries are rejected."""
+        with pytest.raises(ValueError, match=r"(?i)query"):
+            parse_query(query)
+
+    def test_nesting_is_capped(self) -> None:
+        """Parentheses and negations may nest MAX_QUERY_DEPTH deep, and no deeper."""
+        depth = MAX_QUERY_DEPTH
+        assert parse_query("(" * depth + "a" + ")" * depth) == Term(("a",))
+        node = parse_query("-" * depth + "a")
+        for _ in range(depth):
+            assert isinstance(node, Not)
+            node = node.child
+        assert isinstance(parse_query("-(" * (depth // 2) + "a" + ")" * (depth // 2)), Not)
+        for query in (
+            "(" * 1200 + "python" + ")" * 1200,
+            "-" * 1200 + "python",
+            "NOT " * (depth + 1) + "python",
+            "a (b " * (depth + 1) + ")" * (depth + 1),
+        ):
+            with pytest.raises(ValueError, match="deep"):
+                parse_query(query)
@@ -0,0 +1,79 @@
+"""Unit tests for boolean query evaluation."""
+
+import random
+
+from app.services.inverted_index import InvertedIndex
+from app.services.posting_lists import difference, gallop, intersect
+from app.services.query_language import parse_query
+from app.services.query_planner import QueryPlanner
+
+_DOCS = [
+    ("python tips", "use list comprehensions"),
+    ("rust", "python bindings for rust"),
+    ("groceries", "buy milk and python book"),
+    ("python rust", "comparison"),
+    ("reading list", "rust book"),
+]
+
+
+def _planner(docs: list[tuple[str, str]]) -> QueryPlanner:
+    """Index ``docs`` and return a planner over them."""
+    index = InvertedIndex()
+    for position, (title, content) in enumerate(docs):
+        index.add(position, title, content)
+    return QueryPlanner(index)
+
+
+class TestGalloping:
+    """Unit tests for the galloping search helpers."""
+
+    def test_gallop_matches_bisect(self) -> None:
+        """gallop() finds the same insertion point as a linear search from ``lo``."""
+        rng = random.Random(2)  # noqa: S311
+        values = sorted(rng.sample(range(1000), 200))
+        for _ in range(300):
+            target = rng.randrange(1100)
+            lo = rng.randrange(len(values) + 1)
+            expected = next(
+                (i for i in range(lo, len(values)) if values[i] >= target), len(values)
+            )
+            assert gallop(values, target, lo) == expected
+
+    def test_intersect_and_difference(self) -> None:
+        """Set operations over sorted sequences agree with Python sets."""
+        rng = random.Random(4)  # noqa: S311
+        for _ in range(50):
+            a = sorted(rng.sample(range(300), rng.randint(0, 40)))
+            b = sorted(rng.sample(range(300), rng.randint(0, 200)))
+            assert intersect(a, b) == sorted(set(a) & set(b))
+            assert difference(a, b) == sorted(set(a) - set(b))
+
+
+class TestQueryPlanner:
+    """Unit tests for QueryPlanner."""
+
+    def test_boolean_operators(self) -> None:
+        """AND, OR, and NOT combine whole-word matches."""
+        planner = _planner(_DOCS)
+        assert planner.evaluate(parse_query("python rust")) == [1, 3]
+        assert planner.evaluate(parse_query("milk OR comparison")) == [2, 3]
+        assert planner.evaluate(parse_query("python -rust")) == [0, 2]
+        assert planner.evaluate(parse_query("NOT python")) == [4]
+        assert planner.evaluate(parse_query("pyth")) == []
+
+    def test_fields_and_phrases(self) -> None:
+        """Field scopes restrict terms; phrases require adjacent words."""
+        planner = _planner(_DOCS)
+        assert planner.evaluate(parse_query("title:python")) == [0, 3]
+        assert planner.evaluate(parse_query("content:rust")) == [1, 4]
+        assert planner.evaluate(parse_query('"python book"')) == [2]
+        assert planner.evaluate(parse_query('"book python"')) == []
+
+    def test_estimates_order_and_clauses(self) -> None:
+        """Estimates come from document frequencies and drive AND evaluation."""
+        planner = _planner(_DOCS)
+        assert planner.estimate(parse_query("python")) == 4
+        assert planner.estimate(parse_query("python milk")) == 1
+        assert planner.estimate(parse_query("milk OR rust")) == 4
+        assert planner.estimate(parse_query("missing python")) == 0
+        assert planner.evaluate(parse_query("missing python")) == []
@@ -0,0 +1,251 @@
+"""Tests for the async repository adapter."""
+
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+import anyio
+import pytest
+from anyio import CapacityLimiter
+
+from app.models.note import NoteCreate, NoteResponse
+from app.services.note_service import NoteService
+from app.services.query_language import MatchMode
+from app.services.repository import SharedStoreRepository, StoreRepository
+from app.services.sqlite_store import SqliteNoteService
+
+
+class _SlowStore(NoteService):
+    """NoteService whose reads block like a disk-backed store."""
+
+    def __init__(self, delay_s: float) -> None:
+        super().__init__()
+        self.delay_s = delay_s
+        self.threads: set[int] = set()
+
+    def list_all(
+        self, query: str | None = None, *, mode: MatchMode = "substring", fuzzy: int = 0
+    ) -> Sequence[NoteResponse]:
+        self.threads.add(threading.get_ident())
+        notes = super().list_all(query, mode=mode, fuzzy=fuzzy)
+        time.sleep(self.delay_s)
+        return notes
+
+
+@pytest.fixture
+def stores(tmp_path: Path) -> Iterator[tuple[SqliteNoteService, SqliteNoteService]]:
+    """Provide two stores on one database file, as two worker processes would open it."""
+    first = SqliteNoteService(tmp_path / "notes.db", readers=1)
+    second = SqliteNoteService(tmp_path / "notes.db", readers=1)
+    yield first, second
+    first.close()
+    second.close()
+
+
+class TestStoreRepository:
+    """Unit tests for StoreRepository."""
+
+    async def test_inline_delegates_to_store(self) -> None:
+        """Without a limiter every call goes straight to the store."""
+        repo = StoreRepository(NoteService())
+        note = await repo.create(NoteCreate(title="Python", content="x"))
+        more = await repo.create_many([NoteCreate(title="Rust", content="python")])
+        assert await repo.get(note.id) == note
+        assert list(await repo.list_all("python")) == [note, *more]
+        assert await repo.count() == 2
+        page = await repo.list_page("python", limit=1)
+        assert page.notes == [note]
+        assert page.next_cursor is not None
+
+    async def test_blocking_calls_run_off_the_event_loop(self) -> None:
+        """With a limiter, a blocking store call leaves the loop free to run."""
+        store = _SlowStore(delay_s=0.2)
+        repo = StoreRepository(store, limiter=CapacityLimiter(2))
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await anyio.sleep(0.01)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(tick)
+            await repo.list_all()
+            tg.cancel_scope.cancel()
+        assert threading.get_ident() not in store.threads
+        assert ticks >= 5
+
+    async def test_offloads_only_expensive_searches(self) -> None:
+        """Inline stores move a search to a worker thread once it reaches the cost cap."""
+        store = _SlowStore(delay_s=0)
+        store.create(NoteCreate(title="Python", content="x"))
+        repo = StoreRepository(
+            store, search_limiter=CapacityLimiter(1), offload_bytes=store.search_cost() + 1
+        )
+        await repo.list_all("python")
+        assert store.threads == {threading.get_ident()}
+
+        store.create(NoteCreate(title="Rust", content="x"))
+        store.threads.clear()
+        await repo.list_all("python")
+        assert threading.get_ident() not in store.threads
+
+    async def test_identical_offloaded_searches_are_coalesced(self) -> None:
+        """A burst of the same search runs one scan; a different search runs its own."""
+        store = _SlowStore(delay_s=0.1)
+        store.create(NoteCreate(title="Python", content="x"))
+        repo = StoreRepository(store, limiter=CapacityLimiter(4))
+        results: list[Sequence[NoteResponse]] = []
+
+        async def search(query: str) -> None:
+            results.append(await repo.list_all(query))
+
+        async with anyio.create_task_group() as tg:
+            for query in ("python", "python", "python", "rust"):
+                tg.start_soon(search, query)
+        assert sorted(len(result) for result in results) == [0, 1, 1, 1]
+        assert (await repo.stats()).coalesced_searches == 2
+
+    async def test_search_after_create_sees_the_new_note(self) -> None:
+        """A search issued after a create never joins a scan that started before it."""
+        store = _SlowStore(delay_s=0.2)
+        repo = StoreRepository(store, limiter=CapacityLimiter(4))
+        results: dict[str, Sequence[NoteResponse]] = {}
+        created: list[NoteResponse] = []
+
+        async def search(name: str) -> None:
+            results[name] = await repo.list_all("python")
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(search, "before")
+            await anyio.sleep(0.05)
+            created.append(await repo.create(NoteCreate(title="Python", content="x")))
+            tg.start_soon(search, "after")
+        assert results == {"before": [], "after": created}
+        assert (await repo.stats()).coalesced_searches == 0
+
+    async def test_subscribe_replays_backlog_then_streams(self) -> None:
+        """Subscribers get changes after since, then live ones; stale since means resync."""
+        repo = StoreRepository(NoteService(), change_log_size=2)
+        first = await repo.create(NoteCreate(title="First", content="x"))
+        seq = repo.change_seq
+        await repo.create(NoteCreate(title="Second", content="x"))
+        async with repo.subscribe(seq - 1) as subscription:
+            assert [frame.split(b"\n")[0] for frame in subscription.backlog] == [
+                b"id: %d" % seq,
+                b"id: %d" % (seq + 1),
+            ]
+            assert first.id.encode() in subscription.backlog[0]
+            await repo.create(NoteCreate(title="Third", content="x"))
+            assert b"Third" in await subscription.events.receive()
+
+        async with repo.subscribe(seq - 1) as subscription:
+            assert subscription.backlog == [
+                b'id: %d\nevent: resync\ndata: {"seq":%d}\n\n' % (seq + 2, seq + 2)
+            ]
+        async with repo.subscribe() as subscription:
+            assert subscription.backlog == []
+
+    async def test_large_batches_publish_one_resync(self) -> None:
+        """A batch bigger than subscriber queues is announced as a single resync event."""
+        repo = StoreRepository(NoteService(), event_queue_size=2)
+        async with repo.subscribe() as subscription:
+            await repo.create_many([NoteCreate(title=f"n{i}", content="x") for i in range(3)])
+            frame = await subscription.events.receive()
+            assert b"event: resync" in frame
+            assert b"id: %d" % repo.change_seq in frame
+            assert subscription.events.statistics().current_buffer_used == 0
+
+    async def test_held_events_become_one_resync(self) -> None:
+        """Creates inside hold_events() are logged at once and announced by one resync."""
+        repo = StoreRepository(NoteService(), event_queue_size=2)
+        seq = repo.change_seq
+        async with repo.subscribe() as subscription:
+            async with repo.hold_events():
+                for _ in range(3):
+                    await repo.create_many([NoteCreate(title="n", content="x")] * 3)
+                await repo.create(NoteCreate(title="Single", content="x"))
+                assert len((await repo.changes(seq)).notes) == 10
+                assert subscription.events.statistics().current_buffer_used == 0
+            assert await subscription.events.receive() == (
+                b'id: %d\nevent: resync\ndata: {"seq":%d}\n\n' % (seq + 10, seq + 10)
+            )
+            async with repo.hold_events():
+                pass
+            with pytest.raises(ValueError, match="bad line"):
+                async with repo.hold_events():
+                    await repo.create(NoteCreate(title="Partial", content="x"))
+                    raise ValueError("bad line")
+            assert b"id: %d" % (seq + 11) in await subscription.events.receive()
+            assert subscription.events.statistics().current_buffer_used == 0
+
+
+class TestSharedStoreRepository:
+    """Unit tests for SharedStoreRepository."""
+
+    async def test_changes_include_other_processes_creates(
+        self, stores: tuple[SqliteNoteService, SqliteNoteService]
+    ) -> None:
+        """Either repository reports the creates made through the other one."""
+        first, second = (
+            SharedStoreRepository(store, limiter=CapacityLimiter(1), change_log_size=2)
+            for store in stores
+        )
+        seq = first.change_seq
+        note = await first.create(NoteCreate(title="First", content="x"))
+        changes = await second.changes(seq)
+        assert (changes.resync, changes.notes) == (False, [note])
+        assert changes.seq == first.change_seq == seq + 1
+
+        await second.create_many([NoteCreate(title=f"n{i}", content="x") for i in range(2)])
+        assert (await first.changes(changes.seq)).notes[0].title == "n0"
+        assert (await first.changes(seq)).resync
+        assert (await first.changes(changes.seq + 10)).resync
+
+    async def test_subscribers_poll_for_other_processes_creates(
+        self, stores: tuple[SqliteNoteService, SqliteNoteService]
+    ) -> None:
+        """A subscriber receives creates made elsewhere once it polls while idle."""
+        first, second = (
+            SharedStoreRepository(store, limiter=CapacityLimiter(1), poll_s=0.05)
+            for store in stores
+        )
+        seq = first.change_seq
+        await second.create(NoteCreate(title="Before", content="x"))
+        async with first.subscribe(seq) as subscription:
+            assert [b"Before" in frame for frame in subscription.backlog] == [True]
+            await second.create(NoteCreate(title="Elsewhere", content="x"))
+            await first.create(NoteCreate(title="Here", content="x"))
+            with anyio.fail_after(5):
+                assert b"Elsewhere" in await subscription.receive()
+                assert b"Here" in await subscription.receive()
+                await second.create(NoteCreate(title="Later", content="x"))
+                assert b"id: %d" % (seq + 4) in await subscription.receive()
+        assert first.change_seq == seq + 4
+
+        async with first.subscribe(seq + 9) as subscription:
+            assert subscription.backlog == [
+                b'id: %d\nevent: resync\ndata: {"seq":%d}\n\n' % (seq + 4, seq + 4)
+            ]
+
+    async def test_held_events_include_other_processes_creates(
+        self, stores: tuple[SqliteNoteService, SqliteNoteService]
+    ) -> None:
+        """Polls during hold_events() publish nothing; its end announces one resync."""
+        first, second = (
+            SharedStoreRepository(store, limiter=CapacityLimiter(1), poll_s=0.02)
+            for store in stores
+        )
+        async with first.subscribe() as subscription:
+            async with first.hold_events():
+                await first.create_many([NoteCreate(title="n", content="x")] * 3)
+                await second.create(NoteCreate(title="Elsewhere", content="x"))
+                with anyio.move_on_after(0.2) as idle:
+                    await subscription.receive()
+                assert idle.cancelled_caught
+            frame = await subscription.events.receive()
+            assert b"event: resync" in frame
+            assert b"id: %d" % first.change_seq in frame
+            assert subscription.events.statistics().current_buffer_used == 0
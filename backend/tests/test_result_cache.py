@@ -0,0 +1,70 @@
+"""Unit tests for the search result cache."""
+
+from app.services.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Unit tests for ResultCache."""
+
+    def test_admits_on_second_miss(self) -> None:
+        """A query is only cached once it has missed twice; hits and misses are counted."""
+        cache = ResultCache()
+        assert cache.lookup("py") is None
+        cache.store("py", [1, 3], cache.version)
+        assert cache.lookup("py") is None
+        cache.store("py", [1, 3], cache.version)
+        assert list(cache.lookup("py") or ()) == [1, 3]
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_note_added_patches_matching_entries(self) -> None:
+        """A new note is appended to the queries it matches, once, and bumps the version."""
+        cache = ResultCache()
+        for _ in range(2):
+            cache.store("py", [0], cache.version)
+            cache.store("rust", [], cache.version)
+        cache.note_added(1, "python", "x")
+        cache.note_added(2, "go", "trusty")
+        cache.note_added(2, "go", "trusty")
+        assert list(cache.lookup("py") or ()) == [0, 1]
+        assert list(cache.lookup("rust") or ()) == [2]
+        assert cache.version == 3
+
+    def test_store_drops_stale_results(self) -> None:
+        """A result computed before a create landed is not cached."""
+        cache = ResultCache()
+        cache.store("py", [], cache.version)
+        version = cache.version
+        cache.note_added(0, "python", "")
+        cache.store("py", [], version)
+        assert cache.lookup("py") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Entry and byte bounds both evict the least recently used query first."""
+        cache = ResultCache(max_entries=2)
+        for key in ("a", "b", "a", "b"):
+            cache.store(key, [0], cache.version)
+        cache.lookup("a")
+        for _ in range(2):
+            cache.store("c", [0], cache.version)
+        assert cache.lookup("b") is None
+        assert len(cache) == 2
+
+        small = ResultCache(max_bytes=200)
+        for _ in range(2):
+            small.store("a", range(10), small.version)
+        before = small.memory_bytes
+        for position in range(10, 30):
+            small.note_added(position, "a", "")
+        assert small.memory_bytes <= 200 < before + 20 * 4
+        assert small.lookup("a") is None
+
+    def test_clear_invalidates_entries_and_searches(self) -> None:
+        """clear() drops entries and results computed before it."""
+        cache = ResultCache()
+        for _ in range(2):
+            cache.store("py", [0], cache.version)
+        version = cache.version
+        cache.clear()
+        cache.store("py", [0], version)
+        assert cache.lookup("py") is None
+        assert cache.memory_bytes == 0
@@ -0,0 +1,88 @@
+"""Unit tests for the sharded process-pool scan engine."""
+
+import random
+from collections.abc import Iterator
+
+import pytest
+
+from app.services.corpus_buffer import CorpusBuffer
+from app.services.sharded_scan import ShardedScan
+
+
+@pytest.fixture
+def engine() -> Iterator[ShardedScan]:
+    """Provide an engine with tiny shards so that small tests cross shard boundaries."""
+    scan = ShardedScan(workers=2, shard_notes=4)
+    yield scan
+    scan.clear()
+
+
+def _random_fields(rng: random.Random, count: int) -> list[tuple[str, str]]:
+    """Generate ``count`` normalized (title, content) pairs."""
+    alphabet = "abc iß é"
+    return [
+        ("".join(rng.choices(alphabet, k=6)), "".join(rng.choices(alphabet, k=25)))
+        for _ in range(count)
+    ]
+
+
+class TestShardedScan:
+    """Unit tests for ShardedScan."""
+
+    def test_candidates_match_corpus_buffer(self, engine: ShardedScan) -> None:
+        """Hits merged across shards equal a single-buffer scan, in position order."""
+        rng = random.Random(3)  # noqa: S311
+        reference = CorpusBuffer()
+        for position, fields in enumerate(_random_fields(rng, 30)):
+            engine.add(position, fields)
+            reference.add(position, fields)
+        for _ in range(40):
+            query = "".join(rng.choices("abc iß é", k=rng.randint(1, 4)))
+            assert list(engine.candidates(query)) == list(reference.candidates(query)), query
+
+    def test_iter_candidates_resumes_from_start(self, engine: ShardedScan) -> None:
+        """iter_candidates() starts mid-shard and can be abandoned part way."""
+        for position in range(11):
+            engine.add(position, ("python" if position % 2 else "rust", "body"))
+        assert list(engine.iter_candidates("python", 2)) == [3, 5, 7, 9]
+        assert list(engine.iter_candidates("python", 6)) == [7, 9]
+        matches = engine.iter_candidates("python")
+        assert next(matches) == 1
+        matches.close()
+
+    def test_empty_query_returns_every_position(self, engine: ShardedScan) -> None:
+        """An empty query matches every note, sealed or not."""
+        for position in range(6):
+            engine.add(position, ("a", "b"))
+        assert list(engine.candidates("")) == list(range(6))
+
+    def test_dump_and_load_round_trip(self, engine: ShardedScan) -> None:
+        """A dump restricted to a prefix loads back into an equivalent engine."""
+        rng = random.Random(5)  # noqa: S311
+        fields = _random_fields(rng, 11)
+        reference = CorpusBuffer()
+        for position, pair in enumerate(fields):
+            engine.add(position, pair)
+            if position < 9:
+                reference.add(position, pair)
+        data = engine.dump(9)
+        assert data == reference.dump(9)
+
+        restored = ShardedScan(workers=1, shard_notes=4)
+        try:
+            restored.load(data, 9)
+            restored.add(9, fields[9])
+            reference.add(9, fields[9])
+            for query in ("a", "bc", "ß", "é a"):
+                assert list(restored.candidates(query)) == list(reference.candidates(query))
+        finally:
+            restored.clear()
+
+    def test_clear_drops_everything(self, engine: ShardedScan) -> None:
+        """clear() empties sealed shards and the tail."""
+        for position in range(5):
+            engine.add(position, ("hello", "world"))
+        engine.clear()
+        assert list(engine.candidates("hello")) == []
+        engine.add(0, ("hello", "again"))
+        assert list(engine.candidates("hello")) == [0]
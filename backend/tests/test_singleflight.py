@@ -0,0 +1,80 @@
+"""Unit tests for async call coalescing."""
+
+import anyio
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Unit tests for SingleFlight."""
+
+    async def test_concurrent_calls_share_one_run(self) -> None:
+        """Callers overlapping an in-flight call get its result without running again."""
+        flights = SingleFlight[str, int]()
+        runs = 0
+        results: list[int] = []
+
+        async def compute() -> int:
+            nonlocal runs
+            runs += 1
+            await anyio.sleep(0.05)
+            return runs
+
+        async def call() -> None:
+            results.append(await flights.do("q", compute))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(5):
+                tg.start_soon(call)
+        assert results == [1] * 5
+        assert (flights.leaders, flights.coalesced) == (1, 4)
+
+        assert await flights.do("q", compute) == 2
+
+    async def test_errors_reach_every_caller(self) -> None:
+        """An exception from the shared call is raised to each waiting caller."""
+        flights = SingleFlight[str, int]()
+        failures = 0
+
+        async def fail() -> int:
+            await anyio.sleep(0.02)
+            raise ValueError("bad query")
+
+        async def call() -> None:
+            nonlocal failures
+            with pytest.raises(ValueError, match="bad query"):
+                await flights.do("q", fail)
+            failures += 1
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(call)
+        assert failures == 3
+
+    async def test_cancelled_leader_still_serves_waiters(self) -> None:
+        """Cancelling the caller that started the run does not fail the others."""
+        flights = SingleFlight[str, str]()
+        result: list[str] = []
+
+        async def compute() -> str:
+            await anyio.sleep(0.05)
+            return "done"
+
+        leader_scope = anyio.CancelScope()
+
+        async def leader() -> None:
+            with leader_scope:
+                await flights.do("q", compute)
+
+        async def follower() -> None:
+            result.append(await flights.do("q", compute))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(leader)
+            await anyio.sleep(0.01)
+            tg.start_soon(follower)
+            await anyio.sleep(0.01)
+            leader_scope.cancel()
+        assert result == ["done"]
+        assert flights.coalesced == 1
@@ -0,0 +1,245 @@
+"""Unit tests for the SQLite-backed note store."""
+
+import random
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from app.models.note import NoteCreate
+from app.services.note_service import NoteService
+from app.services.pagination import encode_cursor
+from app.services.query_language import MatchMode
+from app.services.sqlite_store import SqliteNoteService
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[SqliteNoteService]:
+    """Provide a store backed by a fresh database file."""
+    service = SqliteNoteService(tmp_path / "notes.db", readers=2)
+    yield service
+    service.close()
+
+
+class TestSqliteNoteService:
+    """Unit tests for SqliteNoteService."""
+
+    def test_create_and_get(self, store: SqliteNoteService) -> None:
+        """A created note can be fetched back by id."""
+        note = store.create(NoteCreate(title="Test", content="Body"))
+        assert store.get(note.id) == note
+        assert store.get("missing") is None
+
+    def test_list_all_preserves_insertion_order(self, store: SqliteNoteService) -> None:
+        """list_all() returns notes in creation order."""
+        notes = [store.create(NoteCreate(title=f"T{i}", content="body")) for i in range(5)]
+        assert list(store.list_all()) == notes
+
+    def test_list_all_json_matches_list_all(self, store: SqliteNoteService) -> None:
+        """The cached JSON body decodes to the same notes as list_all()."""
+        store.create(NoteCreate(title="Python", content="body"))
+        store.create(NoteCreate(title="Rust", content="body"))
+        body = store.list_all_json(query="pyt")
+        assert body == b"[" + store.list_all(query="pyt")[0].model_dump_json().encode() + b"]"
+
+    def test_search_matches_linear_scan(self, store: SqliteNoteService) -> None:
+        """Search returns exactly what a naive lower-cased substring scan returns."""
+        rng = random.Random(11)  # noqa: S311
+        alphabet = 'abcAB İß é"'
+        notes = [
+            store.create(
+                NoteCreate(
+                    title="".join(rng.choices(alphabet, k=8)),
+                    content="".join(rng.choices(alphabet, k=30)),
+                )
+            )
+            for _ in range(200)
+        ]
+        for _ in range(100):
+            query = "".join(rng.choices(alphabet, k=rng.randint(1, 5)))
+            q = query.lower()
+            expected = [n for n in notes if q in n.title.lower() or q in n.content.lower()]
+            assert list(store.list_all(query=query)) == expected, query
+
+    def test_nul_in_query_matches_memory_service(self, store: SqliteNoteService) -> None:
+        """Queries containing NUL, which FTS5 cannot quote, fall back to a scan."""
+        memory = NoteService()
+        for data in (
+            NoteCreate(title="abc\x00def", content="x"),
+            NoteCreate(title="abc", content="c\x00d"),
+        ):
+            store.create(data)
+            memory.create(data)
+        for query in ("abc\x00", "c\x00d", "\x00", "\x00\x00\x00"):
+            expected = [note.title for note in memory.list_all(query)]
+            assert [note.title for note in store.list_all(query)] == expected, query
+            assert store.count(query) == len(expected)
+
+    def test_create_many_and_count(self, store: SqliteNoteService) -> None:
+        """create_many() inserts every note; count() agrees with list_all()."""
+        created = store.create_many(
+            [NoteCreate(title="Python", content="x"), NoteCreate(title="Rust", content="python")]
+        )
+        assert list(store.list_all()) == created
+        assert store.count() == 2
+        assert store.count("python") == 2
+        assert store.count("rust") == 1
+
+    def test_boolean_mode_matches_memory_service(self, store: SqliteNoteService) -> None:
+        """Boolean queries, nested negations included, select the same notes as the planner."""
+        rng = random.Random(13)  # noqa: S311
+        words = ["alpha", "beta", "gamma", "delta"]
+        memory = NoteService()
+        for _ in range(120):
+            data = NoteCreate(
+                title=" ".join(rng.choices(words, k=2)), content=" ".join(rng.choices(words, k=5))
+            )
+            store.create(data)
+            memory.create(data)
+        for query in (
+            "alpha beta",
+            "alpha OR -beta gamma",
+            'title:alpha content:"beta gamma"',
+            "(alpha OR gamma) NOT delta",
+            "NOT alpha",
+            "-alpha -beta",
+            "alpha OR NOT beta",
+            "gamma OR (NOT delta)",
+            "(-alpha -beta) gamma",
+            "-(alpha -beta) OR (delta -(gamma OR -alpha))",
+            "--alpha",
+            "-" * 32 + "beta",
+        ):
+            expected = [(n.title, n.content) for n in memory.list_all(query, mode="boolean")]
+            actual = [(n.title, n.content) for n in store.list_all(query, mode="boolean")]
+            assert actual == expected, query
+            assert store.count(query, mode="boolean") == len(expected), query
+
+    def test_list_ranked_boosts_titles(self, store: SqliteNoteService) -> None:
+        """Ranked search scores title hits above content hits and honours limit."""
+        body = store.create(NoteCreate(title="Groceries", content="buy a python book"))
+        title = store.create(NoteCreate(title="Python tips", content="comprehensions"))
+        store.create(NoteCreate(title="Rust", content="ownership"))
+        assert store.list_ranked("PYTHON", limit=10) == [title, body]
+        assert store.list_ranked("python", limit=1) == [title]
+        assert store.list_ranked("...", limit=10) == []
+
+    def test_list_page_walks_all_matches(self, store: SqliteNoteService) -> None:
+        """Following cursors visits every matching note exactly once."""
+        notes = [
+            store.create(NoteCreate(title=f"{'even' if i % 2 == 0 else 'odd'} {i}", content="x"))
+            for i in range(25)
+        ]
+        seen: list[str] = []
+        cursor: str | None = None
+        while True:
+            page = store.list_page("even", limit=4, cursor=cursor)
+            seen += [note.id for note in page.notes]
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert seen == [note.id for note in notes[::2]]
+
+    def test_list_page_rejects_bad_cursor(self, store: SqliteNoteService) -> None:
+        """A malformed cursor, or one past SQLite's integer range, raises ValueError."""
+        store.create(NoteCreate(title="Python", content="x"))
+        for cursor in ("garbage", encode_cursor(2**63), encode_cursor(10**30 - 1)):
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                store.list_page(limit=5, cursor=cursor)
+        assert store.list_page(limit=5, cursor=encode_cursor(2**63 - 1)).notes == []
+
+    def test_notes_survive_reopen(self, tmp_path: Path) -> None:
+        """Committed notes are visible to a new store on the same file."""
+        path = tmp_path / "notes.db"
+        first = SqliteNoteService(path, readers=1)
+        note = first.create(NoteCreate(title="Durable", content="body"))
+        first.close()
+
+        second = SqliteNoteService(path, readers=1)
+        try:
+            assert second.get(note.id) == note
+            assert list(second.list_all(query="durable")) == [note]
+        finally:
+            second.close()
+
+    def test_fuzzy_learns_words_created_after_first_use(self, store: SqliteNoteService) -> None:
+        """The fuzzy dictionary loads from the word index and tracks later creates."""
+        tips = store.create(NoteCreate(title="Python tips", content="comprehensions"))
+        assert list(store.list_all("pyhton", fuzzy=1)) == [tips]
+        rust = store.create(NoteCreate(title="Rust", content="ownership"))
+        assert list(store.list_all("ownrship", fuzzy=1)) == [rust]
+        assert list(store.list_all("pyhton -tips", mode="boolean", fuzzy=1)) == []
+
+    def test_suggest_completes_titles_and_title_words(self, store: SqliteNoteService) -> None:
+        """Suggestions are the titles and title words starting with the prefix."""
+        store.create(NoteCreate(title="Python Tips", content="x"))
+        store.create(NoteCreate(title="Pytest", content="y"))
+        assert store.suggest("py", limit=10) == ["pytest", "python", "python tips"]
+        assert store.suggest("python ", limit=10) == ["python tips"]
+        assert store.suggest("py", limit=1) == ["pytest"]
+
+    def test_iter_json_reads_a_snapshot(self, store: SqliteNoteService) -> None:
+        """Notes created mid-iteration are excluded and the read connection is released."""
+        store.create_many(NoteCreate(title=f"Python {i}", content="x") for i in range(600))
+        notes = store.iter_json("python")
+        first = next(notes)
+        store.create(NoteCreate(title="Python late", content="x"))
+        assert b"Python 0" in first
+        assert sum(1 for _ in notes) == 599
+        with pytest.raises(ValueError, match=r"(?i)query"):
+            store.iter_json("(", mode="boolean")
+        for _ in range(3):
+            closed = store.iter_json()
+            next(closed)
+            closed.close()
+        assert store.count("python") == 601
+
+    def test_iter_json_releases_the_reader_between_windows(self, tmp_path: Path) -> None:
+        """An open export leaves the only reader free and still yields every match once."""
+        single = SqliteNoteService(tmp_path / "single.db", readers=1)
+        try:
+            single.create_many(
+                NoteCreate(title=f"Note {i}", content="python" if i % 3 else "rust")
+                for i in range(2500)
+            )
+            cases: list[tuple[str | None, MatchMode, int]] = [
+                ("python", "substring", 1666),
+                ("py", "substring", 1666),
+                ("-python", "boolean", 834),
+                (None, "substring", 2500),
+            ]
+            for query, mode, expected in cases:
+                exported = single.iter_json(query, mode=mode)
+                first = next(exported)
+                assert single.count() == 2500
+                assert 1 + sum(1 for _ in exported) == expected
+                assert first == single.list_all_json(query, mode=mode)[1 : len(first) + 1]
+        finally:
+            single.close()
+
+    def test_changes_after_reads_durable_seqs(self, store: SqliteNoteService) -> None:
+        """changes_after() numbers notes by seq and bounds them by limit and upto."""
+        assert store.changes_after(0, limit=10) == ([], 0)
+        notes = store.create_many([NoteCreate(title=f"T{i}", content="x") for i in range(4)])
+        changes, last = store.changes_after(1, limit=2)
+        assert [(c.seq, c.note) for c in changes] == [(2, notes[1]), (3, notes[2])]
+        assert last == 4
+        changes, last = store.changes_after(0, limit=10, upto=2)
+        assert [c.note for c in changes] == notes[:2]
+        assert last == 4
+
+    def test_stats_reports_index_size(self, store: SqliteNoteService) -> None:
+        """stats() counts notes and sizes the word index."""
+        store.create_many([NoteCreate(title=f"T{i}", content="body text") for i in range(3)])
+        stats = store.stats()
+        assert stats.notes == 3
+        assert stats.index_bytes is None or stats.index_bytes > 0
+
+    def test_clear_removes_notes_and_index(self, store: SqliteNoteService) -> None:
+        """clear() empties the table and the full-text index."""
+        store.create(NoteCreate(title="Python", content="body"))
+        store.clear()
+        assert list(store.list_all()) == []
+        assert list(store.list_all(query="python")) == []
+        note = store.create(NoteCreate(title="Python", content="again"))
+        assert list(store.list_all(query="python")) == [note]
@@ -0,0 +1,66 @@
+"""Unit tests for the title prefix index."""
+
+import random
+
+from app.services.suggest_index import SuggestIndex, normalize_prefix, suggestion_keys
+
+
+class TestSuggestIndex:
+    """Unit tests for SuggestIndex."""
+
+    def test_suggestion_keys_are_title_and_words(self) -> None:
+        """A title contributes itself, whitespace-collapsed, and each of its words."""
+        assert suggestion_keys("python  tips, python") == [
+            "python tips, python",
+            "python",
+            "tips",
+        ]
+        assert suggestion_keys("   ") == []
+
+    def test_normalize_prefix_keeps_trailing_space(self) -> None:
+        """Typed text is lower-cased and collapsed but a word boundary is preserved."""
+        assert normalize_prefix("  Python   T") == "python t"
+        assert normalize_prefix("Python ") == "python "
+
+    def test_complete_returns_sorted_prefix_matches(self) -> None:
+        """complete() returns distinct keys sharing the prefix, up to limit."""
+        index = SuggestIndex()
+        for title in ("python tips", "rust", "python", "pytest fixtures"):
+            index.add(title)
+        assert index.complete("py", 10) == [
+            "pytest",
+            "pytest fixtures",
+            "python",
+            "python tips",
+        ]
+        assert index.complete("python ", 10) == ["python tips"]
+        assert index.complete("py", 2) == ["pytest", "pytest fixtures"]
+        assert index.complete("zz", 10) == []
+        assert len(index) == 7
+
+    def test_clear_drops_everything(self) -> None:
+        """clear() empties the index."""
+        index = SuggestIndex()
+        index.add("hello")
+        index.clear()
+        assert index.complete("h", 5) == []
+        index.add("hello")
+        assert index.complete("h", 5) == ["hello"]
+
+    def test_chunked_keys_match_a_sorted_list(self) -> None:
+        """Keys spread over many runs complete exactly as one sorted list would."""
+        rng = random.Random(7)  # noqa: S311
+        titles = ["".join(rng.choices("abc", k=rng.randint(1, 6))) for _ in range(600)]
+        incremental = SuggestIndex(chunk_size=4)
+        for title in titles:
+            incremental.add(title)
+        bulk = SuggestIndex(chunk_size=4)
+        bulk.add_many(titles[:300])
+        bulk.add_many(titles[300:])
+        expected = sorted(set(titles))
+        for prefix in ("", "a", "ab", "cab", "ca", "ccccccc"):
+            for limit in (1, 5, 50, 1000):
+                want = [key for key in expected if key.startswith(prefix)][:limit]
+                assert incremental.complete(prefix, limit) == want, (prefix, limit)
+                assert bulk.complete(prefix, limit) == want, (prefix, limit)
+        assert len(incremental) == len(bulk) == len(expected)
@@ -0,0 +1,68 @@
+"""Unit tests for the trigram search index."""
+
+import random
+
+from app.models.note import NoteCreate
+from app.services.note_service import NoteService
+from app.services.trigram_index import TrigramIndex, trigrams
+
+
+class TestTrigramIndex:
+    """Unit tests for TrigramIndex."""
+
+    def test_trigrams_of_short_text_is_empty(self) -> None:
+        """Text shorter than three characters has no trigrams."""
+        assert trigrams("ab") == set()
+        assert trigrams("abcd") == {"abc", "bcd"}
+
+    def test_candidates_require_every_query_trigram(self) -> None:
+        """Only notes containing all trigrams of the query are candidates."""
+        index = TrigramIndex()
+        index.add(0, ("python tips", "body"))
+        index.add(1, ("rust tips", "body"))
+        index.add(2, ("guide", "learn python"))
+        assert index.candidates("python") == [0, 2]
+        assert index.candidates("zzz") == []
+
+    def test_iter_candidates_resumes_from_start(self) -> None:
+        """iter_candidates() skips positions below start and can stop early."""
+        index = TrigramIndex()
+        for position in range(6):
+            index.add(position, ("python" if position % 2 else "rust", "body"))
+        assert list(index.iter_candidates("python", 2)) == [3, 5]
+        assert list(index.iter_candidates("ab", 4)) == [4, 5]
+        matches = index.iter_candidates("python")
+        assert next(matches) == 1
+
+    def test_short_query_returns_every_position(self) -> None:
+        """Queries without trigrams fall back to all indexed positions."""
+        index = TrigramIndex()
+        index.add(0, ("a", "b"))
+        index.add(1, ("c", "d"))
+        assert list(index.candidates("x")) == [0, 1]
+
+    def test_trigrams_do_not_span_fields(self) -> None:
+        """Trigrams are not formed across the title/content boundary."""
+        index = TrigramIndex()
+        index.add(0, ("ab", "cd"))
+        assert index.candidates("bcd") == []
+
+    def test_search_matches_linear_scan(self) -> None:
+        """Indexed search returns exactly what a naive substring scan returns."""
+        rng = random.Random(42)  # noqa: S311
+        alphabet = "abcAB İß "
+        service = NoteService()
+        notes = [
+            service.create(
+                NoteCreate(
+                    title="".join(rng.choices(alphabet, k=8)),
+                    content="".join(rng.choices(alphabet, k=30)),
+                )
+            )
+            for _ in range(200)
+        ]
+        for _ in range(100):
+            query = "".join(rng.choices(alphabet, k=rng.randint(1, 5)))
+            q = query.lower()
+            expected = [n for n in notes if q in n.title.lower() or q in n.content.lower()]
+            assert list(service.list_all(query=query)) == expected
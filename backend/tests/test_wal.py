@@ -0,0 +1,69 @@
+"""Tests for the write-ahead log."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.services.wal import FsyncPolicy, WriteAheadLog
+
+
+def _write_all(wal: WriteAheadLog, payloads: list[bytes]) -> None:
+    """Write and sync every payload."""
+    for payload in payloads:
+        wal.sync(wal.write(payload))
+
+
+class TestWriteAheadLog:
+    """Unit tests for WriteAheadLog."""
+
+    @pytest.mark.parametrize("policy", ["always", "batch", "os"])
+    def test_replay_returns_written_records(self, tmp_path: Path, policy: FsyncPolicy) -> None:
+        """Records written under any policy should replay in order."""
+        path = tmp_path / "notes.wal"
+        wal = WriteAheadLog(path, fsync=policy, group_commit_ms=1)
+        wal.open()
+        _write_all(wal, [b"one", b"two", b"three"])
+        wal.close()
+        assert list(WriteAheadLog(path).replay()) == [b"one", b"two", b"three"]
+
+    def test_replay_missing_file_is_empty(self, tmp_path: Path) -> None:
+        """Replaying a log that was never written yields nothing."""
+        assert list(WriteAheadLog(tmp_path / "absent.wal").replay()) == []
+
+    def test_replay_truncates_torn_tail(self, tmp_path: Path) -> None:
+        """A partially written final record is dropped and cut from the file."""
+        path = tmp_path / "notes.wal"
+        wal = WriteAheadLog(path, fsync="always")
+        wal.open()
+        _write_all(wal, [b"good"])
+        wal.close()
+        intact_size = path.stat().st_size
+        with path.open("ab") as fh:
+            fh.write(b"\x10\x00\x00\x00garbage")
+        assert list(WriteAheadLog(path).replay()) == [b"good"]
+        assert path.stat().st_size == intact_size
+
+    def test_rotate_continues_in_new_file(self, tmp_path: Path) -> None:
+        """After rotation, new records land in the new file only."""
+        first, second = tmp_path / "a.wal", tmp_path / "b.wal"
+        wal = WriteAheadLog(first, fsync="batch", group_commit_ms=1)
+        wal.open()
+        _write_all(wal, [b"old"])
+        wal.rotate(second)
+        _write_all(wal, [b"new"])
+        wal.close()
+        assert list(WriteAheadLog(first).replay()) == [b"old"]
+        assert list(WriteAheadLog(second).replay()) == [b"new"]
+
+    def test_group_commit_acknowledges_concurrent_writers(self, tmp_path: Path) -> None:
+        """Concurrent writers under batch policy all become durable."""
+        path = tmp_path / "notes.wal"
+        wal = WriteAheadLog(path, fsync="batch", group_commit_ms=2)
+        wal.open()
+        payloads = [f"note-{i}".encode() for i in range(200)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            for payload in payloads:
+                pool.submit(_write_all, wal, [payload])
+        wal.close()
+        assert sorted(WriteAheadLog(path).replay()) == sorted(payloads)
@@ -2,6 +2,7 @@ import { useCallback, type FC } from 'react';
 import { useAppDispatch, useAppSelector } from './store/hooks';
 import {
   fetchNotes,
+  syncNotes,
   createNote,
   setQuery,
   selectNotesLoading,
@@ -30,8 +31,8 @@ export const App: FC = () => {
     async (data: NoteCreate) => {
       const result = await dispatch(createNote(data));
       if (createNote.fulfilled.match(result)) {
-        // Re-fetch to ensure consistency with server
-        dispatch(fetchNotes());
+        // Pick up anything else created meanwhile without re-downloading the list
+        dispatch(syncNotes());
       }
     },
     [dispatch],
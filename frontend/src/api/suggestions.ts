@@ -0,0 +1,14 @@
+import { apiClient } from './client';
+
+// Wait this long after the last keystroke before asking for completions.
+export const SUGGEST_DEBOUNCE_MS = 150;
+const SUGGEST_LIMIT = 8;
+
+// Fetch title completions for the text typed so far
+export async function fetchSuggestions(prefix: string, signal?: AbortSignal): Promise<string[]> {
+  const response = await apiClient.get<string[]>('/notes/suggest', {
+    params: { prefix, limit: SUGGEST_LIMIT },
+    signal,
+  });
+  return response.data;
+}
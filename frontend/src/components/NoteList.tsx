@@ -12,7 +12,9 @@ import {
   selectNotesLoading,
   selectNotesError,
   selectNotesQuery,
+  selectIsLive,
   fetchNotes,
+  watchNotes,
   clearError,
 } from '../store/notesSlice';
 import { NoteCard } from './NoteCard';
@@ -23,11 +25,20 @@ export const NoteList: FC = () => {
   const loading = useAppSelector(selectNotesLoading);
   const error = useAppSelector(selectNotesError);
   const query = useAppSelector(selectNotesQuery);
+  const live = useAppSelector(selectIsLive);
 
   useEffect(() => {
     dispatch(fetchNotes());
   }, [dispatch]);
 
+  // Receive notes created elsewhere as they happen, while the full list is shown
+  useEffect(() => {
+    if (!live) {
+      return;
+    }
+    return dispatch(watchNotes());
+  }, [dispatch, live]);
+
   if (loading) {
     return (
       <Box sx={{ display: 'flex', justifyContent: 'center', py: 4 }}>
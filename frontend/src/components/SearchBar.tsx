@@ -1,6 +1,7 @@
-import { type FC, useState, useCallback } from 'react';
-import { TextField, Button, Stack } from '@mui/material';
+import { type FC, useState, useCallback, useEffect } from 'react';
+import { Autocomplete, TextField, Button, Stack } from '@mui/material';
 import { Search as SearchIcon, Clear as ClearIcon } from '@mui/icons-material';
+import { fetchSuggestions, SUGGEST_DEBOUNCE_MS } from '../api/suggestions';
 
 interface SearchBarProps {
   onSearch: (query: string) => void;
@@ -9,6 +10,27 @@ interface SearchBarProps {
 
 export const SearchBar: FC<SearchBarProps> = ({ onSearch, loading }) => {
   const [input, setInput] = useState('');
+  const [suggestions, setSuggestions] = useState<string[]>([]);
+
+  // Suggest completions as the user types; searching still waits for Enter or a pick
+  useEffect(() => {
+    const prefix = input.trim();
+    if (!prefix) {
+      return;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(() => {
+      fetchSuggestions(prefix, controller.signal)
+        .then(setSuggestions)
+        .catch(() => {
+          // Suggestions are best-effort; a failed or aborted lookup shows none
+        });
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [input]);
 
   const handleSearch = useCallback(() => {
     onSearch(input.trim());
@@ -19,30 +41,41 @@ export const SearchBar: FC<SearchBarProps> = ({ onSearch, loading }) => {
     onSearch('');
   }, [onSearch]);
 
-  const handleKeyDown = useCallback(
-    (e: React.KeyboardEvent) => {
-      if (e.key === 'Enter') {
-        handleSearch();
+  const handleChange = useCallback(
+    (_event: React.SyntheticEvent, value: string | null) => {
+      // Fired on Enter and when a suggestion is picked
+      if (value !== null) {
+        setInput(value);
+        onSearch(value.trim());
       }
     },
-    [handleSearch],
+    [onSearch],
   );
 
   return (
     <Stack direction="row" spacing={1} sx={{ mb: 3 }}>
-      <TextField
+      <Autocomplete
+        freeSolo
         fullWidth
         size="small"
-        placeholder="Search notes..."
-        value={input}
-        onChange={(e) => setInput(e.target.value)}
-        onKeyDown={handleKeyDown}
+        options={input.trim() ? suggestions : []}
+        filterOptions={(options) => options}
+        inputValue={input}
+        onInputChange={(_event, value) => setInput(value)}
+        onChange={handleChange}
         disabled={loading}
-        slotProps={{
-          input: {
-            startAdornment: <SearchIcon sx={{ mr: 1, color: 'text.secondary' }} />,
-          },
-        }}
+        renderInput={(params) => (
+          <TextField
+            {...params}
+            placeholder="Search notes..."
+            slotProps={{
+              input: {
+                ...params.InputProps,
+                startAdornment: <SearchIcon sx={{ mr: 1, color: 'text.secondary' }} />,
+              },
+            }}
+          />
+        )}
       />
       <Button variant="contained" onClick={handleSearch} disabled={loading}>
         Search
@@ -1,7 +1,7 @@
 import { createSlice, createAsyncThunk, type PayloadAction } from '@reduxjs/toolkit';
-import { apiClient } from '../api/client';
-import type { Note, NoteCreate } from '../types/note';
-import type { RootState } from './store';
+import { apiClient, API_BASE_URL } from '../api/client';
+import type { Note, NoteChanges, NoteCreate } from '../types/note';
+import type { AppThunk, RootState } from './store';
 
 interface NotesState {
   items: Note[];
@@ -9,6 +9,8 @@ interface NotesState {
   creating: boolean;
   error: string | null;
   query: string;
+  // Change sequence the unfiltered list is current as of; null while searching
+  seq: number | null;
 }
 
 const initialState: NotesState = {
@@ -17,16 +19,24 @@ const initialState: NotesState = {
   creating: false,
   error: null,
   query: '',
+  seq: null,
 };
 
+interface NotesPayload {
+  notes: Note[];
+  seq: number | null;
+}
+
 // Fetch notes (with optional search query)
-export const fetchNotes = createAsyncThunk<Note[], { q?: string } | void>(
+export const fetchNotes = createAsyncThunk<NotesPayload, { q?: string } | void>(
   'notes/fetchNotes',
   async (args, { rejectWithValue }) => {
     try {
       const params = args && 'q' in args && args.q ? { q: args.q } : undefined;
       const response = await apiClient.get<Note[]>('/notes', { params });
-      return response.data;
+      const seqHeader = response.headers['x-change-seq'] as string | undefined;
+      const seq = !params && seqHeader ? Number(seqHeader) : null;
+      return { notes: response.data, seq };
     } catch (error) {
       const message = error instanceof Error ? error.message : 'Failed to fetch notes';
       return rejectWithValue(message);
@@ -34,6 +44,33 @@ export const fetchNotes = createAsyncThunk<Note[], { q?: string } | void>(
   },
 );
 
+// Pull only the notes created since the last fetch or sync, reloading if the
+// server can no longer tell
+export const syncNotes = createAsyncThunk<NoteChanges, void, { state: RootState }>(
+  'notes/syncNotes',
+  async (_, { getState, dispatch, rejectWithValue }) => {
+    try {
+      const response = await apiClient.get<NoteChanges>('/notes/changes', {
+        params: { since: getState().notes.seq },
+      });
+      if (response.data.resync) {
+        await dispatch(fetchNotes());
+      }
+      return response.data;
+    } catch (error) {
+      const message = error instanceof Error ? error.message : 'Failed to sync notes';
+      return rejectWithValue(message);
+    }
+  },
+  {
+    // Search results are not kept in sync; neither is a list still loading
+    condition: (_, { getState }) => {
+      const { seq, loading } = getState().notes;
+      return seq !== null && !loading;
+    },
+  },
+);
+
 // Create a new note
 export const createNote = createAsyncThunk<Note, NoteCreate>(
   'notes/createNote',
@@ -52,6 +89,15 @@ const notesSlice = createSlice({
   name: 'notes',
   initialState,
   reducers: {
+    noteCreatedEvent(state, action: PayloadAction<{ note: Note; seq: number }>) {
+      if (state.seq === null) {
+        return;
+      }
+      if (!state.items.some((note) => note.id === action.payload.note.id)) {
+        state.items.push(action.payload.note);
+      }
+      state.seq = action.payload.seq;
+    },
     setQuery(state, action: PayloadAction<string>) {
       state.query = action.payload;
     },
@@ -68,13 +114,25 @@ const notesSlice = createSlice({
       })
       .addCase(fetchNotes.fulfilled, (state, action) => {
         state.loading = false;
-        state.items = action.payload;
+        state.items = action.payload.notes;
+        state.seq = action.payload.seq;
       })
       .addCase(fetchNotes.rejected, (state, action) => {
         state.loading = false;
         state.error = (action.payload as string) ?? 'Failed to fetch notes';
       });
 
+    // syncNotes
+    builder.addCase(syncNotes.fulfilled, (state, action) => {
+      // A resync already replaced the list and its seq via fetchNotes
+      if (action.payload.resync || state.seq === null) {
+        return;
+      }
+      const known = new Set(state.items.map((note) => note.id));
+      state.items.push(...action.payload.notes.filter((note) => !known.has(note.id)));
+      state.seq = action.payload.seq;
+    });
+
     // createNote
     builder
       .addCase(createNote.pending, (state) => {
@@ -92,7 +150,22 @@ const notesSlice = createSlice({
   },
 });
 
-export const { setQuery, clearError } = notesSlice.actions;
+export const { noteCreatedEvent, setQuery, clearError } = notesSlice.actions;
+
+// Follow the server's note event stream from the current seq; returns a function
+// that closes it. The browser reconnects on its own, resuming from the last event.
+export const watchNotes = (): AppThunk<() => void> => (dispatch, getState) => {
+  const { seq } = getState().notes;
+  const source = new EventSource(`${API_BASE_URL}/notes/events?since=${seq ?? 0}`);
+  source.addEventListener('note_created', (event) => {
+    const note = JSON.parse(event.data) as Note;
+    dispatch(noteCreatedEvent({ note, seq: Number(event.lastEventId) }));
+  });
+  source.addEventListener('resync', () => {
+    dispatch(fetchNotes());
+  });
+  return () => source.close();
+};
 export const notesReducer = notesSlice.reducer;
 
 // Selectors
@@ -100,4 +173,5 @@ export const selectNotes = (state: RootState) => state.notes.items;
 export const selectNotesLoading = (state: RootState) => state.notes.loading;
 export const selectNotesError = (state: RootState) => state.notes.error;
 export const selectNotesQuery = (state: RootState) => state.notes.query;
+export const selectIsLive = (state: RootState) => state.notes.seq !== null;
 export const selectIsCreating = (state: RootState) => state.notes.creating;
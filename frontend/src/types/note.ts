@@ -10,4 +10,10 @@ export interface NoteCreate {
   content: string;
 }
 
+export interface NoteChanges {
+  seq: number;
+  resync: boolean;
+  notes: Note[];
+}
+
 export type RequestStatus = 'idle' | 'loading' | 'succeeded' | 'failed';